@@ -3,9 +3,9 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
 
-from scripts.analizador_horas_aula  import AnalizadorHorasAula
-from scripts.generador_excel        import GeneradorExcel
-from scripts.generador_reporte_cursos import GeneradorReporteCursos
+# Los módulos de scripts/ cargan pandas, NumPy y openpyxl (~0.5 s). Se
+# importan dentro de cada opción para que el menú aparezca de inmediato y
+# cada opción cargue solo lo que usa. Presupuesto: scripts/medir_arranque.py
 
 
 # ---------------------------------------------------------------------------
@@ -24,45 +24,78 @@ def mostrar_menu():
     print("  1. Analisis completo   (reporte de cursos + JSON + Excel de consumo)")
     print("  2. Reporte de cursos   (verificar equivalencias y exclusiones)")
     print("  3. Generar Excel       (desde JSON existente, sin recalcular)")
+    print("  4. Analisis de campus  (varias carreras, secciones combinadas)")
+    print("  5. Comparar resultados (diferencias entre dos JSON de consumo)")
     print("  0. Salir")
     separador('-')
-    return input("Seleccione una opcion [0-3]: ").strip()
+    return input("Seleccione una opcion [0-5]: ").strip()
+
+
+def _registrar_log(config_path):
+    """Guarda también los mensajes de avance en el archivo de config output.log (si está)."""
+    import json
+    from scripts.avance import registrar_en_archivo
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        ruta = json.load(f).get('output', {}).get('log')
+    if ruta:
+        registrar_en_archivo(ruta)
 
 
 # ---------------------------------------------------------------------------
 # Opciones del menú
 # ---------------------------------------------------------------------------
 
+def _generar_reporte_cursos(analizador, reporte_path):
+    """
+    Genera el reporte de cursos en un proceso aparte y retorna sus mensajes
+    para mostrarlos al terminar, sin mezclarlos con los del Excel de consumo.
+    """
+    from scripts.generador_reporte_cursos import GeneradorReporteCursos
+
+    mensajes = []
+    GeneradorReporteCursos(analizador, reporte_path, silencioso=True, progreso=mensajes.append).generar()
+    return ''.join(f"{mensaje}\n" for mensaje in mensajes)
+
+
 def opcion_analisis_completo(config_path='config.json'):
     """
     Opción 1: Análisis completo.
-    Flujo: cargar datos → equivalencias → procesar → resúmenes → JSON → Excel cursos → Excel consumo.
+    Flujo: cargar datos → equivalencias → procesar → resúmenes → JSON →
+    (Excel cursos ∥ Excel consumo).
     """
     separador()
     print("ANALISIS COMPLETO")
     separador()
 
     try:
+        from concurrent.futures import ProcessPoolExecutor
+
+        from scripts.analizador_horas_aula import AnalizadorHorasAula
+        from scripts.generador_excel       import GeneradorExcel
+
+        _registrar_log(config_path)
+
         # Fase 1: análisis y JSON
         print("\n[FASE 1/3] Analisis de datos y generacion de JSON")
         separador('-')
         analizador = AnalizadorHorasAula(config_path)
         resultado_json = analizador.ejecutar()
 
-        # Fase 2: reporte de cursos
-        print("\n[FASE 2/3] Generacion del reporte de cursos")
+        # Fases 2 y 3 en paralelo: el reporte de cursos en otro proceso y el
+        # Excel de consumo aquí, desde el resultado en memoria (sin releer el JSON)
+        print("\n[FASE 2-3/3] Reporte de cursos y Excel de consumo (en paralelo)")
         separador('-')
         reporte_path = analizador.config['output']['reporte_cursos']
-        reporte = GeneradorReporteCursos(analizador, reporte_path)
-        reporte.generar()
-
-        # Fase 3: Excel de consumo
-        print("\n[FASE 3/3] Generacion del Excel de consumo")
-        separador('-')
         json_path  = analizador.config['output']['json']
         excel_path = analizador.config['output']['excel']
-        generador  = GeneradorExcel(json_path, excel_path)
-        generador.generar()
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            futuro_reporte = executor.submit(_generar_reporte_cursos, analizador, reporte_path)
+            GeneradorExcel(json_path, excel_path, resultado_json).generar()
+            salida_reporte = futuro_reporte.result()
+
+        print(salida_reporte, end='')
 
         # Resumen final
         print()
@@ -107,6 +140,9 @@ def opcion_reporte_cursos(config_path='config.json'):
     separador()
 
     try:
+        from scripts.analizador_horas_aula    import AnalizadorHorasAula
+        from scripts.generador_reporte_cursos import GeneradorReporteCursos
+
         analizador = AnalizadorHorasAula(config_path)
 
         print("\nCargando datos e identificando equivalencias...")
@@ -140,6 +176,8 @@ def opcion_generar_excel(config_path='config.json'):
     separador()
 
     try:
+        from scripts.generador_excel import GeneradorExcel
+
         import json
         with open(config_path, 'r', encoding='utf-8') as f:
             config = json.load(f)
@@ -169,12 +207,77 @@ def opcion_generar_excel(config_path='config.json'):
         return False
 
 
+def opcion_analisis_campus(config_campus_path='config_campus.json'):
+    """
+    Opción 4: Análisis de campus.
+    Corre cada carrera de config_campus.json en su propio proceso y fusiona
+    los cursos equivalentes entre carreras en secciones combinadas.
+    """
+    separador()
+    print("ANALISIS DE CAMPUS")
+    separador()
+
+    try:
+        from scripts.analizador_campus import AnalizadorCampus
+
+        if not Path(config_campus_path).exists():
+            print(f"\nERROR: No se encontro '{config_campus_path}'.")
+            return False
+
+        AnalizadorCampus(config_campus_path).ejecutar()
+        return True
+
+    except Exception as e:
+        separador()
+        print("ERROR EN EL ANALISIS DE CAMPUS")
+        separador()
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def opcion_comparar_resultados():
+    """
+    Opción 5: Comparar dos JSON de consumo.
+    Reporta diferencias de horas, secciones y estudiantes y los cursos que las explican.
+    """
+    separador()
+    print("COMPARAR RESULTADOS")
+    separador()
+
+    try:
+        from scripts.comparador_resultados import ComparadorResultados
+
+        json_a = input("JSON anterior: ").strip()
+        json_b = input("JSON nuevo   : ").strip()
+        for ruta in (json_a, json_b):
+            if not Path(ruta).exists():
+                print(f"\nERROR: No se encontro el JSON en '{ruta}'.")
+                return False
+
+        ComparadorResultados(json_a, json_b,
+                             'salida/json/comparacion.json',
+                             'salida/excel/comparacion.xlsx').generar()
+        return True
+
+    except Exception as e:
+        separador()
+        print("ERROR COMPARANDO RESULTADOS")
+        separador()
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 # ---------------------------------------------------------------------------
 # Punto de entrada
 # ---------------------------------------------------------------------------
 
 def main():
     CONFIG = 'config.json'
+    CONFIG_CAMPUS = 'config_campus.json'
 
     while True:
         opcion = mostrar_menu()
@@ -185,11 +288,15 @@ def main():
             opcion_reporte_cursos(CONFIG)
         elif opcion == '3':
             opcion_generar_excel(CONFIG)
+        elif opcion == '4':
+            opcion_analisis_campus(CONFIG_CAMPUS)
+        elif opcion == '5':
+            opcion_comparar_resultados()
         elif opcion == '0':
             print("\nSaliendo...\n")
             break
         else:
-            print("\nOpcion no valida. Ingrese 0, 1, 2 o 3.")
+            print("\nOpcion no valida. Ingrese un numero del 0 al 5.")
 
         input("\nPresione Enter para volver al menu...")
 
@@ -0,0 +1,66 @@
+"""
+Analítica de picos por tipo de ambiente específico.
+
+`resumen_total.periodo_pico` elige un solo periodo por horas totales, pero la
+restricción real suele ser un laboratorio que llega a su pico en otro periodo.
+A partir de `detalle_ambientes_especificos` se calcula, para cada tipo de
+ambiente y para el total:
+
+  - periodo y valor pico (horas semanales y secciones en ese periodo);
+  - los k periodos de mayor carga;
+  - la curva de duración de carga: las horas de todos los periodos ordenadas
+    de mayor a menor (la posición i indica cuántos periodos superan ese nivel).
+
+Todo se calcula sobre una matriz periodos × ambientes con NumPy. Ante
+empates gana el primer periodo, igual que el periodo pico global.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+TOP_K = 5
+
+
+def analizar_picos(detalle_ambientes, top_k=TOP_K):
+    """
+    `detalle_ambientes`: lista con la forma de `detalle_ambientes_especificos`.
+    Retorna {'top_k', 'por_ambiente': {ambiente: {...}}} (incluye 'Total').
+    """
+    periodos = [p['periodo'] for p in detalle_ambientes]
+    filas = [
+        (p['periodo'], ambiente, info['horas_semanales'], info['secciones'])
+        for p in detalle_ambientes for ambiente, info in p['ambientes'].items()
+    ]
+    if not filas:
+        return {'top_k': top_k, 'por_ambiente': {}}
+
+    df = pd.DataFrame(filas, columns=['periodo', 'ambiente', 'horas', 'secciones'])
+    horas = df.pivot(index='periodo', columns='ambiente', values='horas').reindex(periodos).fillna(0)
+    secciones = df.pivot(index='periodo', columns='ambiente', values='secciones').reindex(periodos).fillna(0)
+    horas['Total'] = horas.sum(axis=1)
+    secciones['Total'] = secciones.sum(axis=1)
+
+    matriz = horas.to_numpy(dtype='float64')
+    orden = np.argsort(-matriz, axis=0, kind='stable')       # por columna, de mayor a menor
+    curvas = np.take_along_axis(matriz, orden, axis=0)
+    promedios = matriz.mean(axis=0)
+    activos = (matriz > 0).sum(axis=0)
+    matriz_secciones = secciones.to_numpy(dtype='float64')
+
+    por_ambiente = {}
+    for j, ambiente in enumerate(horas.columns):
+        pico = orden[0, j]
+        por_ambiente[ambiente] = {
+            'periodo_pico': periodos[pico],
+            'horas_pico': float(matriz[pico, j]),
+            'secciones_pico': int(matriz_secciones[pico, j]),
+            'promedio': float(promedios[j]),
+            'periodos_activos': int(activos[j]),
+            'top_periodos': [
+                {'periodo': periodos[i], 'horas_semanales': float(matriz[i, j])}
+                for i in orden[:top_k, j]
+            ],
+            'curva_duracion': curvas[:, j].tolist(),
+        }
+    return {'top_k': top_k, 'por_ambiente': por_ambiente}
@@ -0,0 +1,342 @@
+"""
+Analizador de Campus - Consumo de Horas-Aula de varias carreras
+
+Ejecuta AnalizadorHorasAula para cada carrera del campus en paralelo (un
+proceso por carrera) y luego fusiona en secciones combinadas los cursos que
+las equivalencias declaran entre carreras distintas (p. ej. cursos de
+Secundaria que equivalen a cursos de Educación Inicial o Psicología).
+
+En el análisis por carrera esos cursos se eliminan o se cuentan por separado;
+sumar las corridas individuales sobreestima el pico del campus. Aquí se
+obtiene una sola demanda de ambientes por periodo para todo el campus.
+
+Configuración (config_campus.json):
+    {
+      "metadata": {"campus": "..."},
+      "carreras": ["config.json", "config_inicial.json", ...],
+      "parametros": {...},            # opcional, por defecto los de la 1.ª carrera
+      "max_procesos": null,           # opcional
+      "output": {"json": "salida/json/consumo_campus.json"}
+    }
+
+Cada configuración de carrera puede declarar en su metadata
+"nombres_programa" ({"LLYA": "Educación LLYA", ...}), que son los nombres
+usados en la columna PROGRAMA_EQUIVALENTE de los archivos de equivalencias.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from analizador_horas_aula import AnalizadorHorasAula, calcular_secciones, categoria_ambiente
+from avance import Avance
+from lector_json import escribir_json_indexado
+from periodos import etiqueta_periodo
+
+
+CATEGORIAS = ['aula', 'laboratorio', 'taller', 'virtual']
+
+COLUMNAS_FILAS = [
+    'PROGRAMA', 'CODIGO_CURSO', 'CLAVE_PERIODO', 'TIPO_AMBIENTE',
+    'HORAS_SEMANALES', 'TOTAL_MATRICULADOS', 'SECCIONES', 'HORAS_TOTALES',
+    'CARRERA', 'EXCLUIDO_AISLADO',
+]
+
+
+def nombres_programa(config):
+    """Programa → nombre usado en las equivalencias ('LLYA' → 'Educación LLYA')."""
+    nombres = config['metadata'].get('nombres_programa', {})
+    return {p: nombres.get(p, f"Educación {p}") for p in config['metadata']['programas']}
+
+
+def _normalizar_codigo(valor):
+    """Código equivalente como entero, o None si no es un código único válido."""
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        return None
+    if pd.isna(numero) or numero % 1 != 0:
+        return None
+    return int(numero)
+
+
+def _analizar_carrera(config_path, programas_campus):
+    """
+    Trabajo de un proceso: corre el análisis de una carrera hasta la fusión
+    de cursos compartidos internos y retorna sus filas y equivalencias externas.
+
+    Los cursos que equivalen a un programa de OTRA carrera del campus no se
+    eliminan (se fusionarán después); quedan marcados en EXCLUIDO_AISLADO para
+    poder reconstruir el resultado que daría la carrera analizada sola.
+    """
+    # Silencioso: los procesos corren a la vez y sus mensajes se mezclarían;
+    # el avance lo informa el proceso principal
+    analizador = AnalizadorHorasAula(config_path, silencioso=True)
+    analizador.cargar_datos()
+    analizador.identificar_cursos_compartidos()
+    analizador.identificar_cursos_a_eliminar()
+
+    nombres  = nombres_programa(analizador.config)
+    externos = set(programas_campus) - set(nombres.values())
+
+    excluidos_aislado = {}
+    pares = []
+    for programa, nombre in nombres.items():
+        excluidos_aislado[programa] = set(analizador.cursos_a_eliminar[programa])
+
+        equiv = analizador.equivalencias[programa]
+        cruzados = equiv[equiv['PROGRAMA_EQUIVALENTE'].isin(externos)]
+        for _, row in cruzados.iterrows():
+            codigo_eq = _normalizar_codigo(row['CODIGO_CURSO_EQUIVALENTE'])
+            if codigo_eq is None:
+                continue
+            pares.append(((nombre, int(row['CODIGO_CURSO'])),
+                          (row['PROGRAMA_EQUIVALENTE'], codigo_eq)))
+
+        conservar = set(cruzados['CODIGO_CURSO'])
+        analizador.cursos_a_eliminar[programa] = [
+            c for c in analizador.cursos_a_eliminar[programa] if c not in conservar
+        ]
+
+    for programa in analizador.config['metadata']['programas']:
+        analizador.procesar_programa(programa)
+    analizador.procesar_cursos_compartidos()
+
+    frames = []
+    for programa, nombre in nombres.items():
+        df = analizador.resultados[programa].copy()
+        df['PROGRAMA'] = nombre
+        df['CARRERA']  = analizador.config['metadata']['carrera']
+        df['EXCLUIDO_AISLADO'] = df['CODIGO_CURSO'].isin(excluidos_aislado[programa])
+        frames.append(df[COLUMNAS_FILAS])
+
+    return {
+        'carrera'   : analizador.config['metadata']['carrera'],
+        'parametros': analizador.parametros,
+        'programas' : list(nombres.values()),
+        'filas'     : pd.concat(frames, ignore_index=True),
+        'pares'     : pares,
+    }
+
+
+class _Grupos:
+    """Unión-búsqueda mínima para agrupar cursos equivalentes entre carreras."""
+
+    def __init__(self):
+        self.padre = {}
+
+    def buscar(self, x):
+        self.padre.setdefault(x, x)
+        while self.padre[x] != x:
+            self.padre[x] = self.padre[self.padre[x]]
+            x = self.padre[x]
+        return x
+
+    def unir(self, a, b):
+        ra, rb = self.buscar(a), self.buscar(b)
+        if ra != rb:
+            self.padre[rb] = ra
+
+
+class AnalizadorCampus:
+    """
+    Agrega la demanda de ambientes de varias carreras con secciones
+    combinadas para los cursos equivalentes entre carreras.
+    """
+
+    def __init__(self, config_path='config_campus.json', silencioso=False, progreso=None):
+        self.informar = Avance('campus', silencioso, progreso)
+        with open(config_path, 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+
+        self.carreras   = self.config['carreras']
+        self.parametros = self.config.get('parametros')
+        self.resultados_carrera = []
+        self.filas = None
+        self.filas_aisladas = None
+        self.fusiones = []
+
+        self.informar("=" * 80)
+        self.informar(f"ANALIZADOR DE CAMPUS - {self.config['metadata'].get('campus', '')}")
+        self.informar("=" * 80)
+        self.informar(f"Carreras: {len(self.carreras)}")
+        for c in self.carreras:
+            self.informar(f"  - {c}")
+        self.informar("=" * 80)
+
+    def _programas_campus(self):
+        programas = []
+        for config_path in self.carreras:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                programas.extend(nombres_programa(json.load(f)).values())
+        return programas
+
+    def analizar_carreras(self):
+        """Corre cada carrera en su propio proceso."""
+        self.informar("\nAnalizando carreras en paralelo...")
+        programas = self._programas_campus()
+        max_procesos = self.config.get('max_procesos') or min(len(self.carreras), os.cpu_count() or 1)
+
+        with ProcessPoolExecutor(max_workers=max_procesos) as ejecutor:
+            futuros = [ejecutor.submit(_analizar_carrera, c, programas) for c in self.carreras]
+            self.resultados_carrera = [f.result() for f in futuros]
+
+        if self.parametros is None:
+            self.parametros = self.resultados_carrera[0]['parametros']
+
+        for resultado in self.resultados_carrera:
+            self.informar(f"  - {resultado['carrera']}: {len(resultado['filas'])} registros")
+
+        self.filas = pd.concat([r['filas'] for r in self.resultados_carrera], ignore_index=True)
+        self.informar(f"  {len(self.resultados_carrera)} carreras analizadas, {len(self.filas)} registros")
+
+    def fusionar_cursos_entre_carreras(self):
+        """
+        Fusiona por periodo los cursos equivalentes entre carreras.
+        Si dos o más cursos del grupo tienen alumnos activos, el primero
+        (según el orden de carreras/programas) recibe a todos los alumnos y
+        se recalculan sus secciones; las filas de los demás se eliminan.
+        Con un solo curso activo no hay fusión (igual que en LLYA↔MYC).
+        """
+        self.informar("\nFusionando cursos equivalentes entre carreras...")
+
+        grupos = _Grupos()
+        for resultado in self.resultados_carrera:
+            for a, b in resultado['pares']:
+                grupos.unir(a, b)
+
+        # Referencia: lo que darían las carreras analizadas por separado
+        self.filas_aisladas = self.filas[~self.filas['EXCLUIDO_AISLADO']].copy()
+
+        orden_programa = {p: i for i, p in enumerate(self._programas_campus())}
+        ids_grupo = {}
+        nodos = zip(self.filas['PROGRAMA'], self.filas['CODIGO_CURSO'])
+        self.filas['GRUPO'] = [
+            ids_grupo.setdefault(grupos.buscar(n), len(ids_grupo)) if n in grupos.padre else -1
+            for n in nodos
+        ]
+
+        eliminar = []
+        agrupadas = self.filas[self.filas['GRUPO'] >= 0]
+        for (_, periodo), filas_g in agrupadas.groupby(['GRUPO', 'CLAVE_PERIODO'], sort=False):
+            activos = []
+            for (programa, codigo), filas_n in filas_g.groupby(['PROGRAMA', 'CODIGO_CURSO'], sort=False):
+                if filas_n['TOTAL_MATRICULADOS'].sum() > 0:
+                    activos.append((orden_programa.get(programa, len(orden_programa)),
+                                    programa, codigo, filas_n))
+            if len(activos) < 2:
+                continue
+
+            activos.sort(key=lambda a: a[0])
+            est_total = sum(int(a[3]['TOTAL_MATRICULADOS'].iloc[0]) for a in activos)
+            _, programa_sede, codigo_sede, filas_sede = activos[0]
+
+            for idx in filas_sede.index:
+                secciones = calcular_secciones(est_total, self.filas.at[idx, 'TIPO_AMBIENTE'], self.parametros)
+                self.filas.at[idx, 'TOTAL_MATRICULADOS'] = est_total
+                self.filas.at[idx, 'SECCIONES']          = secciones
+                self.filas.at[idx, 'HORAS_TOTALES']      = self.filas.at[idx, 'HORAS_SEMANALES'] * secciones
+            for a in activos[1:]:
+                eliminar.extend(a[3].index)
+
+            self.fusiones.append({
+                'periodo'    : etiqueta_periodo(int(periodo)),
+                'sede'       : {'programa': programa_sede, 'codigo_curso': int(codigo_sede)},
+                'fusionados' : [{'programa': a[1], 'codigo_curso': int(a[2])} for a in activos[1:]],
+                'estudiantes': est_total,
+            })
+
+        self.filas = self.filas.drop(index=eliminar)
+        self.informar(f"  {len(self.fusiones)} secciones combinadas (curso × periodo)")
+
+    @staticmethod
+    def _horas_por_periodo(filas, columna):
+        datos = filas.assign(CATEGORIA=filas['TIPO_AMBIENTE'].map(categoria_ambiente))
+        tabla = datos.pivot_table(index='CLAVE_PERIODO', columns='CATEGORIA',
+                                  values=columna, aggfunc='sum', fill_value=0)
+        return tabla.reindex(columns=CATEGORIAS, fill_value=0)
+
+    def generar_consumo_por_periodo(self):
+        """Demanda del campus por periodo, con la suma de corridas aisladas como referencia."""
+        self.informar("\nGenerando consumo del campus por periodo...")
+
+        horas     = self._horas_por_periodo(self.filas, 'HORAS_TOTALES')
+        secciones = self._horas_por_periodo(self.filas, 'SECCIONES')
+        aisladas  = self._horas_por_periodo(self.filas_aisladas, 'HORAS_TOTALES')
+        ambientes = self.filas.groupby(['CLAVE_PERIODO', 'TIPO_AMBIENTE'])['HORAS_TOTALES'].sum()
+        por_carrera = self.filas_aisladas.groupby(['CLAVE_PERIODO', 'CARRERA'])['HORAS_TOTALES'].sum()
+
+        consumo = []
+        for periodo in sorted(set(horas.index) | set(aisladas.index)):
+            h = horas.loc[periodo] if periodo in horas.index else pd.Series(0, index=CATEGORIAS)
+            s = secciones.loc[periodo] if periodo in secciones.index else pd.Series(0, index=CATEGORIAS)
+            a = aisladas.loc[periodo] if periodo in aisladas.index else pd.Series(0, index=CATEGORIAS)
+            consumo.append({
+                'periodo': etiqueta_periodo(int(periodo)),
+                'horas_semanales': {**{c: float(h[c]) for c in CATEGORIAS}, 'total': float(h.sum())},
+                'secciones': {**{c: int(s[c]) for c in CATEGORIAS}, 'total': int(s.sum())},
+                'ambientes': {
+                    str(t): float(v) for t, v in ambientes.get(periodo, pd.Series(dtype=float)).items()
+                },
+                'horas_semanales_aisladas': {**{c: float(a[c]) for c in CATEGORIAS}, 'total': float(a.sum())},
+                'horas_aisladas_por_carrera': {
+                    str(c): float(v) for c, v in por_carrera.get(periodo, pd.Series(dtype=float)).items()
+                },
+            })
+
+        self.informar(f"  {len(consumo)} periodos procesados")
+        return consumo
+
+    def ejecutar(self):
+        """Ejecuta el análisis de campus y guarda el JSON."""
+        self.analizar_carreras()
+        self.fusionar_cursos_entre_carreras()
+        consumo = self.generar_consumo_por_periodo()
+
+        pico          = max(consumo, key=lambda p: p['horas_semanales']['total'])
+        pico_aislado  = max(consumo, key=lambda p: p['horas_semanales_aisladas']['total'])
+
+        resultado = {
+            'metadata': {
+                'campus'    : self.config['metadata'].get('campus', ''),
+                'carreras'  : [r['carrera'] for r in self.resultados_carrera],
+                'programas' : [p for r in self.resultados_carrera for p in r['programas']],
+                'parametros': self.parametros,
+            },
+            'resumen_total': {
+                'periodo_pico': {
+                    'periodo': pico['periodo'],
+                    'horas_semanales_totales': pico['horas_semanales']['total'],
+                },
+                'periodo_pico_suma_aislada': {
+                    'periodo': pico_aislado['periodo'],
+                    'horas_semanales_totales': pico_aislado['horas_semanales_aisladas']['total'],
+                },
+                'distribucion_pico': pico['horas_semanales'],
+            },
+            'consumo_por_periodo': consumo,
+            'secciones_combinadas': self.fusiones,
+        }
+
+        output_path = self.config['output']['json']
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        escribir_json_indexado(resultado, output_path)
+
+        self.informar("\n" + "=" * 80)
+        self.informar("ANALISIS DE CAMPUS COMPLETADO")
+        self.informar("=" * 80)
+        self.informar(f"  JSON guardado en: {output_path}")
+        self.informar(f"\nPeriodo pico campus: {pico['periodo']} "
+              f"({pico['horas_semanales']['total']:.2f} hrs/semana)")
+        self.informar(f"Pico sumando corridas por carrera: {pico_aislado['periodo']} "
+              f"({pico_aislado['horas_semanales_aisladas']['total']:.2f} hrs/semana)")
+
+        return resultado
+
+
+if __name__ == "__main__":
+    import sys
+    AnalizadorCampus(sys.argv[1] if len(sys.argv) > 1 else 'config_campus.json').ejecutar()
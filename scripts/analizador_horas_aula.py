@@ -9,74 +9,335 @@ matriculados y secciones necesarias.
 
 import pandas as pd
 import numpy as np
+import copy
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import math
 
+from analitica_picos import analizar_picos
+from avance import Avance
+from cubo_consumo import CuboConsumo
+from detalle_columnar import FORMATOS_DETALLE, a_columnas
+from lector_json import escribir_json_indexado
+from exportador_formatos import exportar_formatos
+from generador_proyeccion import generar_proyeccion
+from periodos import (
+    claves_desde_fechas, anio_de_clave, ciclo_de_clave,
+    etiqueta_periodo, etiqueta_ciclo,
+)
+
+
+# ---------------------------------------------------------------------------
+# Esquemas de los libros de entrada
+# ---------------------------------------------------------------------------
+# Solo se leen las columnas declaradas. Tipos:
+#   'entero' → numérico sin decimales y sin vacíos (claves, semestres, matrícula)
+#   'numero' → numérico, admite vacíos
+#   'texto'  → se lee como cadena, admite vacíos
+#   'fecha'  → debe poder interpretarse como fecha, sin vacíos
+#   'libre'  → se lee tal cual (p. ej. códigos equivalentes mixtos)
+
+ESQUEMA_MALLA = {
+    'CODIGO_CURSO'          : 'entero',
+    'CURSO'                 : 'texto',
+    'SEMESTRE'              : 'entero',
+    'CREDITOS'              : 'numero',
+    'HORAS_TEORICAS'        : 'numero',
+    'HORAS_PRACTICAS'       : 'numero',
+    'TOTAL_HORAS_SEMANALES' : 'numero',
+    'TIPO_AMBIENTE_TEORIA'  : 'texto',
+    'TIPO_AMBIENTE_PRACTICA': 'texto',
+}
+
+ESQUEMA_PROYECCION = {
+    'PERIODO'           : 'fecha',
+    'CURSO'             : 'texto',
+    'SEMESTRE'          : 'entero',
+    'CODIGO_CURSO'      : 'entero',
+    'TOTAL_MATRICULADOS': 'entero',
+}
+
+ESQUEMA_EQUIVALENCIAS = {
+    'CODIGO_CURSO'            : 'entero',
+    'CURSO'                   : 'texto',
+    'SEMESTRE'                : 'entero',
+    'PROGRAMA_EQUIVALENTE'    : 'texto',
+    'CODIGO_CURSO_EQUIVALENTE': 'libre',
+    'CURSO_EQUIVALENTE'       : 'texto',
+}
+
+
+def _filas_excel(mascara, limite=5):
+    """Convierte una máscara de filas inválidas en números de fila de Excel."""
+    filas = [int(i) + 2 for i in np.flatnonzero(mascara.to_numpy())[:limite]]
+    return ', '.join(str(f) for f in filas) + (' ...' if mascara.sum() > limite else '')
+
+
+def leer_excel_validado(ruta, esquema):
+    """
+    Lee un libro Excel validando columnas y tipos contra el esquema.
+
+    Primero revisa la fila de encabezados (falla de inmediato si falta
+    alguna columna) y luego lee solo las columnas del esquema con el tipo
+    declarado. Lanza ValueError indicando archivo, columna y filas afectadas.
+    """
+    with pd.ExcelFile(ruta) as libro:
+        encabezados = libro.parse(nrows=0).columns
+        faltantes = [col for col in esquema if col not in encabezados]
+        if faltantes:
+            raise ValueError(f"{ruta}: faltan columnas requeridas {faltantes}")
+
+        tipos_texto = {col: str for col, tipo in esquema.items() if tipo == 'texto'}
+        df = libro.parse(usecols=list(esquema), dtype=tipos_texto)
+
+    for col, tipo in esquema.items():
+        if tipo == 'entero' or tipo == 'numero':
+            valores = pd.to_numeric(df[col], errors='coerce')
+            invalidos = valores.isna() & df[col].notna()
+            if tipo == 'entero':
+                invalidos |= valores.isna() | (valores % 1 != 0)
+            if invalidos.any():
+                raise ValueError(
+                    f"{ruta}: columna '{col}' debe ser {tipo}; "
+                    f"valores invalidos en filas {_filas_excel(invalidos)}"
+                )
+            df[col] = valores.astype('int64') if tipo == 'entero' else valores
+        elif tipo == 'fecha':
+            valores = pd.to_datetime(df[col], errors='coerce')
+            invalidos = valores.isna()
+            if invalidos.any():
+                raise ValueError(
+                    f"{ruta}: columna '{col}' debe ser fecha; "
+                    f"valores invalidos en filas {_filas_excel(invalidos)}"
+                )
+            df[col] = valores
+
+    return df
+
+
+def calcular_secciones(num_estudiantes, tipo_ambiente, parametros):
+    """
+    Número de secciones necesarias para `num_estudiantes` en un tipo de
+    ambiente, según las capacidades de `parametros`.
+    """
+    if num_estudiantes == 0:
+        return 0
+    
+    tipo_ambiente_lower = str(tipo_ambiente).lower()
+    
+    # Aula
+    if tipo_ambiente_lower == 'aula':
+        max_estudiantes = parametros['tamano_seccion_aula']
+    # Cualquier tipo de Laboratorio usa la capacidad de laboratorio
+    elif 'laboratorio' in tipo_ambiente_lower:
+        max_estudiantes = parametros['tamano_seccion_laboratorio']
+    # Taller
+    elif tipo_ambiente_lower == 'taller':
+        max_estudiantes = parametros['tamano_seccion_taller']
+    # Virtual
+    elif tipo_ambiente_lower == 'virtual':
+        return 1  # Virtual no se divide en secciones
+    # Cualquier otro ambiente, usar capacidad de aula por defecto
+    else:
+        max_estudiantes = parametros['tamano_seccion_aula']
+    
+    return math.ceil(num_estudiantes / max_estudiantes)
+
+
+def calcular_secciones_vectorizado(num_estudiantes, tipos_ambiente, parametros):
+    """
+    Versión vectorizada de `calcular_secciones` para arreglos del mismo largo.
+    Da exactamente el mismo resultado fila a fila (tipos vacíos o desconocidos
+    usan la capacidad de aula).
+    """
+    num   = np.asarray(num_estudiantes, dtype='float64')
+    tipos = pd.Series(tipos_ambiente, dtype='object').str.lower()
+
+    es_aula        = (tipos == 'aula').to_numpy()
+    es_laboratorio = tipos.str.contains('laboratorio', regex=False, na=False).to_numpy(dtype=bool)
+    es_taller      = (tipos == 'taller').to_numpy()
+    es_virtual     = (tipos == 'virtual').to_numpy()
+
+    capacidad = np.select(
+        [es_aula, es_laboratorio, es_taller],
+        [parametros['tamano_seccion_aula'], parametros['tamano_seccion_laboratorio'],
+         parametros['tamano_seccion_taller']],
+        default=parametros['tamano_seccion_aula'],
+    )
+    secciones = np.where(es_virtual, 1, np.ceil(num / capacidad))
+    return np.where(num == 0, 0, secciones).astype('int64')
+
+
+def categoria_ambiente(tipo_ambiente):
+    """
+    Categoría principal ('aula', 'laboratorio', 'taller', 'virtual') de un
+    tipo de ambiente específico. Tipos desconocidos o vacíos cuentan como aula.
+    """
+    if pd.isna(tipo_ambiente):
+        return 'aula'
+        
+    tipo_lower = str(tipo_ambiente).lower()
+    
+    if tipo_lower == 'aula':
+        return 'aula'
+    elif 'laboratorio' in tipo_lower:
+        return 'laboratorio'
+    elif tipo_lower == 'taller':
+        return 'taller'
+    elif tipo_lower == 'virtual':
+        return 'virtual'
+    else:
+        return 'aula'  # Por defecto
+
+
+CATEGORIAS_AMBIENTE = ['aula', 'laboratorio', 'taller', 'virtual']
+
+
+# ---------------------------------------------------------------------------
+# Trabajo por programa (funciones de módulo: se envían a hilos o procesos)
+# ---------------------------------------------------------------------------
+# config['paralelismo'] = {"ejecutor": "procesos" | "hilos" | "secuencial",
+#                          "max_trabajadores": null (= núcleos disponibles)}
+
+EJECUTORES = ('secuencial', 'hilos', 'procesos')
+
+
+def cargar_tablas_programa(config, programa):
+    """
+    Lee y valida malla, proyección y equivalencias de un programa.
+    Si el programa tiene entrada en config['cohortes'], la proyección se
+    genera por cohortes. Retorna (malla, proyeccion, equivalencias).
+    """
+    archivos = config['archivos'][programa]
+    malla = leer_excel_validado(archivos['malla'], ESQUEMA_MALLA)
+
+    cohortes = config.get('cohortes', {}).get(programa)
+    if cohortes is not None:
+        proyeccion = generar_proyeccion(malla, cohortes)
+    else:
+        proyeccion = leer_excel_validado(archivos['proyeccion'], ESQUEMA_PROYECCION)
+
+    equivalencias = leer_excel_validado(archivos['equivalencias'], ESQUEMA_EQUIVALENCIAS)
+    return malla, proyeccion, equivalencias
+
+
+def _calcular_programa(analizador, programa):
+    """Retorna (resultados, malla expandida) de un programa."""
+    datos = analizador.calcular_programa(programa)
+    return datos, analizador.mallas_expandidas[programa]
+
+
 class AnalizadorHorasAula:
     """
     Clase para analizar el consumo de horas-aula de una carrera.
     """
     
-    def __init__(self, config_path='config.json'):
-        """Inicializa el analizador cargando la configuración."""
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = json.load(f)
+    def __init__(self, config_path='config.json', datos=None, silencioso=False, progreso=None):
+        """
+        Inicializa el analizador cargando la configuración.
+        Con `datos` (DatosCompartidos, o cualquier objeto con `config` y
+        `tablas()`) toma la configuración y las tablas ya cargadas y no lee archivos.
+        Con `silencioso` no escribe en consola; los mensajes de avance van
+        igual a logging y al callback `progreso` (ver avance.py).
+        """
+        self.informar = Avance('analizador', silencioso, progreso)
+        if datos is not None:
+            self.config = datos.config
+        else:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                self.config = json.load(f)
         
         self.parametros = self.config['parametros']
         self.archivos = self.config['archivos']
+        self.paralelismo = self.config.get('paralelismo', {})
+        self.formato_detalle = self.config['output'].get('formato_detalle', 'filas')
+        if self.formato_detalle not in FORMATOS_DETALLE:
+            raise ValueError(f"output.formato_detalle no valido: '{self.formato_detalle}' "
+                             f"(use {', '.join(FORMATOS_DETALLE)})")
         
         # DataFrames
         self.mallas = {}
         self.proyecciones = {}
         self.equivalencias = {}
         self.resultados = {}
+        self.mallas_expandidas = {}  # Caché de expandir_malla()
         
         # Información de equivalencias
         self.cursos_compartidos = []  # Cursos compartidos entre LLYA y MYC
-        self.cursos_a_eliminar = {'LLYA': [], 'MYC': []}  # Cursos que van a otras carreras
-        
-        print("=" * 80)
-        print(f"ANALIZADOR DE HORAS-AULA - {self.config['metadata']['carrera']}")
-        print("=" * 80)
-        print(f"Fecha: {self.config['metadata']['fecha_analisis']}")
-        print(f"Programas: {', '.join(self.config['metadata']['programas'])}")
-        print(f"\nParámetros:")
-        print(f"  - Tamaño sección Aula: {self.parametros['tamano_seccion_aula']} estudiantes")
-        print(f"  - Tamaño sección Laboratorio: {self.parametros['tamano_seccion_laboratorio']} estudiantes")
-        print(f"  - Tamaño sección Taller: {self.parametros['tamano_seccion_taller']} estudiantes")
-        print(f"  - Semanas por semestre: {self.parametros['semanas_por_semestre']}")
-        print("=" * 80)
+        self.cursos_a_eliminar = {p: [] for p in self.config['metadata']['programas']}  # Cursos que van a otras carreras
+
+        if datos is not None:
+            self.mallas, self.proyecciones, self.equivalencias = datos.tablas()
+        
+        self.informar("=" * 80)
+        self.informar(f"ANALIZADOR DE HORAS-AULA - {self.config['metadata']['carrera']}")
+        self.informar("=" * 80)
+        self.informar(f"Fecha: {self.config['metadata']['fecha_analisis']}")
+        self.informar(f"Programas: {', '.join(self.config['metadata']['programas'])}")
+        self.informar(f"\nParámetros:")
+        self.informar(f"  - Tamaño sección Aula: {self.parametros['tamano_seccion_aula']} estudiantes")
+        self.informar(f"  - Tamaño sección Laboratorio: {self.parametros['tamano_seccion_laboratorio']} estudiantes")
+        self.informar(f"  - Tamaño sección Taller: {self.parametros['tamano_seccion_taller']} estudiantes")
+        self.informar(f"  - Semanas por semestre: {self.parametros['semanas_por_semestre']}")
+        self.informar("=" * 80)
     
     def cargar_datos(self):
-        """Carga las mallas curriculares, proyecciones de matrícula y equivalencias."""
-        print("\nCargando datos...")
-        
-        for programa in self.config['metadata']['programas']:
-            # Cargar malla curricular
-            malla_path = self.archivos[programa]['malla']
-            self.mallas[programa] = pd.read_excel(malla_path)
-            print(f"    Malla {programa}: {len(self.mallas[programa])} cursos")
-            
-            # Cargar proyección
-            proy_path = self.archivos[programa]['proyeccion']
-            self.proyecciones[programa] = pd.read_excel(proy_path)
-            print(f"    Proyeccion {programa}: {len(self.proyecciones[programa])} registros")
-            
-            # Cargar equivalencias
-            equiv_path = self.archivos[programa]['equivalencias']
-            self.equivalencias[programa] = pd.read_excel(equiv_path)
-            print(f"    Equivalencias {programa}: {len(self.equivalencias[programa])} registros")
+        """
+        Carga las mallas curriculares, proyecciones de matrícula y equivalencias.
+        Cada libro se valida contra su esquema (columnas y tipos) al leerse.
+        Los programas con entrada en config['cohortes'] generan su proyección
+        por flujo de cohortes en lugar de leer el Excel.
+        Los programas se cargan en paralelo según config['paralelismo'].
+        """
+        self.informar("\nCargando datos...")
+        self.mallas_expandidas = {}
+
+        programas = self.config['metadata']['programas']
+        tablas = self.en_paralelo(cargar_tablas_programa, [(self.config, p) for p in programas])
+
+        for programa, (malla, proyeccion, equivalencias) in zip(programas, tablas):
+            self.mallas[programa] = malla
+            self.proyecciones[programa] = proyeccion
+            self.equivalencias[programa] = equivalencias
+
+            origen = " (por cohortes)" if programa in self.config.get('cohortes', {}) else ""
+            self.informar(f"    Malla {programa}: {len(malla)} cursos")
+            self.informar(f"    Proyeccion {programa}: {len(proyeccion)} registros{origen}")
+            self.informar(f"    Equivalencias {programa}: {len(equivalencias)} registros")
         
-        print("  Datos cargados exitosamente\n")
+        self.informar("  Datos cargados exitosamente\n")
+
+    def en_paralelo(self, funcion, tareas):
+        """
+        Aplica `funcion(*tarea)` a cada tarea con el ejecutor de
+        config['paralelismo'] y retorna los resultados en orden. Con un solo
+        trabajador (o ejecutor "secuencial") no se crea ningún pool.
+        """
+        ejecutor = self.paralelismo.get('ejecutor', 'secuencial')
+        if ejecutor not in EJECUTORES:
+            raise ValueError(f"paralelismo.ejecutor no valido: '{ejecutor}' (use {', '.join(EJECUTORES)})")
+
+        trabajadores = self.paralelismo.get('max_trabajadores') or min(len(tareas), os.cpu_count() or 1)
+        if ejecutor == 'secuencial' or trabajadores <= 1 or len(tareas) <= 1:
+            return [funcion(*tarea) for tarea in tareas]
+
+        clase = ThreadPoolExecutor if ejecutor == 'hilos' else ProcessPoolExecutor
+        with clase(max_workers=trabajadores) as pool:
+            return list(pool.map(funcion, *zip(*tareas)))
     
     def identificar_cursos_compartidos(self):
         """
         Identifica cursos compartidos entre LLYA y MYC.
         Un curso es compartido si PROGRAMA_EQUIVALENTE indica el otro programa.
         """
-        print("\nIdentificando cursos compartidos entre LLYA y MYC...")
+        self.informar("\nIdentificando cursos compartidos entre LLYA y MYC...")
+
+        if not {'LLYA', 'MYC'} <= set(self.equivalencias):
+            self.informar("  INFO: La carrera no tiene los programas LLYA y MYC; sin cursos compartidos\n")
+            return self.cursos_compartidos
         
         equiv_llya = self.equivalencias['LLYA']
         equiv_myc = self.equivalencias['MYC']
@@ -108,12 +369,12 @@ class AnalizadorHorasAula:
                         'semestre_myc': myc_match.iloc[0]['SEMESTRE']
                     })
                 else:
-                    print(f"  ADVERTENCIA: Nombres no coinciden - LLYA: '{nombre_llya}' vs Equiv: '{nombre_equiv}'")
+                    self.informar(f"  ADVERTENCIA: Nombres no coinciden - LLYA: '{nombre_llya}' vs Equiv: '{nombre_equiv}'")
         
-        print(f"  {len(self.cursos_compartidos)} cursos compartidos identificados:")
+        self.informar(f"  {len(self.cursos_compartidos)} cursos compartidos identificados:")
         for curso in self.cursos_compartidos:
-            print(f"    - {curso['nombre']}")
-        print()
+            self.informar(f"    - {curso['nombre']}")
+        self.informar()
         
         return self.cursos_compartidos
     
@@ -123,9 +384,9 @@ class AnalizadorHorasAula:
         Solo estos cursos se eliminan del análisis.
         Cursos equivalentes a otras carreras (Psicología, etc.) se mantienen.
         """
-        print("\nIdentificando cursos que van a Educación Inicial...")
+        self.informar("\nIdentificando cursos que van a Educación Inicial...")
         
-        for programa in ['LLYA', 'MYC']:
+        for programa in self.config['metadata']['programas']:
             equiv = self.equivalencias[programa]
             
             # NUEVA LÓGICA: Solo eliminar cursos que van a Educación Inicial
@@ -137,7 +398,7 @@ class AnalizadorHorasAula:
             
             self.cursos_a_eliminar[programa] = cursos_a_inicial['CODIGO_CURSO'].tolist()
             
-            print(f"  {programa}: {len(self.cursos_a_eliminar[programa])} cursos van a Educación Inicial")
+            self.informar(f"  {programa}: {len(self.cursos_a_eliminar[programa])} cursos van a Educación Inicial")
             
             # Información adicional: cursos a otras carreras (que SÍ se cuentan)
             cursos_otras_carreras = equiv[
@@ -148,10 +409,10 @@ class AnalizadorHorasAula:
             ]
             
             if len(cursos_otras_carreras) > 0:
-                print(f"  INFO: {programa}: {len(cursos_otras_carreras)} cursos de otras carreras (se mantienen)")
-                print(f"      Carreras: {cursos_otras_carreras['PROGRAMA_EQUIVALENTE'].unique().tolist()}")
+                self.informar(f"  INFO: {programa}: {len(cursos_otras_carreras)} cursos de otras carreras (se mantienen)")
+                self.informar(f"      Carreras: {cursos_otras_carreras['PROGRAMA_EQUIVALENTE'].unique().tolist()}")
         
-        print(f"  Total eliminados (solo Educación Inicial): {sum(len(v) for v in self.cursos_a_eliminar.values())}\n")
+        self.informar(f"  Total eliminados (solo Educación Inicial): {sum(len(v) for v in self.cursos_a_eliminar.values())}\n")
         
         return self.cursos_a_eliminar
     
@@ -206,51 +467,32 @@ class AnalizadorHorasAula:
         Calcula el número de secciones necesarias según el tipo de ambiente.
         Maneja laboratorios específicos (Química, Computadoras, etc.)
         """
-        if num_estudiantes == 0:
-            return 0
-        
-        tipo_ambiente_lower = str(tipo_ambiente).lower()
-        
-        # Aula
-        if tipo_ambiente_lower == 'aula':
-            max_estudiantes = self.parametros['tamano_seccion_aula']
-        # Cualquier tipo de Laboratorio usa la capacidad de laboratorio
-        elif 'laboratorio' in tipo_ambiente_lower:
-            max_estudiantes = self.parametros['tamano_seccion_laboratorio']
-        # Taller
-        elif tipo_ambiente_lower == 'taller':
-            max_estudiantes = self.parametros['tamano_seccion_taller']
-        # Virtual
-        elif tipo_ambiente_lower == 'virtual':
-            return 1  # Virtual no se divide en secciones
-        # Cualquier otro ambiente, usar capacidad de aula por defecto
-        else:
-            max_estudiantes = self.parametros['tamano_seccion_aula']
-        
-        return math.ceil(num_estudiantes / max_estudiantes)
+        return calcular_secciones(num_estudiantes, tipo_ambiente, self.parametros)
     
-    def procesar_programa(self, programa):
-        """Procesa un programa específico (LLYA o MYC)."""
-        print(f"\nProcesando programa: {programa}")
-        
-        malla = self.mallas[programa].copy()
-        proyeccion = self.proyecciones[programa].copy()
-        
-        # NUEVO: Filtrar cursos a eliminar
-        cursos_eliminar = self.cursos_a_eliminar[programa]
-        if len(cursos_eliminar) > 0:
-            malla = malla[~malla['CODIGO_CURSO'].isin(cursos_eliminar)]
-            proyeccion = proyeccion[~proyeccion['CODIGO_CURSO'].isin(cursos_eliminar)]
-            print(f"  Eliminados {len(cursos_eliminar)} cursos que van a otras carreras")
-        
-        # Preparar proyección
-        proyeccion['PERIODO_STR'] = pd.to_datetime(proyeccion['PERIODO']).dt.strftime('%Y-%m')
-        proyeccion['AÑO'] = pd.to_datetime(proyeccion['PERIODO']).dt.year
-        proyeccion['CICLO'] = proyeccion['PERIODO_STR'].str[-2:].apply(lambda x: 'I' if x == '01' else 'II')
-        
-        # Preparar malla con tipos de ambiente
+    def secciones_por_fila(self, datos):
+        """
+        Secciones de cada fila (proyección × malla); 0 si la fila no tiene
+        tipo de ambiente (curso sin malla). Implementación de referencia, fila a fila.
+        """
+        return datos.apply(
+            lambda row: self.calcular_secciones(
+                row['TOTAL_MATRICULADOS'], 
+                row['TIPO_AMBIENTE']
+            ) if pd.notna(row['TIPO_AMBIENTE']) else 0,
+            axis=1
+        )
+
+    def expandir_malla(self, programa):
+        """
+        Expande la malla del programa a una fila por (curso, tipo de ambiente)
+        con sus horas semanales. El resultado se guarda en memoria y se
+        reutiliza en cada procesamiento del programa.
+        """
+        if programa in self.mallas_expandidas:
+            return self.mallas_expandidas[programa]
+
         malla_detalle = []
-        for _, row in malla.iterrows():
+        for _, row in self.mallas[programa].iterrows():
             ambientes = self.mapear_tipo_ambiente(row)
             for tipo_amb, horas in ambientes:
                 malla_detalle.append({
@@ -260,8 +502,27 @@ class AnalizadorHorasAula:
                     'TIPO_AMBIENTE': tipo_amb,
                     'HORAS_SEMANALES': horas
                 })
+
+        self.mallas_expandidas[programa] = pd.DataFrame(malla_detalle)
+        return self.mallas_expandidas[programa]
+
+    def calcular_programa(self, programa):
+        """
+        Une la proyección del programa con su malla expandida y calcula
+        secciones y horas. No imprime ni modifica `resultados`.
+        """
+        malla_expandida = self.expandir_malla(programa)
+        proyeccion = self.proyecciones[programa].copy()
+        
+        # NUEVO: Filtrar cursos a eliminar
+        cursos_eliminar = self.cursos_a_eliminar[programa]
+        if len(cursos_eliminar) > 0:
+            malla_expandida = malla_expandida[~malla_expandida['CODIGO_CURSO'].isin(cursos_eliminar)]
+            proyeccion = proyeccion[~proyeccion['CODIGO_CURSO'].isin(cursos_eliminar)]
         
-        malla_expandida = pd.DataFrame(malla_detalle)
+        # Preparar proyección: clave entera de periodo (año*2 + ciclo-1),
+        # las etiquetas "2027-01" se generan recién al exportar
+        proyeccion['CLAVE_PERIODO'] = claves_desde_fechas(proyeccion['PERIODO'])
         
         # Unir proyección con malla
         datos = proyeccion.merge(
@@ -271,22 +532,53 @@ class AnalizadorHorasAula:
         )
         
         # Calcular secciones
-        datos['SECCIONES'] = datos.apply(
-            lambda row: self.calcular_secciones(
-                row['TOTAL_MATRICULADOS'], 
-                row['TIPO_AMBIENTE']
-            ) if pd.notna(row['TIPO_AMBIENTE']) else 0,
-            axis=1
-        )
+        datos['SECCIONES'] = self.secciones_por_fila(datos)
         
         # Calcular horas totales (horas del curso × secciones)
         datos['HORAS_TOTALES'] = datos['HORAS_SEMANALES'] * datos['SECCIONES']
         
+        return datos
+
+    def _mensajes_programa(self, programa):
+        self.informar(f"\nProcesando programa: {programa}")
+        if len(self.cursos_a_eliminar[programa]) > 0:
+            self.informar(f"  Eliminados {len(self.cursos_a_eliminar[programa])} cursos que van a otras carreras")
+
+    def procesar_programa(self, programa):
+        """Procesa un programa específico (LLYA o MYC)."""
+        self._mensajes_programa(programa)
+        datos = self.calcular_programa(programa)
         self.resultados[programa] = datos
-        
-        print(f"  {programa} procesado: {len(datos)} registros")
-        
+        self.informar(f"  {programa} procesado: {len(datos)} registros")
         return datos
+
+    def _copia_programa(self, programa):
+        """Copia liviana con solo las tablas de `programa` (para enviar a un trabajador)."""
+        copia = copy.copy(self)
+        copia.mallas = {programa: self.mallas[programa]}
+        copia.proyecciones = {programa: self.proyecciones[programa]}
+        copia.equivalencias = {}
+        copia.resultados = {}
+        copia.mallas_expandidas = {
+            p: m for p, m in self.mallas_expandidas.items() if p == programa
+        }
+        return copia
+
+    def procesar_programas(self):
+        """
+        Procesa todos los programas; según config['paralelismo'] cada uno
+        se calcula en su propio hilo o proceso. Los mensajes y los
+        resultados quedan en el mismo orden que en la ejecución secuencial.
+        """
+        programas = self.config['metadata']['programas']
+        calculados = self.en_paralelo(
+            _calcular_programa, [(self._copia_programa(p), p) for p in programas]
+        )
+        for programa, (datos, malla_expandida) in zip(programas, calculados):
+            self._mensajes_programa(programa)
+            self.mallas_expandidas[programa] = malla_expandida
+            self.resultados[programa] = datos
+            self.informar(f"  {programa} procesado: {len(datos)} registros")
     
     def procesar_cursos_compartidos(self):
         """
@@ -303,10 +595,10 @@ class AnalizadorHorasAula:
         - Fase 3 (solo MYC): Solo MYC tiene alumnos activos → se cuenta como
           curso exclusivo de MYC sin fusión (caso simétrico al prematuro).
         """
-        print("\nProcesando cursos compartidos...")
+        self.informar("\nProcesando cursos compartidos...")
 
         if len(self.cursos_compartidos) == 0:
-            print("  INFO: No hay cursos compartidos para procesar")
+            self.informar("  INFO: No hay cursos compartidos para procesar")
             return
 
         for curso_comp in self.cursos_compartidos:
@@ -318,11 +610,11 @@ class AnalizadorHorasAula:
             datos_myc  = self.resultados['MYC'][self.resultados['MYC']['CODIGO_CURSO']  == codigo_myc].copy()
 
             if len(datos_llya) == 0 or len(datos_myc) == 0:
-                print(f"  ADVERTENCIA: Curso '{nombre}' no tiene datos en ambos programas")
+                self.informar(f"  ADVERTENCIA: Curso '{nombre}' no tiene datos en ambos programas")
                 continue
 
             periodos_unicos = sorted(
-                set(datos_llya['PERIODO_STR'].unique()) | set(datos_myc['PERIODO_STR'].unique())
+                set(datos_llya['CLAVE_PERIODO'].unique()) | set(datos_myc['CLAVE_PERIODO'].unique())
             )
 
             periodos_prematuros  = []
@@ -330,8 +622,8 @@ class AnalizadorHorasAula:
             periodos_solo_myc    = []
 
             for periodo in periodos_unicos:
-                llya_p = datos_llya[datos_llya['PERIODO_STR'] == periodo]
-                myc_p  = datos_myc[datos_myc['PERIODO_STR']  == periodo]
+                llya_p = datos_llya[datos_llya['CLAVE_PERIODO'] == periodo]
+                myc_p  = datos_myc[datos_myc['CLAVE_PERIODO']  == periodo]
 
                 # Determinar si cada programa tiene alumnos ACTIVOS en este periodo
                 llya_activo = llya_p['TOTAL_MATRICULADOS'].sum() > 0
@@ -360,7 +652,7 @@ class AnalizadorHorasAula:
                     # Eliminar TODAS las filas de MYC para este curso/periodo de una sola vez
                     mask_myc = (
                         (self.resultados['MYC']['CODIGO_CURSO'] == codigo_myc) &
-                        (self.resultados['MYC']['PERIODO_STR']  == periodo)
+                        (self.resultados['MYC']['CLAVE_PERIODO'] == periodo)
                     )
                     self.resultados['MYC'] = self.resultados['MYC'][~mask_myc]
 
@@ -372,7 +664,7 @@ class AnalizadorHorasAula:
 
                     mask_myc_cero = (
                         (self.resultados['MYC']['CODIGO_CURSO'] == codigo_myc) &
-                        (self.resultados['MYC']['PERIODO_STR']  == periodo) &
+                        (self.resultados['MYC']['CLAVE_PERIODO'] == periodo) &
                         (self.resultados['MYC']['TOTAL_MATRICULADOS'] == 0)
                     )
                     self.resultados['MYC'] = self.resultados['MYC'][~mask_myc_cero]
@@ -383,7 +675,7 @@ class AnalizadorHorasAula:
 
                     mask_llya_cero = (
                         (self.resultados['LLYA']['CODIGO_CURSO'] == codigo_llya) &
-                        (self.resultados['LLYA']['PERIODO_STR']  == periodo) &
+                        (self.resultados['LLYA']['CLAVE_PERIODO'] == periodo) &
                         (self.resultados['LLYA']['TOTAL_MATRICULADOS'] == 0)
                     )
                     self.resultados['LLYA'] = self.resultados['LLYA'][~mask_llya_cero]
@@ -396,9 +688,9 @@ class AnalizadorHorasAula:
                 resumen += f" {len(periodos_compartidos)} periodos compartidos (fusionados),"
             if periodos_solo_myc:
                 resumen += f" {len(periodos_solo_myc)} periodos solo MYC,"
-            print(resumen.rstrip(','))
+            self.informar(resumen.rstrip(','))
 
-        print(f"  {len(self.cursos_compartidos)} cursos compartidos procesados\n")
+        self.informar(f"  {len(self.cursos_compartidos)} cursos compartidos procesados\n")
     
     def normalizar_tipo_ambiente(self, tipo_ambiente):
         """
@@ -418,112 +710,91 @@ class AnalizadorHorasAula:
         Agrupa tipos de ambiente en categorías principales para resúmenes legacy.
         SOLO para compatibilidad con reportes existentes.
         """
-        if pd.isna(tipo_ambiente):
-            return 'aula'
-            
-        tipo_lower = str(tipo_ambiente).lower()
-        
-        if tipo_lower == 'aula':
-            return 'aula'
-        elif 'laboratorio' in tipo_lower:
-            return 'laboratorio'
-        elif tipo_lower == 'taller':
-            return 'taller'
-        elif tipo_lower == 'virtual':
-            return 'virtual'
-        else:
-            return 'aula'  # Por defecto
+        return categoria_ambiente(tipo_ambiente)
     
+    def construir_cubo(self):
+        """
+        Construye el cubo de consumo (ver cubo_consumo) a partir de los
+        resultados actuales. Se llama después de fusionar los cursos
+        compartidos; los resúmenes son consultas sobre él.
+        """
+        programas = self.config['metadata']['programas']
+        self._cubo = CuboConsumo.desde_resultados(self.resultados, programas, categoria_ambiente)
+        self._cubo_fuente = tuple(self.resultados[p] for p in programas)
+        return self._cubo
+
+    @property
+    def cubo(self):
+        """Cubo de los resultados actuales; se reconstruye si `resultados` cambió."""
+        fuente = tuple(self.resultados.get(p) for p in self.config['metadata']['programas'])
+        vigente = getattr(self, '_cubo_fuente', None)
+        if vigente is None or len(vigente) != len(fuente) or any(a is not b for a, b in zip(vigente, fuente)):
+            self.construir_cubo()
+        return self._cubo
+
     def generar_resumen_por_periodo(self):
         """Genera el resumen de consumo por periodo."""
-        print("\nGenerando resumen por periodo...")
+        self.informar("\nGenerando resumen por periodo...")
         
         resumen_periodos = []
-        
-        # Obtener todos los periodos únicos
-        todos_periodos = set()
-        for programa in self.config['metadata']['programas']:
-            periodos = self.resultados[programa]['PERIODO_STR'].unique()
-            todos_periodos.update(periodos)
-        
-        periodos_ordenados = sorted(list(todos_periodos))
-        
-        for periodo in periodos_ordenados:
+        cubo = self.cubo
+        semanas = self.parametros['semanas_por_semestre']
+
+        # Totales por periodo × programa × categoría, y estudiantes por periodo × programa
+        por_categoria = cubo.rollup(['periodo', 'programa', 'categoria'], ['horas', 'secciones'])
+        horas_cat = por_categoria['horas'].to_dict()
+        secciones_cat = por_categoria['secciones'].to_dict()
+        estudiantes = cubo.rollup(['periodo', 'programa'], ['estudiantes'])['estudiantes'].to_dict()
+        cero_horas, cero_secciones = cubo.cero('horas'), cubo.cero('secciones')
+        
+        for periodo in cubo.valores('periodo'):
             resumen_periodo = {
-                'periodo': periodo,
-                'año': int(periodo[:4]),
-                'ciclo': 'I' if periodo.endswith('01') else 'II',
+                'periodo': etiqueta_periodo(periodo),
+                'año': int(anio_de_clave(periodo)),
+                'ciclo': etiqueta_ciclo(periodo),
                 'estudiantes': {},
-                'horas_semanales': {
-                    'aula': 0,
-                    'laboratorio': 0,
-                    'taller': 0,
-                    'virtual': 0,
-                    'total': 0
-                },
-                'horas_semestre': {
-                    'aula': 0,
-                    'laboratorio': 0,
-                    'taller': 0,
-                    'virtual': 0,
-                    'total': 0
-                },
-                'secciones': {
-                    'aula': 0,
-                    'laboratorio': 0,
-                    'taller': 0,
-                    'virtual': 0,
-                    'total': 0
-                },
+                'horas_semanales': dict.fromkeys(CATEGORIAS_AMBIENTE + ['total'], 0),
+                'horas_semestre': dict.fromkeys(CATEGORIAS_AMBIENTE + ['total'], 0),
+                'secciones': dict.fromkeys(CATEGORIAS_AMBIENTE + ['total'], 0),
                 'detalle_por_programa': {}
             }
             
-            # Totales de estudiantes
+            # Totales de estudiantes (primera fila del programa en el periodo)
             total_estudiantes = 0
             total_llya = 0
             total_myc = 0
             
             for programa in self.config['metadata']['programas']:
-                datos_periodo = self.resultados[programa][
-                    self.resultados[programa]['PERIODO_STR'] == periodo
-                ]
+                if (periodo, programa) not in estudiantes:
+                    continue
+                estudiantes_prog = estudiantes[(periodo, programa)]
                 
-                if len(datos_periodo) > 0:
-                    estudiantes_prog = datos_periodo['TOTAL_MATRICULADOS'].iloc[0]
-                    
-                    if programa == 'LLYA':
-                        total_llya = int(estudiantes_prog)
-                    else:
-                        total_myc = int(estudiantes_prog)
-                    
-                    total_estudiantes += estudiantes_prog
-                    
-                    # Agregar por tipo de ambiente
-                    detalle_programa = {
-                        'estudiantes': int(estudiantes_prog),
-                        'horas_semanales': {},
-                        'secciones': {}
-                    }
+                if programa == 'LLYA':
+                    total_llya = int(estudiantes_prog)
+                else:
+                    total_myc = int(estudiantes_prog)
+                
+                total_estudiantes += estudiantes_prog
+                
+                detalle_programa = {
+                    'estudiantes': int(estudiantes_prog),
+                    'horas_semanales': {},
+                    'secciones': {}
+                }
+                
+                for ambiente_categoria in CATEGORIAS_AMBIENTE:
+                    clave = (periodo, programa, ambiente_categoria)
+                    horas = horas_cat.get(clave, cero_horas)
+                    secciones = secciones_cat.get(clave, cero_secciones)
                     
-                    # Agrupar por categoría de ambiente
-                    for ambiente_categoria in ['aula', 'laboratorio', 'taller', 'virtual']:
-                        # Filtrar datos usando la función de agrupación
-                        datos_amb = datos_periodo[
-                            datos_periodo['TIPO_AMBIENTE'].apply(self.agrupar_por_categoria_ambiente) == ambiente_categoria
-                        ]
-                        
-                        horas = datos_amb['HORAS_TOTALES'].sum()
-                        secciones = datos_amb['SECCIONES'].sum()
-                        
-                        resumen_periodo['horas_semanales'][ambiente_categoria] += horas
-                        resumen_periodo['secciones'][ambiente_categoria] += secciones
-                        
-                        detalle_programa['horas_semanales'][ambiente_categoria] = float(horas)
-                        detalle_programa['secciones'][ambiente_categoria] = int(secciones)
+                    resumen_periodo['horas_semanales'][ambiente_categoria] += horas
+                    resumen_periodo['secciones'][ambiente_categoria] += secciones
                     
-                    resumen_periodo['detalle_por_programa'][programa] = detalle_programa
+                    detalle_programa['horas_semanales'][ambiente_categoria] = float(horas)
+                    detalle_programa['secciones'][ambiente_categoria] = int(secciones)
+                
+                resumen_periodo['detalle_por_programa'][programa] = detalle_programa
             
-            # Calcular totales
             resumen_periodo['estudiantes'] = {
                 'total': int(total_estudiantes),
                 'llya': total_llya,
@@ -533,42 +804,35 @@ class AnalizadorHorasAula:
             resumen_periodo['horas_semanales']['total'] = sum(resumen_periodo['horas_semanales'].values())
             resumen_periodo['secciones']['total'] = sum(resumen_periodo['secciones'].values())
             
-            # Calcular horas por semestre (16 semanas)
-            semanas = self.parametros['semanas_por_semestre']
-            for ambiente in ['aula', 'laboratorio', 'taller', 'virtual']:
+            # Horas por semestre (semanas_por_semestre)
+            for ambiente in CATEGORIAS_AMBIENTE + ['total']:
                 resumen_periodo['horas_semestre'][ambiente] = (
                     resumen_periodo['horas_semanales'][ambiente] * semanas
                 )
-            resumen_periodo['horas_semestre']['total'] = (
-                resumen_periodo['horas_semanales']['total'] * semanas
-            )
             
             resumen_periodos.append(resumen_periodo)
         
-        print(f"  {len(resumen_periodos)} periodos procesados")
+        self.informar(f"  {len(resumen_periodos)} periodos procesados")
         
         return resumen_periodos
     
     def generar_resumen_por_semestre(self):
         """Genera el resumen de consumo por semestre académico (1-10)."""
-        print("\nGenerando resumen por semestre académico...")
+        self.informar("\nGenerando resumen por semestre académico...")
         
         resumen_semestres = []
+        semestres = self.cubo.filtrar(semestre=list(range(1, 11)))
+        
+        # Estadísticas por semestre y promedios de horas por periodo (total y por categoría)
+        estadisticas = semestres.rollup('semestre', ['promedio_estudiantes', 'max_estudiantes',
+                                                     'min_estudiantes', 'promedio_secciones'])
+        horas_prom = semestres.promedio('horas', sobre='periodo', por='semestre')
+        horas_prom_cat = semestres.promedio('horas', sobre='periodo', por=['semestre', 'categoria']).to_dict()
         
         for semestre in range(1, 11):
-            datos_semestre = []
-            
-            for programa in self.config['metadata']['programas']:
-                datos_sem = self.resultados[programa][
-                    self.resultados[programa]['SEMESTRE'] == semestre
-                ]
-                if len(datos_sem) > 0:
-                    datos_semestre.append(datos_sem)
-            
-            if len(datos_semestre) == 0:
+            if semestre not in estadisticas.index:
                 continue
-            
-            datos_semestre = pd.concat(datos_semestre)
+            est = estadisticas.loc[semestre]
             
             # Obtener información base del semestre
             malla_sem = pd.concat([
@@ -582,25 +846,23 @@ class AnalizadorHorasAula:
                 'creditos_totales': int(malla_sem['CREDITOS'].sum()),
                 'horas_curso_semanales': int(malla_sem['TOTAL_HORAS_SEMANALES'].sum()),
                 'estadisticas': {
-                    'promedio_estudiantes': float(datos_semestre['TOTAL_MATRICULADOS'].mean()),
-                    'maximo_estudiantes': int(datos_semestre['TOTAL_MATRICULADOS'].max()),
-                    'minimo_estudiantes': int(datos_semestre['TOTAL_MATRICULADOS'].min()),
-                    'promedio_secciones': float(datos_semestre['SECCIONES'].mean()),
-                    'promedio_horas_semanales': float(datos_semestre.groupby('PERIODO_STR')['HORAS_TOTALES'].sum().mean())
+                    'promedio_estudiantes': float(est['promedio_estudiantes']),
+                    'maximo_estudiantes': int(est['max_estudiantes']),
+                    'minimo_estudiantes': int(est['min_estudiantes']),
+                    'promedio_secciones': float(est['promedio_secciones']),
+                    'promedio_horas_semanales': float(horas_prom[semestre])
                 },
                 'distribucion_tipo_ambiente': {}
             }
             
             # Distribución por tipo de ambiente
-            for ambiente in ['aula', 'laboratorio', 'taller', 'virtual']:
-                datos_amb = datos_semestre[datos_semestre['TIPO_AMBIENTE'].apply(self.agrupar_por_categoria_ambiente) == ambiente]
-                
-                if len(datos_amb) > 0:
-                    horas_prom = datos_amb.groupby('PERIODO_STR')['HORAS_TOTALES'].sum().mean()
-                    
+            promedio = resumen_sem['estadisticas']['promedio_horas_semanales']
+            for ambiente in CATEGORIAS_AMBIENTE:
+                if (semestre, ambiente) in horas_prom_cat:
+                    horas_amb = horas_prom_cat[(semestre, ambiente)]
                     resumen_sem['distribucion_tipo_ambiente'][ambiente] = {
-                        'horas_semanales': float(horas_prom),
-                        'porcentaje': float((horas_prom / resumen_sem['estadisticas']['promedio_horas_semanales']) * 100) if resumen_sem['estadisticas']['promedio_horas_semanales'] > 0 else 0
+                        'horas_semanales': float(horas_amb),
+                        'porcentaje': float((horas_amb / promedio) * 100) if promedio > 0 else 0
                     }
                 else:
                     resumen_sem['distribucion_tipo_ambiente'][ambiente] = {
@@ -610,30 +872,25 @@ class AnalizadorHorasAula:
             
             resumen_semestres.append(resumen_sem)
         
-        print(f"  {len(resumen_semestres)} semestres procesados")
+        self.informar(f"  {len(resumen_semestres)} semestres procesados")
         
         return resumen_semestres
     
     def generar_resumen_por_año(self):
         """Genera el resumen de consumo por año."""
-        print("\nGenerando resumen por año...")
+        self.informar("\nGenerando resumen por año...")
         
         resumen_años = []
+        cubo = self.cubo
+        semanas = self.parametros['semanas_por_semestre']
         
-        # Combinar todos los datos
-        todos_datos = pd.concat([self.resultados[prog] for prog in self.config['metadata']['programas']])
-        
-        años_unicos = sorted(todos_datos['AÑO'].unique())
+        max_estudiantes = cubo.rollup(['año', 'ciclo'], ['max_estudiantes'])['max_estudiantes'].to_dict()
+        horas_cat = cubo.rollup(['año', 'categoria'], ['horas'])['horas'].to_dict()
+        horas_prom_ciclo = cubo.promedio('horas', sobre='periodo', por=['año', 'ciclo']).to_dict()
         
-        for año in años_unicos:
-            datos_año = todos_datos[todos_datos['AÑO'] == año]
-            
-            # Calcular estudiantes únicos por año (tomar el máximo de cada ciclo)
-            est_ciclo_i = datos_año[datos_año['CICLO'] == 'I']['TOTAL_MATRICULADOS'].max()
-            est_ciclo_ii = datos_año[datos_año['CICLO'] == 'II']['TOTAL_MATRICULADOS'].max()
-            
-            total_est = max(est_ciclo_i if pd.notna(est_ciclo_i) else 0,
-                           est_ciclo_ii if pd.notna(est_ciclo_ii) else 0)
+        for año in cubo.valores('año'):
+            # Estudiantes del año: el máximo entre los dos ciclos
+            total_est = max(max_estudiantes.get((año, 1), 0), max_estudiantes.get((año, 2), 0))
             
             resumen_año = {
                 'año': int(año),
@@ -643,19 +900,15 @@ class AnalizadorHorasAula:
             }
             
             # Horas anuales por tipo de ambiente
-            for ambiente in ['aula', 'laboratorio', 'taller', 'virtual']:
-                datos_amb = datos_año[datos_año['TIPO_AMBIENTE'].apply(self.agrupar_por_categoria_ambiente) == ambiente]
-                horas_totales = datos_amb['HORAS_TOTALES'].sum() * self.parametros['semanas_por_semestre']
+            for ambiente in CATEGORIAS_AMBIENTE:
+                horas_totales = horas_cat.get((año, ambiente), 0) * semanas
                 resumen_año['horas_anuales'][ambiente] = float(horas_totales)
             
             resumen_año['horas_anuales']['total'] = sum(resumen_año['horas_anuales'].values())
             
             # Promedios semanales por ciclo
-            ciclo_i = datos_año[datos_año['CICLO'] == 'I']
-            ciclo_ii = datos_año[datos_año['CICLO'] == 'II']
-            
-            prom_i = ciclo_i.groupby('PERIODO_STR')['HORAS_TOTALES'].sum().mean() if len(ciclo_i) > 0 else 0
-            prom_ii = ciclo_ii.groupby('PERIODO_STR')['HORAS_TOTALES'].sum().mean() if len(ciclo_ii) > 0 else 0
+            prom_i = horas_prom_ciclo.get((año, 1), 0)
+            prom_ii = horas_prom_ciclo.get((año, 2), 0)
             
             resumen_año['promedio_semanal'] = {
                 'ciclo_i': float(prom_i),
@@ -665,7 +918,7 @@ class AnalizadorHorasAula:
             
             resumen_años.append(resumen_año)
         
-        print(f"  {len(resumen_años)} años procesados")
+        self.informar(f"  {len(resumen_años)} años procesados")
         
         return resumen_años
     
@@ -691,42 +944,33 @@ class AnalizadorHorasAula:
         Genera un detalle de horas por tipo de ambiente ESPECÍFICO (sin agrupar).
         Muestra por separado: Laboratorio de Química, Laboratorio de Computadoras, etc.
         """
-        print("\nGenerando detalle de ambientes específicos...")
+        self.informar("\nGenerando detalle de ambientes específicos...")
         
         detalle_ambientes = []
+        semanas = self.parametros['semanas_por_semestre']
+        cubo = self.cubo
         
-        # Combinar datos de todos los programas
-        todos_datos = pd.concat([self.resultados[prog] for prog in self.config['metadata']['programas']])
+        # Horas y secciones por tipo de ambiente ESPECÍFICO (los tipos vacíos no se listan)
+        por_ambiente = cubo.rollup(['periodo', 'tipo_ambiente'], ['horas', 'secciones'])
+        por_ambiente = por_ambiente[por_ambiente.index.get_level_values('tipo_ambiente').notna()]
         
-        # Obtener todos los periodos únicos
-        periodos_unicos = sorted(todos_datos['PERIODO_STR'].unique())
-        
-        for periodo in periodos_unicos:
-            datos_periodo = todos_datos[todos_datos['PERIODO_STR'] == periodo]
-            
-            # Agrupar por tipo de ambiente ESPECÍFICO
-            resumen_ambientes = datos_periodo.groupby('TIPO_AMBIENTE').agg({
-                'HORAS_TOTALES': 'sum',
-                'SECCIONES': 'sum',
-                'TOTAL_MATRICULADOS': 'first'  # Solo para referencia
-            }).reset_index()
-            
+        for periodo in cubo.valores('periodo'):
             detalle_periodo = {
-                'periodo': periodo,
+                'periodo': etiqueta_periodo(periodo),
                 'ambientes': {}
             }
             
-            for _, row in resumen_ambientes.iterrows():
-                ambiente = row['TIPO_AMBIENTE']
-                detalle_periodo['ambientes'][ambiente] = {
-                    'horas_semanales': float(row['HORAS_TOTALES']),
-                    'secciones': int(row['SECCIONES']),
-                    'horas_semestre': float(row['HORAS_TOTALES'] * self.parametros['semanas_por_semestre'])
-                }
+            if periodo in por_ambiente.index:
+                for ambiente, row in por_ambiente.loc[periodo].iterrows():
+                    detalle_periodo['ambientes'][ambiente] = {
+                        'horas_semanales': float(row['horas']),
+                        'secciones': int(row['secciones']),
+                        'horas_semestre': float(row['horas'] * semanas)
+                    }
             
             detalle_ambientes.append(detalle_periodo)
         
-        print(f"  Detalle de ambientes específicos generado para {len(detalle_ambientes)} periodos")
+        self.informar(f"  Detalle de ambientes específicos generado para {len(detalle_ambientes)} periodos")
         
         return detalle_ambientes
     
@@ -734,9 +978,11 @@ class AnalizadorHorasAula:
         """
         Genera el detalle de cada curso activo por periodo, conservando
         programa, semestre, tipo de ambiente, estudiantes, secciones y horas.
-        Solo incluye filas con HORAS_TOTALES > 0.
+        Solo incluye filas con HORAS_TOTALES > 0. Con
+        output.formato_detalle = "columnas" cada periodo se entrega por
+        columnas (ver detalle_columnar).
         """
-        print("\nGenerando detalle de cursos por periodo...")
+        self.informar("\nGenerando detalle de cursos por periodo...")
 
         frames = []
         for prog in self.config['metadata']['programas']:
@@ -756,8 +1002,8 @@ class AnalizadorHorasAula:
             activos['NOMBRE_CURSO'] = activos.get('CURSO', '')
 
         resultado = []
-        for periodo in sorted(activos['PERIODO_STR'].unique()):
-            filas_p = activos[activos['PERIODO_STR'] == periodo].sort_values(
+        for periodo, filas_p in activos.groupby('CLAVE_PERIODO'):
+            filas_p = filas_p.sort_values(
                 ['PROGRAMA', 'SEMESTRE', 'NOMBRE_CURSO', 'TIPO_AMBIENTE']
             )
             cursos = []
@@ -773,15 +1019,27 @@ class AnalizadorHorasAula:
                     'secciones'      : int(r['SECCIONES']),
                     'horas_totales'  : float(r['HORAS_TOTALES']),
                 })
-            resultado.append({'periodo': periodo, 'cursos': cursos})
+            if self.formato_detalle == 'columnas':
+                resultado.append({'periodo': etiqueta_periodo(periodo), **a_columnas(cursos)})
+            else:
+                resultado.append({'periodo': etiqueta_periodo(periodo), 'cursos': cursos})
 
-        print(f"  Detalle de cursos generado para {len(resultado)} periodos")
+        self.informar(f"  Detalle de cursos generado para {len(resultado)} periodos")
         return resultado
 
+    def secciones_compactas(self):
+        """Secciones de periodos que se escriben una línea por periodo."""
+        return {'detalle_cursos_por_periodo'} if self.formato_detalle == 'columnas' else set()
+
     def generar_json(self, resumen_periodos, resumen_semestres, resumen_años):
         """Genera el archivo JSON con todos los resultados."""
-        print("\nGenerando archivo JSON...")
+        self.informar("\nGenerando archivo JSON...")
+        resultado_json = self.construir_resultado(resumen_periodos, resumen_semestres, resumen_años)
+        self.guardar_resultado(resultado_json)
+        return resultado_json
 
+    def construir_resultado(self, resumen_periodos, resumen_semestres, resumen_años):
+        """Arma el resultado completo (el contenido del JSON) sin escribir archivos."""
         # Generar detalle de ambientes específicos
         detalle_ambientes = self.generar_detalle_ambientes_especificos()
 
@@ -791,6 +1049,9 @@ class AnalizadorHorasAula:
         # Encontrar periodo pico
         periodo_pico = max(resumen_periodos, key=lambda x: x['horas_semanales']['total'])
 
+        # Pico, top de periodos y curva de duración de cada ambiente específico
+        picos_ambientes = analizar_picos(self.convertir_tipos_python(detalle_ambientes))
+
         resultado_json = {
             'metadata': {
                 'carrera': self.config['metadata']['carrera'],
@@ -807,6 +1068,7 @@ class AnalizadorHorasAula:
                 },
                 'distribucion_pico': periodo_pico['horas_semanales']
             },
+            'picos_por_ambiente': picos_ambientes,
             'consumo_por_periodo': resumen_periodos,
             'consumo_por_semestre_academico': resumen_semestres,
             'consumo_por_año': resumen_años,
@@ -815,56 +1077,77 @@ class AnalizadorHorasAula:
         }
         
         # Convertir todos los tipos numpy a tipos nativos de Python
-        resultado_json = self.convertir_tipos_python(resultado_json)
-        
-        # Guardar JSON
+        return self.convertir_tipos_python(resultado_json)
+
+    def guardar_resultado(self, resultado_json):
+        """Escribe el JSON (con su índice) y los formatos adicionales configurados."""
+        # Guardar JSON (con índice de secciones para lectura perezosa)
         output_path = self.config['output']['json']
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(resultado_json, f, indent=2, ensure_ascii=False)
+        escribir_json_indexado(resultado_json, output_path, compactas=self.secciones_compactas())
         
-        print(f"  JSON guardado en: {output_path}")
-        
-        return resultado_json
-    
-    def ejecutar(self):
-        """Ejecuta el análisis completo con optimización de equivalencias."""
-        print("\nIniciando análisis completo con equivalencias...\n")
-        
-        # 1. Cargar datos (incluye equivalencias)
-        self.cargar_datos()
+        self.informar(f"  JSON guardado en: {output_path}")
+
+        # Formatos adicionales (Parquet, JSON comprimido) si están configurados
+        exportar_formatos(resultado_json, self.config['output'], self.informar)
+
+    def _resumenes(self):
+        """Pasos 1 a 5 del análisis; retorna los resúmenes por periodo, semestre y año."""
+        # 1. Cargar datos (incluye equivalencias), salvo que vengan de memoria compartida
+        if not self.mallas:
+            self.cargar_datos()
         
         # 2. Identificar equivalencias
         self.identificar_cursos_compartidos()
         self.identificar_cursos_a_eliminar()
         
-        # 3. Procesar cada programa (con filtros)
-        for programa in self.config['metadata']['programas']:
-            self.procesar_programa(programa)
+        # 3. Procesar cada programa (con filtros), en paralelo si está configurado
+        self.procesar_programas()
         
         # 4. Procesar cursos compartidos
         self.procesar_cursos_compartidos()
         
-        # 5. Generar resúmenes
+        # 5. Cubo de consumo y resúmenes (consultas sobre el cubo)
+        self.construir_cubo()
         resumen_periodos = self.generar_resumen_por_periodo()
         resumen_semestres = self.generar_resumen_por_semestre()
         resumen_años = self.generar_resumen_por_año()
+        return resumen_periodos, resumen_semestres, resumen_años
+
+    def analizar(self):
+        """
+        Análisis completo como biblioteca: no escribe archivos y retorna el
+        resultado (mismo contenido que el JSON). Combinar con `silencioso=True`
+        para no escribir tampoco en consola.
+        """
+        return self.construir_resultado(*self._resumenes())
+
+    def ejecutar(self, escribir=True):
+        """
+        Ejecuta el análisis completo con optimización de equivalencias.
+        Con `escribir=False` no genera el JSON ni los exportes en disco.
+        """
+        self.informar("\nIniciando análisis completo con equivalencias...\n")
+        resumenes = self._resumenes()
         
         # 6. Generar JSON
-        resultado_json = self.generar_json(resumen_periodos, resumen_semestres, resumen_años)
-        
-        print("\n" + "=" * 80)
-        print("ANÁLISIS COMPLETADO EXITOSAMENTE (CON EQUIVALENCIAS)")
-        print("=" * 80)
-        print(f"\nOptimizacion aplicada:")
-        print(f"  - Cursos compartidos LLYA↔MYC: {len(self.cursos_compartidos)}")
-        print(f"  - Cursos eliminados (van a otras carreras): {sum(len(v) for v in self.cursos_a_eliminar.values())}")
-        print(f"\nPeriodo pico: {resultado_json['resumen_total']['periodo_pico']['periodo']}")
-        print(f"Horas semanales totales (pico): {resultado_json['resumen_total']['periodo_pico']['horas_semanales_totales']:.2f}")
-        print(f"Estudiantes (pico): {resultado_json['resumen_total']['periodo_pico']['estudiantes']}")
-        print(f"\nDistribución en periodo pico:")
+        if escribir:
+            resultado_json = self.generar_json(*resumenes)
+        else:
+            resultado_json = self.construir_resultado(*resumenes)
+        
+        self.informar("\n" + "=" * 80)
+        self.informar("ANÁLISIS COMPLETADO EXITOSAMENTE (CON EQUIVALENCIAS)")
+        self.informar("=" * 80)
+        self.informar(f"\nOptimizacion aplicada:")
+        self.informar(f"  - Cursos compartidos LLYA↔MYC: {len(self.cursos_compartidos)}")
+        self.informar(f"  - Cursos eliminados (van a otras carreras): {sum(len(v) for v in self.cursos_a_eliminar.values())}")
+        self.informar(f"\nPeriodo pico: {resultado_json['resumen_total']['periodo_pico']['periodo']}")
+        self.informar(f"Horas semanales totales (pico): {resultado_json['resumen_total']['periodo_pico']['horas_semanales_totales']:.2f}")
+        self.informar(f"Estudiantes (pico): {resultado_json['resumen_total']['periodo_pico']['estudiantes']}")
+        self.informar(f"\nDistribución en periodo pico:")
         for ambiente, horas in resultado_json['resumen_total']['distribucion_pico'].items():
             if ambiente != 'total':
-                print(f"  - {ambiente.capitalize()}: {horas:.2f} horas/semana")
+                self.informar(f"  - {ambiente.capitalize()}: {horas:.2f} horas/semana")
         
         return resultado_json
 
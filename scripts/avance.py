@@ -0,0 +1,83 @@
+"""
+Mensajes de avance del analizador y los generadores de Excel.
+
+Cada mensaje va a tres destinos:
+  - la consola (print), salvo en modo silencioso;
+  - el módulo `logging` (nivel INFO, bajo el logger 'horas_aula.<componente>');
+    sin configurar logging no se muestra nada;
+  - un callback opcional `progreso(mensaje)`.
+
+Uso como biblioteca, sin consola ni archivos:
+
+    def progreso(mensaje):
+        ...
+
+    analizador = AnalizadorHorasAula('config.json', silencioso=True, progreso=progreso)
+    resultado = analizador.analizar()        # dict del JSON, no escribe nada
+"""
+
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+
+
+LOGGER_RAIZ = 'horas_aula'
+
+
+class Avance:
+    """
+    Reemplazo de print para los mensajes de avance de un componente.
+    """
+
+    def __init__(self, componente, silencioso=False, progreso=None):
+        self.logger     = logging.getLogger(f"{LOGGER_RAIZ}.{componente}")
+        self.silencioso = silencioso
+        self.progreso   = progreso
+        self.activo     = True
+
+    def __call__(self, mensaje=''):
+        if not self.activo:
+            return
+        if not self.silencioso:
+            print(mensaje)
+        texto = str(mensaje).strip('\n')
+        if texto:
+            self.logger.info(texto)
+            if self.progreso is not None:
+                self.progreso(texto)
+
+    @contextmanager
+    def en_silencio(self):
+        """
+        Suspende los mensajes de este componente (consola, log y callback)
+        dentro del bloque, sin tocar sys.stdout.
+        """
+        activo, self.activo = self.activo, False
+        try:
+            yield
+        finally:
+            self.activo = activo
+
+    def __getstate__(self):
+        # Al enviar el analizador a otro proceso el callback puede no ser
+        # serializable (lambda, método de un objeto local): se omite
+        estado = self.__dict__.copy()
+        estado['progreso'] = None
+        return estado
+
+
+def registrar_en_archivo(ruta, nivel=logging.INFO):
+    """
+    Agrega un archivo de log (p. ej. config output.log) a los mensajes de
+    todos los componentes. No repite el archivo si ya está registrado.
+    """
+    logger = logging.getLogger(LOGGER_RAIZ)
+    ruta = Path(ruta)
+    destino = str(ruta.resolve())
+    if any(getattr(h, 'baseFilename', None) == destino for h in logger.handlers):
+        return
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    manejador = logging.FileHandler(ruta, encoding='utf-8')
+    manejador.setFormatter(logging.Formatter('%(asctime)s %(name)s %(levelname)s %(message)s'))
+    logger.addHandler(manejador)
+    logger.setLevel(nivel)
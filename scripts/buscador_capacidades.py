@@ -0,0 +1,223 @@
+"""
+Buscador de capacidades mínimas de sección
+
+En lugar de barrer todos los tamaños de sección, parte de una meta de horas
+pico ("las horas de aula del periodo pico deben caber en 4 aulas × 45
+bloques") y busca los menores valores de `tamano_seccion_*` que la cumplen.
+
+Las horas de cada categoría no aumentan al crecer su capacidad, así que:
+  - para cada capacidad se hace una búsqueda binaria entre 1 y un máximo en
+    el que toda sección no vacía ya es una sola;
+  - entre capacidades, descenso por coordenadas: se recorren una a una,
+    bajando cada una a su menor valor factible con las demás fijas, hasta
+    que una pasada completa no cambia nada.
+
+Cada evaluación reutiliza la unión proyección × malla (no depende de las
+capacidades) y recalcula secciones, cursos compartidos y horas por periodo
+con las operaciones vectorizadas de MotorVectorizado.
+
+Uso:
+    python scripts/buscador_capacidades.py --objetivo aula=180 --objetivo laboratorio=40
+    python scripts/buscador_capacidades.py --objetivo total=240
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from analizador_horas_aula import categoria_ambiente
+from motor_vectorizado import MotorVectorizado
+from periodos import etiqueta_periodo
+
+
+CAPACIDAD_POR_CATEGORIA = {
+    'aula'       : 'tamano_seccion_aula',
+    'laboratorio': 'tamano_seccion_laboratorio',
+    'taller'     : 'tamano_seccion_taller',
+}
+
+CATEGORIAS = ['aula', 'laboratorio', 'taller', 'virtual']
+
+
+class BuscadorCapacidades:
+    """
+    Busca las menores capacidades de sección que cumplen metas de horas pico.
+    """
+
+    def __init__(self, config_path='config.json', datos=None):
+        self.analizador = MotorVectorizado(config_path, datos, silencioso=True)
+        self.capacidades_actuales = {
+            parametro: self.analizador.parametros[parametro]
+            for parametro in CAPACIDAD_POR_CATEGORIA.values()
+        }
+        self.evaluaciones = 0
+        self._cache = {}
+
+        # Unión proyección × malla, una sola vez
+        a = self.analizador
+        if not a.mallas:
+            a.cargar_datos()
+        a.identificar_cursos_compartidos()
+        a.identificar_cursos_a_eliminar()
+        self.base = {}
+        for programa in a.config['metadata']['programas']:
+            datos_programa = a.procesar_programa(programa)
+            self.base[programa] = datos_programa.drop(columns=['SECCIONES', 'HORAS_TOTALES']).assign(
+                CATEGORIA=datos_programa['TIPO_AMBIENTE'].map(categoria_ambiente)
+            )
+
+        # Con esta capacidad toda sección no vacía es una sola (cota de la búsqueda)
+        self.capacidad_maxima = int(sum(
+            datos_programa['TOTAL_MATRICULADOS'].max() for datos_programa in self.base.values()
+        )) or 1
+
+    def evaluar(self, capacidades):
+        """
+        Horas semanales por periodo y categoría con las capacidades dadas.
+        Retorna un DataFrame (índice CLAVE_PERIODO, columnas categorías).
+        """
+        clave = tuple(sorted(capacidades.items()))
+        if clave in self._cache:
+            return self._cache[clave]
+        self.evaluaciones += 1
+
+        a = self.analizador
+        a.parametros = {**a.parametros, **capacidades}
+        for programa, datos_programa in self.base.items():
+            secciones = a.secciones_por_fila(datos_programa)
+            a.resultados[programa] = datos_programa.assign(
+                SECCIONES=secciones,
+                HORAS_TOTALES=datos_programa['HORAS_SEMANALES'] * secciones,
+            )
+        a.procesar_cursos_compartidos()
+
+        todos = pd.concat([a.resultados[p] for p in a.config['metadata']['programas']])
+        horas = (todos.groupby(['CLAVE_PERIODO', 'CATEGORIA'])['HORAS_TOTALES'].sum()
+                 .unstack(fill_value=0)
+                 .reindex(columns=CATEGORIAS, fill_value=0))
+        horas['total'] = horas[CATEGORIAS].sum(axis=1)
+
+        self._cache[clave] = horas
+        return horas
+
+    @staticmethod
+    def cumple(horas, objetivos):
+        return all(horas[nombre].max() <= limite for nombre, limite in objetivos.items())
+
+    def _menor_factible(self, parametro, capacidades, objetivos):
+        """Menor valor de `parametro` que cumple los objetivos con las demás capacidades fijas."""
+        bajo, alto = 1, capacidades[parametro]     # `alto` es factible
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self.cumple(self.evaluar({**capacidades, parametro: medio}), objetivos):
+                alto = medio
+            else:
+                bajo = medio + 1
+        return alto
+
+    def buscar(self, objetivos):
+        """
+        `objetivos`: {'aula' | 'laboratorio' | 'taller' | 'virtual' | 'total': horas pico máximas}.
+        Solo se ajustan las capacidades que influyen en algún objetivo;
+        las demás quedan con su valor de config.
+        """
+        desconocidos = set(objetivos) - set(CATEGORIAS) - {'total'}
+        if desconocidos:
+            raise ValueError(f"Objetivos no validos: {sorted(desconocidos)} "
+                             f"(use {', '.join(CATEGORIAS + ['total'])})")
+
+        inicio = time.perf_counter()
+        self.evaluaciones = 0
+        if 'total' in objetivos:
+            ajustables = list(CAPACIDAD_POR_CATEGORIA.values())
+        else:
+            ajustables = [CAPACIDAD_POR_CATEGORIA[c] for c in objetivos if c in CAPACIDAD_POR_CATEGORIA]
+
+        # Punto de partida: capacidades ajustables al máximo (el caso más holgado)
+        capacidades = {**self.capacidades_actuales, **dict.fromkeys(ajustables, self.capacidad_maxima)}
+        factible = self.cumple(self.evaluar(capacidades), objetivos)
+
+        pasadas = 0
+        if factible:
+            cambio = True
+            while cambio:
+                cambio = False
+                pasadas += 1
+                for parametro in ajustables:
+                    valor = self._menor_factible(parametro, capacidades, objetivos)
+                    if valor != capacidades[parametro]:
+                        capacidades[parametro] = valor
+                        cambio = True
+
+        horas = self.evaluar(capacidades)
+        pico = {}
+        for nombre in CATEGORIAS + ['total']:
+            periodo = horas[nombre].idxmax()
+            pico[nombre] = {'periodo': etiqueta_periodo(int(periodo)),
+                            'horas_semanales': float(horas.loc[periodo, nombre])}
+
+        return {
+            'objetivos': objetivos,
+            'factible': factible,
+            'capacidades': capacidades,
+            'capacidades_actuales': self.capacidades_actuales,
+            'pico': pico,
+            'pasadas': pasadas,
+            'evaluaciones': self.evaluaciones,
+            'barrido_equivalente': self.capacidad_maxima ** len(ajustables),
+            'tiempo_s': round(time.perf_counter() - inicio, 3),
+        }
+
+
+def _leer_objetivo(texto):
+    nombre, _, valor = texto.partition('=')
+    try:
+        return nombre.strip().lower(), float(valor)
+    except ValueError:
+        raise ValueError(f"Objetivo no valido: '{texto}' (use categoria=horas, p. ej. aula=180)") from None
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Busca las menores capacidades de seccion que cumplen metas de horas pico.")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--objetivo', action='append', required=True,
+                        help="categoria=horas pico maximas (aula, laboratorio, taller, virtual o total); repetible")
+    parser.add_argument('--salida', default='salida/json/capacidades_minimas.json')
+    args = parser.parse_args()
+
+    try:
+        objetivos = dict(_leer_objetivo(texto) for texto in args.objetivo)
+        buscador = BuscadorCapacidades(args.config)
+        resultado = buscador.buscar(objetivos)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("CAPACIDADES MINIMAS DE SECCION")
+    print("=" * 80)
+    for nombre, limite in objetivos.items():
+        print(f"  Objetivo {nombre}: pico <= {limite:.1f} horas/semana")
+    if not resultado['factible']:
+        print("\n  ERROR: Ni con una seccion por curso se cumplen los objetivos")
+    else:
+        print()
+        for parametro, valor in resultado['capacidades'].items():
+            actual = resultado['capacidades_actuales'][parametro]
+            print(f"  {parametro:<28} {valor:>4}  (actual {actual})")
+    print("\n  Pico resultante:")
+    for nombre, info in resultado['pico'].items():
+        print(f"    {nombre:<12} {info['horas_semanales']:>8.1f} h  ({info['periodo']})")
+    print(f"\n  {resultado['evaluaciones']} evaluaciones en {resultado['tiempo_s']} s "
+          f"(barrido completo: {resultado['barrido_equivalente']})")
+
+    Path(args.salida).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"  Resultado guardado en: {args.salida}")
+    sys.exit(0 if resultado['factible'] else 1)
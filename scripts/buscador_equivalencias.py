@@ -0,0 +1,282 @@
+"""
+Buscador de Equivalencias - cursos casi idénticos entre programas
+
+`identificar_cursos_compartidos` solo fusiona los pares declarados en los
+archivos de equivalencias. Este buscador propone pares NO declarados:
+
+  1. Normaliza los nombres de CURSO de todas las mallas (minúsculas, sin
+     tildes ni signos) y arma un índice invertido de trigramas de caracteres.
+  2. Para cada curso consulta el índice y solo compara contra los cursos de
+     otros programas que comparten trigramas (sin recorrer todos los pares).
+     Los trigramas demasiado frecuentes no se indexan.
+  3. Descarta pares del mismo programa, pares ya declarados, cursos que se
+     eliminan a otras carreras y pares con distinto ordinal ("I" vs "II").
+  4. Estima con el modelo de secciones cuántas horas semanales ahorraría
+     fusionar cada par, en total y en el periodo pico de la carrera.
+
+Uso:
+    python scripts/buscador_equivalencias.py --config config.json \\
+           [--umbral 0.6] [--top 20] [--salida salida/json/oportunidades_equivalencias.json]
+"""
+
+import json
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+from analizador_horas_aula import AnalizadorHorasAula, calcular_secciones
+from analizador_campus import nombres_programa
+from periodos import etiqueta_periodo
+
+
+TAMANO_NGRAMA = 3
+
+# Un trigrama presente en más de esta fracción de cursos no discrimina
+# (p. ej. " de", "ión") y solo agrega comparaciones
+FRECUENCIA_MAXIMA = 0.2
+
+ORDINALES = {'i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x'}
+
+
+def normalizar_nombre(texto):
+    """Nombre en minúsculas, sin tildes ni signos, con espacios simples."""
+    texto = unicodedata.normalize('NFKD', str(texto))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', texto).split())
+
+
+def ngramas(nombre, n=TAMANO_NGRAMA):
+    """Conjunto de n-gramas de caracteres del nombre normalizado (con bordes)."""
+    texto = f" {nombre} "
+    return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+
+
+def ordinales(nombre):
+    """Numerales del nombre ('comunicacion ii' → {'ii'}); deben coincidir para fusionar."""
+    return frozenset(t for t in nombre.split() if t in ORDINALES or t.isdigit())
+
+
+class BuscadorEquivalencias:
+    """
+    Propone equivalencias no declaradas entre programas de una carrera y
+    estima su ahorro de horas-aula.
+    """
+
+    def __init__(self, config_path='config.json', umbral=0.6):
+        self.umbral = umbral
+
+        self.analizador = AnalizadorHorasAula(config_path)
+        self.analizador.cargar_datos()
+        self.analizador.identificar_cursos_compartidos()
+        self.analizador.identificar_cursos_a_eliminar()
+
+        self.programas = self.analizador.config['metadata']['programas']
+        self.candidatos = pd.DataFrame()
+
+    # ------------------------------------------------------------------
+    # Índice de n-gramas
+    # ------------------------------------------------------------------
+
+    def _cursos(self):
+        """Cursos de todas las mallas que siguen en la carrera (uno por programa y código)."""
+        frames = []
+        for programa in self.programas:
+            malla = self.analizador.mallas[programa]
+            malla = malla[~malla['CODIGO_CURSO'].isin(self.analizador.cursos_a_eliminar[programa])]
+            df = malla[['CODIGO_CURSO', 'CURSO', 'SEMESTRE']].drop_duplicates('CODIGO_CURSO').copy()
+            df['PROGRAMA'] = programa
+            frames.append(df)
+
+        cursos = pd.concat(frames, ignore_index=True)
+        cursos['NOMBRE_NORMALIZADO'] = cursos['CURSO'].map(normalizar_nombre)
+        return cursos
+
+    def _pares_declarados(self):
+        """Pares (programa, código) ↔ (programa, código) ya presentes en equivalencias."""
+        programa_de_nombre = {v: k for k, v in nombres_programa(self.analizador.config).items()}
+        declarados = set()
+        for programa in self.programas:
+            equiv = self.analizador.equivalencias[programa]
+            internos = equiv[equiv['PROGRAMA_EQUIVALENTE'].isin(programa_de_nombre)]
+            codigos_eq = pd.to_numeric(internos['CODIGO_CURSO_EQUIVALENTE'], errors='coerce')
+            for codigo, nombre_eq, codigo_eq in zip(internos['CODIGO_CURSO'],
+                                                    internos['PROGRAMA_EQUIVALENTE'], codigos_eq):
+                if pd.isna(codigo_eq):
+                    continue
+                declarados.add(frozenset({(programa, int(codigo)),
+                                          (programa_de_nombre[nombre_eq], int(codigo_eq))}))
+        return declarados
+
+    def buscar_candidatos(self):
+        """
+        Pares de cursos de programas distintos con similitud de Jaccard sobre
+        trigramas >= umbral. Solo se comparan cursos que comparten al menos
+        un trigrama indexado.
+        """
+        print("\nBuscando cursos casi identicos entre programas...")
+        cursos = self._cursos()
+        gramas = [ngramas(n) for n in cursos['NOMBRE_NORMALIZADO']]
+        programas = cursos['PROGRAMA'].tolist()
+        numerales = [ordinales(n) for n in cursos['NOMBRE_NORMALIZADO']]
+
+        frecuencia = Counter(g for conjunto in gramas for g in conjunto)
+        limite = max(2, int(FRECUENCIA_MAXIMA * len(cursos)))
+
+        indice = defaultdict(list)
+        for i, conjunto in enumerate(gramas):
+            for g in conjunto:
+                if frecuencia[g] <= limite:
+                    indice[g].append(i)
+
+        declarados = self._pares_declarados()
+        claves = list(zip(programas, cursos['CODIGO_CURSO'].astype(int)))
+
+        pares = []
+        for i, conjunto in enumerate(gramas):
+            compartidos = Counter(j for g in conjunto for j in indice.get(g, ()) if j > i)
+            for j in compartidos:
+                if programas[j] == programas[i] or numerales[i] != numerales[j]:
+                    continue
+                interseccion = len(conjunto & gramas[j])
+                similitud = interseccion / len(conjunto | gramas[j])
+                if similitud < self.umbral:
+                    continue
+                if frozenset({claves[i], claves[j]}) in declarados:
+                    continue
+                pares.append((i, j, similitud))
+
+        a = cursos.iloc[[p[0] for p in pares]].reset_index(drop=True)
+        b = cursos.iloc[[p[1] for p in pares]].reset_index(drop=True)
+        self.candidatos = pd.DataFrame({
+            'programa_a': a['PROGRAMA'], 'codigo_a': a['CODIGO_CURSO'],
+            'curso_a': a['CURSO'], 'semestre_a': a['SEMESTRE'],
+            'programa_b': b['PROGRAMA'], 'codigo_b': b['CODIGO_CURSO'],
+            'curso_b': b['CURSO'], 'semestre_b': b['SEMESTRE'],
+            'similitud': [round(p[2], 3) for p in pares],
+        })
+
+        print(f"  {len(cursos)} cursos indexados, {len(indice)} trigramas")
+        print(f"  {len(self.candidatos)} pares candidatos (umbral {self.umbral})")
+        return self.candidatos
+
+    # ------------------------------------------------------------------
+    # Estimación de ahorro
+    # ------------------------------------------------------------------
+
+    def _filas_resultado(self):
+        """Resultado actual de la carrera (tras fusionar las equivalencias declaradas)."""
+        for programa in self.programas:
+            self.analizador.procesar_programa(programa)
+        self.analizador.procesar_cursos_compartidos()
+
+        frames = []
+        for programa in self.programas:
+            df = self.analizador.resultados[programa].dropna(subset=['TIPO_AMBIENTE']).copy()
+            df['PROGRAMA'] = programa
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True)
+
+    def estimar_ahorro(self):
+        """
+        Para cada candidato y periodo en que ambos cursos tienen alumnos, el
+        curso B se absorbe en las secciones del curso A (como en
+        `procesar_cursos_compartidos`). Agrega a los candidatos el ahorro
+        total de horas semanales y la reducción del pico de la carrera.
+        """
+        if self.candidatos.empty:
+            return self.candidatos
+
+        print("\nEstimando ahorro de cada candidato con el modelo de secciones...")
+        filas = self._filas_resultado()
+        base = filas.groupby('CLAVE_PERIODO')['HORAS_TOTALES'].sum()
+        pico_base = base.max()
+
+        cand = self.candidatos.reset_index().rename(columns={'index': 'CANDIDATO'})
+        columnas = ['PROGRAMA', 'CODIGO_CURSO', 'CLAVE_PERIODO', 'TIPO_AMBIENTE',
+                    'HORAS_SEMANALES', 'TOTAL_MATRICULADOS', 'HORAS_TOTALES']
+
+        filas_a = cand[['CANDIDATO', 'programa_a', 'codigo_a']].merge(
+            filas[columnas], left_on=['programa_a', 'codigo_a'], right_on=['PROGRAMA', 'CODIGO_CURSO'])
+        filas_b = cand[['CANDIDATO', 'programa_b', 'codigo_b']].merge(
+            filas[columnas], left_on=['programa_b', 'codigo_b'], right_on=['PROGRAMA', 'CODIGO_CURSO'])
+
+        llave = ['CANDIDATO', 'CLAVE_PERIODO']
+        por_b = (filas_b.groupby(llave)
+                        .agg(EST_B=('TOTAL_MATRICULADOS', 'first'), HORAS_B=('HORAS_TOTALES', 'sum'))
+                        .reset_index())
+        por_b = por_b[por_b['EST_B'] > 0]
+
+        fusion = filas_a[filas_a['TOTAL_MATRICULADOS'] > 0].merge(por_b, on=llave)
+        parametros = self.analizador.parametros
+        fusion['HORAS_FUSION'] = [
+            horas * calcular_secciones(est_a + est_b, tipo, parametros)
+            for horas, est_a, est_b, tipo in zip(fusion['HORAS_SEMANALES'], fusion['TOTAL_MATRICULADOS'],
+                                                 fusion['EST_B'], fusion['TIPO_AMBIENTE'])
+        ]
+
+        por_periodo = fusion.groupby(llave).agg(
+            HORAS_A=('HORAS_TOTALES', 'sum'), HORAS_B=('HORAS_B', 'first'),
+            HORAS_FUSION=('HORAS_FUSION', 'sum'))
+        por_periodo['AHORRO'] = por_periodo['HORAS_A'] + por_periodo['HORAS_B'] - por_periodo['HORAS_FUSION']
+
+        # Pico de la carrera si se fusionara cada candidato por separado
+        ahorro = por_periodo['AHORRO'].unstack('CLAVE_PERIODO', fill_value=0).reindex(columns=base.index, fill_value=0)
+        nuevo_pico = (base.values - ahorro).max(axis=1)
+
+        self.candidatos['ahorro_horas_semanales'] = ahorro.sum(axis=1).reindex(cand['CANDIDATO'], fill_value=0).values
+        self.candidatos['ahorro_pico'] = (pico_base - nuevo_pico).reindex(cand['CANDIDATO'], fill_value=0).values
+        self.candidatos['periodos_compartidos'] = (ahorro > 0).sum(axis=1).reindex(cand['CANDIDATO'], fill_value=0).values
+
+        self.candidatos = self.candidatos.sort_values(
+            ['ahorro_pico', 'ahorro_horas_semanales', 'similitud'], ascending=False
+        ).reset_index(drop=True)
+        self.pico_base = {'periodo': etiqueta_periodo(base.idxmax()), 'horas_semanales_totales': float(pico_base)}
+
+        print(f"  Pico actual: {self.pico_base['periodo']} ({pico_base:.2f} hrs)")
+        return self.candidatos
+
+    def ejecutar(self, output_path=None, top=20):
+        """Busca, estima y (opcionalmente) guarda el ranking en JSON."""
+        print("\n" + "=" * 80)
+        print("BUSCADOR DE EQUIVALENCIAS")
+        print("=" * 80)
+
+        self.buscar_candidatos()
+        self.estimar_ahorro()
+
+        print(f"\nEquivalencias con mayor ahorro (top {top}):")
+        for _, c in self.candidatos.head(top).iterrows():
+            print(f"  [{c['similitud']:.2f}] {c['programa_a']} {c['codigo_a']} '{c['curso_a']}'"
+                  f" ~ {c['programa_b']} {c['codigo_b']} '{c['curso_b']}'"
+                  f" -> pico -{c.get('ahorro_pico', 0):.0f} hrs,"
+                  f" total -{c.get('ahorro_horas_semanales', 0):.0f} hrs")
+
+        resultado = {
+            'umbral': self.umbral,
+            'periodo_pico_actual': getattr(self, 'pico_base', None),
+            'candidatos': json.loads(self.candidatos.to_json(orient='records', force_ascii=False)),
+        }
+
+        if output_path:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, indent=2, ensure_ascii=False)
+            print(f"\nRanking guardado en: {output_path}")
+
+        return resultado
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Propone equivalencias no declaradas entre programas.")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--umbral', type=float, default=0.6, help="Similitud minima (Jaccard de trigramas)")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--salida', default='salida/json/oportunidades_equivalencias.json')
+    args = parser.parse_args()
+
+    BuscadorEquivalencias(args.config, args.umbral).ejecutar(args.salida, args.top)
@@ -0,0 +1,255 @@
+"""
+Comparador de Resultados - diferencias entre dos corridas del análisis
+
+Alinea dos JSON de consumo (p. ej. antes/después de cambiar equivalencias o
+capacidades) por periodo, programa, curso y tipo de ambiente, y reporta las
+diferencias de horas, secciones y estudiantes junto con los cursos que más
+explican cada diferencia.
+
+Salidas:
+  - JSON con resumen, deltas por periodo, por periodo×programa×ambiente y
+    ranking de cursos.
+  - Excel de comparación con una hoja por cada bloque.
+
+Uso:
+    python scripts/comparador_resultados.py anterior.json nuevo.json \\
+           [--salida-json salida/json/comparacion.json] \\
+           [--salida-excel salida/excel/comparacion.xlsx] [--top 10]
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.styles import Font, PatternFill, Alignment
+
+from detalle_columnar import CAMPOS_CURSO, tabla_cursos
+from lector_json import LectorConsumoJSON
+from periodos import clave_desde_etiqueta
+from utilidades_excel import escribir_hoja
+
+
+COLOR_HEADER = "404040"
+
+CLAVES_CURSO = ['periodo', 'programa', 'codigo_curso', 'tipo_ambiente']
+MEDIDAS      = ['horas_totales', 'secciones', 'estudiantes']
+
+
+def cursos_como_tabla(lector):
+    """Aplana `detalle_cursos_por_periodo` en un DataFrame (una fila por curso×ambiente)."""
+    tablas = [tabla_cursos(p).assign(periodo=p['periodo'])
+              for p in lector.periodos('detalle_cursos_por_periodo')]
+    columnas = ['periodo'] + CAMPOS_CURSO
+    if not tablas:
+        return pd.DataFrame(columns=columnas)
+    return pd.concat(tablas, ignore_index=True)[columnas]
+
+
+class ComparadorResultados:
+    """
+    Compara dos JSON de consumo y genera el reporte de diferencias.
+    """
+
+    def __init__(self, json_a, json_b, output_json=None, output_excel=None, top=10):
+        self.json_a       = json_a
+        self.json_b       = json_b
+        self.output_json  = output_json
+        self.output_excel = output_excel
+        self.top          = top
+
+        self.lector_a = LectorConsumoJSON(json_a)
+        self.lector_b = LectorConsumoJSON(json_b)
+
+        print("\n" + "=" * 80)
+        print("COMPARADOR DE RESULTADOS")
+        print("=" * 80)
+        print(f"  A (anterior): {json_a}")
+        print(f"  B (nuevo)   : {json_b}")
+
+    # ------------------------------------------------------------------
+    # Alineación
+    # ------------------------------------------------------------------
+
+    def alinear_cursos(self):
+        """
+        Une ambas corridas por periodo, programa, curso y tipo de ambiente
+        (outer join). Las filas repetidas de un mismo curso y ambiente se
+        suman antes de unir. Las ausencias cuentan como 0.
+        """
+        tablas = []
+        for lector in (self.lector_a, self.lector_b):
+            if not lector.tiene('detalle_cursos_por_periodo'):
+                raise ValueError(f"{lector.json_path}: falta 'detalle_cursos_por_periodo'")
+            df = cursos_como_tabla(lector)
+            tablas.append(
+                df.groupby(CLAVES_CURSO, as_index=False, sort=False)
+                  .agg(curso=('curso', 'first'), semestre=('semestre', 'first'),
+                       horas_totales=('horas_totales', 'sum'),
+                       secciones=('secciones', 'sum'),
+                       estudiantes=('estudiantes', 'max'))
+            )
+
+        a, b = tablas
+        alineado = a.merge(b, on=CLAVES_CURSO, how='outer', suffixes=('_a', '_b'), indicator=True)
+        alineado['curso']    = alineado['curso_b'].fillna(alineado['curso_a'])
+        alineado['semestre'] = alineado['semestre_b'].fillna(alineado['semestre_a'])
+        alineado['estado'] = alineado['_merge'].map({
+            'left_only': 'eliminado', 'right_only': 'nuevo', 'both': 'en ambos'
+        }).astype(str)
+
+        for medida in MEDIDAS:
+            alineado[f'{medida}_a'] = alineado[f'{medida}_a'].fillna(0)
+            alineado[f'{medida}_b'] = alineado[f'{medida}_b'].fillna(0)
+            alineado[f'delta_{medida}'] = alineado[f'{medida}_b'] - alineado[f'{medida}_a']
+        for medida in ('secciones', 'estudiantes'):
+            for col in (f'{medida}_a', f'{medida}_b', f'delta_{medida}'):
+                alineado[col] = alineado[col].astype('int64')
+
+        alineado['clave_periodo'] = alineado['periodo'].map(clave_desde_etiqueta)
+        return alineado.drop(columns=['curso_a', 'curso_b', 'semestre_a', 'semestre_b', '_merge'])
+
+    # ------------------------------------------------------------------
+    # Agregados
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _agregar(alineado, por):
+        columnas = [f'{m}_{s}' for m in ('horas_totales', 'secciones') for s in ('a', 'b')]
+        columnas += ['delta_horas_totales', 'delta_secciones']
+        return (alineado.groupby(por, as_index=False)[columnas].sum()
+                        .sort_values(por).reset_index(drop=True))
+
+    def _estudiantes_por_periodo(self):
+        """Estudiantes totales por periodo según `consumo_por_periodo` de cada corrida."""
+        series = []
+        for lector, sufijo in ((self.lector_a, 'a'), (self.lector_b, 'b')):
+            datos = {p['periodo']: p['estudiantes']['total']
+                     for p in lector.periodos('consumo_por_periodo')}
+            series.append(pd.Series(datos, name=f'estudiantes_{sufijo}', dtype='float64'))
+        df = pd.concat(series, axis=1).fillna(0)
+        df['delta_estudiantes'] = df['estudiantes_b'] - df['estudiantes_a']
+        return df.rename_axis('periodo').reset_index()
+
+    def _ranking_cursos(self, alineado):
+        """Cursos que más explican la diferencia de horas, por periodo y en total."""
+        cambios = alineado[(alineado['delta_horas_totales'] != 0) | (alineado['delta_secciones'] != 0)].copy()
+        cambios['abs_delta'] = cambios['delta_horas_totales'].abs()
+
+        por_periodo = (cambios.sort_values(['clave_periodo', 'abs_delta'], ascending=[True, False])
+                              .groupby('clave_periodo').head(self.top))
+
+        total = (cambios.groupby(['programa', 'codigo_curso', 'curso', 'tipo_ambiente'], as_index=False)
+                        .agg(delta_horas_totales=('delta_horas_totales', 'sum'),
+                             abs_delta=('abs_delta', 'sum'),
+                             periodos_afectados=('periodo', 'nunique'))
+                        .sort_values('abs_delta', ascending=False)
+                        .head(self.top * 5))
+        return por_periodo.drop(columns=['abs_delta']), total.drop(columns=['abs_delta'])
+
+    # ------------------------------------------------------------------
+    # Punto de entrada
+    # ------------------------------------------------------------------
+
+    def comparar(self):
+        """Calcula todas las diferencias y retorna el resultado como dict."""
+        print("\nAlineando cursos por periodo, programa, curso y ambiente...")
+        alineado = self.alinear_cursos()
+        print(f"  {len(alineado)} filas alineadas")
+
+        por_periodo = self._agregar(alineado, ['clave_periodo', 'periodo'])
+        por_periodo = por_periodo.merge(self._estudiantes_por_periodo(), on='periodo', how='left')
+        por_ambiente = self._agregar(alineado, ['clave_periodo', 'periodo', 'programa', 'tipo_ambiente'])
+        cursos_periodo, cursos_total = self._ranking_cursos(alineado)
+
+        pico_a = self.lector_a.seccion('resumen_total', {}).get('periodo_pico', {})
+        pico_b = self.lector_b.seccion('resumen_total', {}).get('periodo_pico', {})
+        resumen = {
+            'json_a': str(self.json_a),
+            'json_b': str(self.json_b),
+            'periodo_pico_a': pico_a,
+            'periodo_pico_b': pico_b,
+            'delta_horas_pico': (pico_b.get('horas_semanales_totales', 0) -
+                                 pico_a.get('horas_semanales_totales', 0)),
+            'cursos_nuevos'    : int((alineado['estado'] == 'nuevo').sum()),
+            'cursos_eliminados': int((alineado['estado'] == 'eliminado').sum()),
+            'filas_con_cambios': int(((alineado['delta_horas_totales'] != 0) |
+                                      (alineado['delta_secciones'] != 0)).sum()),
+        }
+
+        def registros(df):
+            return json.loads(df.drop(columns=['clave_periodo'], errors='ignore').to_json(orient='records', force_ascii=False))
+
+        self.tablas = {
+            'Por Periodo'   : por_periodo.drop(columns=['clave_periodo']),
+            'Por Ambiente'  : por_ambiente.drop(columns=['clave_periodo']),
+            'Cursos Periodo': cursos_periodo.drop(columns=['clave_periodo']),
+            'Cursos Total'  : cursos_total,
+        }
+        self.resultado = {
+            'resumen'            : resumen,
+            'por_periodo'        : registros(por_periodo),
+            'por_ambiente'       : registros(por_ambiente),
+            'cursos_por_periodo' : registros(cursos_periodo),
+            'cursos_total'       : registros(cursos_total),
+        }
+
+        print(f"  Pico A: {pico_a.get('periodo')} ({pico_a.get('horas_semanales_totales', 0):.2f} hrs)")
+        print(f"  Pico B: {pico_b.get('periodo')} ({pico_b.get('horas_semanales_totales', 0):.2f} hrs)")
+        print(f"  Filas con cambios: {resumen['filas_con_cambios']}")
+        return self.resultado
+
+    def _escribir_excel(self):
+        resumen = pd.DataFrame(
+            [(k, json.dumps(v, ensure_ascii=False) if isinstance(v, dict) else v)
+             for k, v in self.resultado['resumen'].items()],
+            columns=['Concepto', 'Valor'],
+        )
+        with pd.ExcelWriter(self.output_excel, engine='openpyxl') as writer:
+            escribir_hoja(writer, resumen, 'Resumen', min_w=10)
+            for nombre, df in self.tablas.items():
+                escribir_hoja(writer, df, nombre, min_w=10)
+
+        wb = load_workbook(self.output_excel)
+        fill = PatternFill('solid', fgColor=COLOR_HEADER)
+        font = Font(bold=True, color='FFFFFF', size=10)
+        for ws in wb.worksheets:
+            for cell in ws[1]:
+                cell.fill      = fill
+                cell.font      = font
+                cell.alignment = Alignment(horizontal='center', wrap_text=True)
+        wb.save(self.output_excel)
+
+    def generar(self):
+        """Compara y escribe las salidas configuradas."""
+        self.comparar()
+
+        if self.output_json:
+            Path(self.output_json).parent.mkdir(parents=True, exist_ok=True)
+            with open(self.output_json, 'w', encoding='utf-8') as f:
+                json.dump(self.resultado, f, indent=2, ensure_ascii=False)
+            print(f"\n  JSON de comparacion: {self.output_json}")
+
+        if self.output_excel:
+            Path(self.output_excel).parent.mkdir(parents=True, exist_ok=True)
+            self._escribir_excel()
+            print(f"  Excel de comparacion: {self.output_excel}")
+
+        print(f"\n{'=' * 80}")
+        print("COMPARACION COMPLETADA")
+        print(f"{'=' * 80}")
+        return self.resultado
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compara dos JSON de consumo de horas-aula.")
+    parser.add_argument('json_a', help="Corrida anterior")
+    parser.add_argument('json_b', help="Corrida nueva")
+    parser.add_argument('--salida-json', default='salida/json/comparacion.json')
+    parser.add_argument('--salida-excel', default='salida/excel/comparacion.xlsx')
+    parser.add_argument('--top', type=int, default=10, help="Cursos por periodo en el ranking")
+    args = parser.parse_args()
+
+    ComparadorResultados(args.json_a, args.json_b, args.salida_json, args.salida_excel, args.top).generar()
@@ -0,0 +1,200 @@
+"""
+Cubo de consumo pre-agregado.
+
+Se construye una vez a partir de `resultados` (después de fusionar los
+cursos compartidos) y agrega las filas al grano más fino:
+
+    periodo × año × ciclo × programa × semestre × codigo_curso × tipo_ambiente
+
+(`categoria` — aula, laboratorio, taller, virtual — depende solo del tipo de
+ambiente y va como dimensión adicional). Medidas almacenadas:
+
+    horas            suma de HORAS_TOTALES
+    secciones        suma de SECCIONES
+    filas            filas de resultados agregadas
+    suma_estudiantes / max_estudiantes / min_estudiantes   de TOTAL_MATRICULADOS
+    estudiantes      TOTAL_MATRICULADOS de la primera fila (orden de resultados)
+
+y derivadas al consultar: promedio_estudiantes, promedio_secciones.
+
+Consultas:
+
+    cubo.filtrar(ciclo=2, categoria='laboratorio')          # rebanada (otro cubo)
+    cubo.rollup(['semestre', 'tipo_ambiente'], ['horas'])   # DataFrame indexado por las dimensiones
+    cubo.total('horas')                                     # escalar
+    cubo.promedio('horas', sobre='periodo', por=['año'])    # promedio de los totales por periodo
+
+Las dimensiones vacías (p. ej. tipo de ambiente sin dato) se conservan como
+NaN en las agrupaciones.
+"""
+
+import numpy as np
+import pandas as pd
+
+from periodos import anio_de_clave, ciclo_de_clave
+
+
+DIMENSIONES = ['periodo', 'año', 'ciclo', 'programa', 'semestre', 'codigo_curso', 'tipo_ambiente', 'categoria']
+
+# medida → agregación al hacer rollup
+MEDIDAS = {
+    'horas'           : 'sum',
+    'secciones'       : 'sum',
+    'filas'           : 'sum',
+    'suma_estudiantes': 'sum',
+    'max_estudiantes' : 'max',
+    'min_estudiantes' : 'min',
+    'estudiantes'     : 'first',   # el cubo se guarda en orden de resultados
+}
+
+# medida derivada → (numerador, denominador)
+DERIVADAS = {
+    'promedio_estudiantes': ('suma_estudiantes', 'filas'),
+    'promedio_secciones'  : ('secciones', 'filas'),
+}
+
+
+class CuboConsumo:
+    """
+    Consumo agregado por todas las dimensiones del análisis, con consultas
+    de rebanada y rollup.
+    """
+
+    def __init__(self, celdas):
+        self.celdas = celdas
+
+    @classmethod
+    def desde_resultados(cls, resultados, programas, categoria_ambiente):
+        """
+        Agrega `resultados` ({programa: DataFrame}) al grano más fino.
+        `categoria_ambiente`: tipo de ambiente → categoría (admite vacíos).
+        """
+        frames = [resultados[p].assign(PROGRAMA=p) for p in programas]
+        todos = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=['CLAVE_PERIODO', 'PROGRAMA', 'SEMESTRE', 'CODIGO_CURSO', 'TIPO_AMBIENTE',
+                     'HORAS_TOTALES', 'SECCIONES', 'TOTAL_MATRICULADOS']
+        )
+
+        tipos = todos['TIPO_AMBIENTE']
+        filas = pd.DataFrame({
+            'periodo'         : todos['CLAVE_PERIODO'],
+            'año'             : anio_de_clave(todos['CLAVE_PERIODO']),
+            'ciclo'           : ciclo_de_clave(todos['CLAVE_PERIODO']),
+            'programa'        : todos['PROGRAMA'],
+            'semestre'        : todos['SEMESTRE'],
+            'codigo_curso'    : todos['CODIGO_CURSO'],
+            'tipo_ambiente'   : tipos,
+            'categoria'       : tipos.map({t: categoria_ambiente(t) for t in tipos.dropna().unique()})
+                                     .fillna(categoria_ambiente(None)),
+            'horas'           : todos['HORAS_TOTALES'],
+            'secciones'       : todos['SECCIONES'],
+            'filas'           : 1,
+            'suma_estudiantes': todos['TOTAL_MATRICULADOS'],
+            'max_estudiantes' : todos['TOTAL_MATRICULADOS'],
+            'min_estudiantes' : todos['TOTAL_MATRICULADOS'],
+            'estudiantes'     : todos['TOTAL_MATRICULADOS'],
+            'orden'           : np.arange(len(todos)),
+        })
+
+        agregaciones = {medida: MEDIDAS[medida] for medida in MEDIDAS}
+        agregaciones['orden'] = 'min'
+        celdas = (filas.groupby(DIMENSIONES, sort=False, dropna=False)
+                       .agg(agregaciones)
+                       .sort_values('orden', kind='stable')
+                       .reset_index()
+                       .drop(columns='orden'))
+        return cls(celdas)
+
+    def __len__(self):
+        return len(self.celdas)
+
+    @property
+    def vacio(self):
+        return self.celdas.empty
+
+    def cero(self, medida):
+        """Cero del tipo de la medida (lo que daría sumar una rebanada vacía)."""
+        return self.celdas[medida].dtype.type(0)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def filtrar(self, **filtros):
+        """
+        Rebanada del cubo. Cada filtro es dimensión=valor, dimensión=[valores]
+        o dimensión=función(serie) → máscara.
+        """
+        mascara = pd.Series(True, index=self.celdas.index)
+        for dimension, valor in filtros.items():
+            if dimension not in DIMENSIONES:
+                raise ValueError(f"Dimension no valida: '{dimension}' (use {', '.join(DIMENSIONES)})")
+            columna = self.celdas[dimension]
+            if callable(valor):
+                mascara &= valor(columna)
+            elif isinstance(valor, (list, tuple, set, frozenset)):
+                mascara &= columna.isin(valor)
+            else:
+                mascara &= columna == valor
+        return CuboConsumo(self.celdas[mascara])
+
+    def valores(self, dimension):
+        """Valores distintos de una dimensión, ordenados."""
+        return sorted(self.celdas[dimension].dropna().unique())
+
+    def _medidas(self, medidas):
+        medidas = list(medidas) if medidas is not None else list(MEDIDAS) + list(DERIVADAS)
+        desconocidas = [m for m in medidas if m not in MEDIDAS and m not in DERIVADAS]
+        if desconocidas:
+            raise ValueError(f"Medidas no validas: {desconocidas}")
+        base = []
+        for medida in medidas:
+            for m in DERIVADAS.get(medida, (medida,)):
+                if m not in base:
+                    base.append(m)
+        return medidas, base
+
+    @staticmethod
+    def _derivar(tabla, medidas):
+        for medida in medidas:
+            if medida in DERIVADAS:
+                numerador, denominador = DERIVADAS[medida]
+                tabla[medida] = tabla[numerador] / tabla[denominador]
+        return tabla[medidas]
+
+    def rollup(self, por, medidas=None):
+        """
+        Agrega el cubo por las dimensiones `por`. Retorna un DataFrame con
+        índice `por` (ordenado) y una columna por medida.
+        """
+        por = [por] if isinstance(por, str) else list(por)
+        medidas, base = self._medidas(medidas)
+        tabla = (self.celdas.groupby(por, dropna=False)
+                            .agg({m: MEDIDAS[m] for m in base}))
+        return self._derivar(tabla, medidas)
+
+    def total(self, medida):
+        """Valor de una medida sobre todo el cubo (o la rebanada)."""
+        medidas, base = self._medidas([medida])
+        if self.vacio:
+            return self.cero(medida) if MEDIDAS.get(medida) == 'sum' else np.nan
+        valores = {}
+        for m in base:
+            columna = self.celdas[m]
+            valores[m] = columna.iloc[0] if MEDIDAS[m] == 'first' else columna.agg(MEDIDAS[m])
+        if medida in DERIVADAS:
+            numerador, denominador = DERIVADAS[medida]
+            return valores[numerador] / valores[denominador]
+        return valores[medida]
+
+    def promedio(self, medida, sobre='periodo', por=()):
+        """
+        Promedio, entre los valores de `sobre` presentes, del total de
+        `medida` en cada uno (p. ej. horas semanales promedio por periodo).
+        Con `por` retorna una Serie indexada por esas dimensiones.
+        """
+        por = [por] if isinstance(por, str) else list(por)
+        totales = self.rollup(por + [sobre], [medida])[medida]
+        if not por:
+            return totales.mean()
+        return totales.groupby(level=por, dropna=False).mean()
@@ -0,0 +1,154 @@
+"""
+Datos compartidos entre procesos (multiprocessing.shared_memory)
+
+Publica una sola vez las mallas, proyecciones y equivalencias ya cargadas y
+validadas en un bloque de memoria compartida, columna por columna (buffers
+NumPy). El objeto `DatosCompartidos` es liviano de serializar: solo lleva la
+configuración, el nombre del bloque y la descripción de cada columna, de modo
+que enviarlo a un proceso trabajador no copia los DataFrames.
+
+En el trabajador, `tablas()` reconstruye los DataFrames:
+  - columnas numéricas, booleanas y de fecha: vistas directas sobre el bloque
+    (sin copia, de solo lectura);
+  - columnas de texto: se guardan como códigos enteros en el bloque y un
+    diccionario de valores únicos en el objeto; se decodifican al adjuntar.
+
+Uso:
+    datos = DatosCompartidos.publicar(analizador)      # proceso principal
+    with ProcessPoolExecutor() as ex:
+        ex.map(trabajo, [datos] * n)
+    datos.liberar()
+
+    def trabajo(datos):                                 # proceso trabajador
+        analizador = AnalizadorHorasAula(datos=datos)
+        ...
+"""
+
+import copy
+import sys
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+
+TABLAS = ('mallas', 'proyecciones', 'equivalencias')
+
+ALINEACION = 8
+
+
+def _adjuntar_bloque(nombre):
+    """
+    Abre un bloque existente sin que el trabajador lo elimine al salir.
+    Antes de Python 3.13 los trabajadores (hijos del proceso que publicó)
+    comparten su resource_tracker, que solo lo elimina en `liberar()`.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=nombre, track=False)
+    return SharedMemory(name=nombre)
+
+
+def _codificar(serie):
+    """
+    Arreglo NumPy a guardar en el bloque y descripción de la columna.
+    Las columnas de objetos (texto, códigos mixtos) se codifican como enteros.
+    """
+    if serie.dtype.kind in 'biuf':
+        return serie.to_numpy(), {'tipo': 'numero', 'dtype': serie.dtype.str}
+    if serie.dtype.kind == 'M':
+        return serie.to_numpy().view('int64'), {'tipo': 'fecha', 'dtype': serie.dtype.str}
+
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    return codigos.astype('int32'), {'tipo': 'codigos', 'dtype': '<i4', 'valores': list(unicos),
+                                     'dtype_original': str(serie.dtype)}
+
+
+class DatosCompartidos:
+    """
+    Manejador de los datos de entrada de una carrera en memoria compartida.
+    """
+
+    def __init__(self, config, nombre_bloque, columnas):
+        self.config        = config
+        self.nombre_bloque = nombre_bloque
+        self.columnas      = columnas   # {(tabla, programa): [(columna, descripción), ...]}
+        self._bloque       = None
+        self._propietario  = False
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado['_bloque'] = None
+        estado['_propietario'] = False
+        return estado
+
+    @classmethod
+    def publicar(cls, analizador):
+        """Copia los datos cargados de `analizador` a un bloque nuevo."""
+        arreglos = []
+        columnas = {}
+        desplazamiento = 0
+
+        for tabla in TABLAS:
+            for programa, df in getattr(analizador, tabla).items():
+                descripcion = []
+                for nombre in df.columns:
+                    arreglo, info = _codificar(df[nombre])
+                    arreglo = np.ascontiguousarray(arreglo)
+                    info.update(inicio=desplazamiento, largo=len(arreglo))
+                    descripcion.append((nombre, info))
+                    arreglos.append((desplazamiento, arreglo))
+                    desplazamiento += -(-arreglo.nbytes // ALINEACION) * ALINEACION
+                columnas[(tabla, programa)] = descripcion
+
+        bloque = SharedMemory(create=True, size=max(desplazamiento, 1))
+        for inicio, arreglo in arreglos:
+            bloque.buf[inicio:inicio + arreglo.nbytes] = arreglo.view('uint8').reshape(-1)
+
+        datos = cls(copy.deepcopy(analizador.config), bloque.name, columnas)
+        datos._bloque = bloque
+        datos._propietario = True
+        return datos
+
+    @property
+    def tamano(self):
+        """Bytes ocupados en memoria compartida."""
+        return self._abrir().size
+
+    def _abrir(self):
+        if self._bloque is None:
+            self._bloque = _adjuntar_bloque(self.nombre_bloque)
+        return self._bloque
+
+    def _columna(self, info):
+        bloque = self._abrir()
+        dtype = np.dtype(info['dtype'] if info['tipo'] == 'numero' else
+                         'int64' if info['tipo'] == 'fecha' else info['dtype'])
+        arreglo = np.ndarray((info['largo'],), dtype=dtype, buffer=bloque.buf, offset=info['inicio'])
+        arreglo.flags.writeable = False
+
+        if info['tipo'] == 'fecha':
+            return arreglo.view(info['dtype'])
+        if info['tipo'] == 'codigos':
+            valores = np.empty(len(info['valores']) + 1, dtype=object)
+            valores[:-1] = info['valores']
+            valores[-1] = np.nan                     # código -1 → vacío
+            return pd.Series(valores[arreglo]).astype(info['dtype_original'])
+        return arreglo
+
+    def tablas(self):
+        """Retorna (mallas, proyecciones, equivalencias) como dicts programa → DataFrame."""
+        resultado = {tabla: {} for tabla in TABLAS}
+        for (tabla, programa), descripcion in self.columnas.items():
+            resultado[tabla][programa] = pd.DataFrame(
+                {nombre: self._columna(info) for nombre, info in descripcion}, copy=False
+            )
+        return resultado['mallas'], resultado['proyecciones'], resultado['equivalencias']
+
+    def liberar(self):
+        """Cierra el bloque; el proceso que lo publicó además lo elimina."""
+        if self._bloque is None:
+            return
+        self._bloque.close()
+        if self._propietario:
+            self._bloque.unlink()
+        self._bloque = None
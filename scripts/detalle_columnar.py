@@ -0,0 +1,82 @@
+"""
+Formato por columnas de `detalle_cursos_por_periodo`.
+
+En el formato por filas (el de siempre) cada periodo lleva una lista de
+cursos y cada curso repite las nueve claves:
+
+    {"periodo": "2027-01", "cursos": [{"programa": "LLYA", "semestre": 1, ...}, ...]}
+
+Con `output.formato_detalle = "columnas"` cada periodo guarda un arreglo por
+campo, y los textos que se repiten (programa, código, nombre del curso y
+tipo de ambiente) se codifican con un diccionario propio del periodo: la
+columna lleva la posición del valor en el diccionario.
+
+    {"periodo": "2027-01",
+     "diccionarios": {"programa": ["LLYA", "MYC"], ...},
+     "columnas": {"programa": [0, 0, 1, ...], "semestre": [1, 1, 1, ...], ...}}
+
+Cada periodo es independiente (el índice del JSON sigue permitiendo leer uno
+solo). Los lectores usan `cursos_periodo` o `tabla_cursos`, que aceptan
+ambos formatos.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+FORMATOS_DETALLE = ('filas', 'columnas')
+
+CAMPOS_CURSO = ['programa', 'semestre', 'codigo_curso', 'curso', 'tipo_ambiente',
+                'estudiantes', 'horas_semanales', 'secciones', 'horas_totales']
+
+CAMPOS_CODIFICADOS = ('programa', 'codigo_curso', 'curso', 'tipo_ambiente')
+
+
+def es_columnar(item):
+    return 'columnas' in item
+
+
+def a_columnas(cursos):
+    """Lista de cursos (formato por filas) → {'diccionarios', 'columnas'}."""
+    diccionarios = {campo: {} for campo in CAMPOS_CODIFICADOS}
+    columnas = {campo: [] for campo in CAMPOS_CURSO}
+    for curso in cursos:
+        for campo in CAMPOS_CURSO:
+            valor = curso[campo]
+            if campo in diccionarios:
+                valor = diccionarios[campo].setdefault(valor, len(diccionarios[campo]))
+            columnas[campo].append(valor)
+    return {
+        'diccionarios': {campo: list(valores) for campo, valores in diccionarios.items()},
+        'columnas': columnas,
+    }
+
+
+def cursos_periodo(item):
+    """Cursos de un periodo como lista de dicts, en cualquiera de los dos formatos."""
+    if not es_columnar(item):
+        return item['cursos']
+    columnas, diccionarios = item['columnas'], item['diccionarios']
+    decodificadas = [
+        [diccionarios[campo][i] for i in columnas[campo]] if campo in diccionarios else columnas[campo]
+        for campo in CAMPOS_CURSO
+    ]
+    return [dict(zip(CAMPOS_CURSO, valores)) for valores in zip(*decodificadas)]
+
+
+def tabla_cursos(item):
+    """
+    Cursos de un periodo como DataFrame (columnas CAMPOS_CURSO). En formato
+    por columnas se arma directamente de los arreglos, sin pasar por dicts.
+    """
+    if not es_columnar(item):
+        return pd.DataFrame(item['cursos'], columns=CAMPOS_CURSO)
+    columnas, diccionarios = item['columnas'], item['diccionarios']
+    datos = {}
+    for campo in CAMPOS_CURSO:
+        if campo in diccionarios:
+            valores = np.array(diccionarios[campo], dtype=object)
+            datos[campo] = valores[np.asarray(columnas[campo], dtype=np.intp)]
+        else:
+            datos[campo] = columnas[campo]
+    return pd.DataFrame(datos, columns=CAMPOS_CURSO)
@@ -0,0 +1,384 @@
+"""
+Distribuidor de secciones entre sedes
+
+El análisis calcula la demanda como si toda la matrícula estuviera en una
+sola sede. Con varias sedes, la matrícula de cada programa se reparte entre
+ellas y cada curso puede dictarse:
+
+  - en cada sede con sus propios alumnos ("local"), o
+  - concentrado en una sede que recibe a los alumnos de las demás, lo que
+    puede ahorrar secciones (8 + 7 alumnos → una sección en vez de dos).
+
+Para cada periodo de `detalle_cursos_por_periodo` se elige la opción de cada
+curso que minimiza, en este orden:
+  1. las horas que exceden la capacidad del inventario de cada sede
+     (ambientes × horas_por_ambiente; en horas y no en ambientes para que
+     la búsqueda local vea el avance antes de liberar un ambiente entero),
+  2. el total de ambientes usados (horas por sede y tipo / horas_por_ambiente,
+     redondeado hacia arriba),
+  3. los alumnos trasladados a otra sede.
+
+Heurística: asignación voraz (cursos de mayor carga primero) y luego
+búsqueda local cambiando la opción de un curso a la vez mientras mejore el
+objetivo; si queda exceso sin mejora individual, se prueban cadenas de dos
+cambios entre los cursos que aportan al exceso. Las secciones se recalculan con `calcular_secciones`. Las horas
+virtuales no ocupan ambiente y no se distribuyen.
+
+Configuración (config.json):
+    "distribucion_sedes": {
+      "horas_por_ambiente": 45,
+      "sedes": {
+        "Central": {"matricula": {"LLYA": 0.7, "MYC": 0.6},
+                    "inventario": {"Aula": 3, "Laboratorio de Física": 1}},
+        "Norte":   {"matricula": {"LLYA": 0.3, "MYC": 0.4},
+                    "inventario": {"Aula": 2, "Taller": 1}}
+      }
+    }
+La fracción de matrícula de cada programa debe sumar 1 entre las sedes. En
+cursos compartidos fusionados (LLYA↔MYC) se usa la fracción del programa que
+figura en el detalle.
+
+Uso:
+    python scripts/distribuidor_sedes.py --config config.json
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+
+from analizador_horas_aula import calcular_secciones, categoria_ambiente
+from detalle_columnar import cursos_periodo
+from lector_json import LectorConsumoJSON
+
+
+TOLERANCIA = 1e-9
+
+MAX_PASADAS = 50
+
+
+def repartir(total, fracciones):
+    """Reparte `total` alumnos según `fracciones` (mayor resto; la suma se conserva)."""
+    exactos = [total * f for f in fracciones]
+    partes = [int(math.floor(x)) for x in exactos]
+    faltan = total - sum(partes)
+    for i in sorted(range(len(exactos)), key=lambda i: partes[i] - exactos[i])[:faltan]:
+        partes[i] += 1
+    return partes
+
+
+class DistribuidorSedes:
+    """
+    Decide en qué sede se dictan las secciones de cada curso, por periodo.
+    """
+
+    def __init__(self, sedes, parametros, horas_por_ambiente=45):
+        if not sedes:
+            raise ValueError("Debe declarar al menos una sede")
+        if horas_por_ambiente <= 0:
+            raise ValueError("horas_por_ambiente debe ser positivo")
+
+        self.nombres = list(sedes)
+        self.parametros = parametros
+        self.horas_por_ambiente = horas_por_ambiente
+        self.inventario = {
+            (i, tipo): cantidad
+            for i, nombre in enumerate(self.nombres)
+            for tipo, cantidad in sedes[nombre].get('inventario', {}).items()
+        }
+
+        programas = {p for datos in sedes.values() for p in datos.get('matricula', {})}
+        self.fracciones = {}
+        for programa in programas:
+            fracciones = [sedes[nombre].get('matricula', {}).get(programa, 0) for nombre in self.nombres]
+            if any(f < 0 for f in fracciones) or abs(sum(fracciones) - 1) > 1e-6:
+                raise ValueError(f"La matricula de '{programa}' debe repartirse en fracciones >= 0 que sumen 1")
+            self.fracciones[programa] = fracciones
+
+    @classmethod
+    def desde_config(cls, config, parametros):
+        if 'distribucion_sedes' not in config:
+            raise ValueError("La configuracion no tiene la seccion 'distribucion_sedes'")
+        distribucion = config['distribucion_sedes']
+        return cls(distribucion['sedes'], parametros, distribucion.get('horas_por_ambiente', 45))
+
+    # ------------------------------------------------------------------
+    # Cursos del periodo y sus opciones
+    # ------------------------------------------------------------------
+
+    def _cursos(self, cursos_periodo):
+        """Agrupa las filas del detalle por curso (una decisión por curso)."""
+        cursos = {}
+        for fila in cursos_periodo:
+            if categoria_ambiente(fila['tipo_ambiente']) == 'virtual' or fila['estudiantes'] <= 0:
+                continue
+            clave = (fila['programa'], fila['codigo_curso'])
+            if clave not in cursos:
+                if fila['programa'] not in self.fracciones:
+                    raise ValueError(f"El programa '{fila['programa']}' no tiene reparto de matricula entre sedes")
+                cursos[clave] = {
+                    'programa'   : fila['programa'],
+                    'codigo'     : fila['codigo_curso'],
+                    'curso'      : fila['curso'],
+                    'estudiantes': fila['estudiantes'],
+                    'grupos'     : repartir(fila['estudiantes'], self.fracciones[fila['programa']]),
+                    'filas'      : [],
+                }
+            cursos[clave]['filas'].append((fila['tipo_ambiente'], fila['horas_semanales']))
+
+        for curso in cursos.values():
+            curso['opciones'] = self._opciones(curso)
+        return list(cursos.values())
+
+    def _aporte(self, curso, sedes_destino):
+        """Horas por (sede, tipo) si el grupo de la sede i se dicta en sedes_destino[i]."""
+        alumnos = {}
+        for grupo, destino in zip(curso['grupos'], sedes_destino):
+            if grupo > 0:
+                alumnos[destino] = alumnos.get(destino, 0) + grupo
+
+        aporte = {}
+        for sede, estudiantes in alumnos.items():
+            for tipo, horas in curso['filas']:
+                secciones = calcular_secciones(estudiantes, tipo, self.parametros)
+                aporte[(sede, tipo)] = aporte.get((sede, tipo), 0) + horas * secciones
+        return aporte
+
+    def _opciones(self, curso):
+        """
+        [(nombre, aporte, alumnos trasladados)]: 'local' y una opción por
+        sede que concentra a todos los alumnos del curso.
+        """
+        n = len(self.nombres)
+        opciones = [('local', self._aporte(curso, range(n)), 0)]
+        con_alumnos = [i for i, g in enumerate(curso['grupos']) if g > 0]
+        if len(con_alumnos) > 1:
+            for sede in range(n):
+                trasladados = sum(g for i, g in enumerate(curso['grupos']) if i != sede)
+                opciones.append((self.nombres[sede], self._aporte(curso, [sede] * n), trasladados))
+        return opciones
+
+    # ------------------------------------------------------------------
+    # Objetivo
+    # ------------------------------------------------------------------
+
+    def _ambientes_necesarios(self, horas):
+        return math.ceil(horas / self.horas_por_ambiente - TOLERANCIA) if horas > TOLERANCIA else 0
+
+    def _termino(self, clave, horas):
+        """(horas sobre la capacidad, ambientes usados) de una sede y tipo con `horas`."""
+        capacidad = self.inventario.get(clave, 0) * self.horas_por_ambiente
+        exceso = horas - capacidad
+        return (exceso if exceso > TOLERANCIA else 0), self._ambientes_necesarios(horas)
+
+    def _delta(self, carga, anterior, nueva):
+        """Cambio del objetivo (exceso en horas, ambientes) al reemplazar el aporte `anterior` por `nueva`."""
+        exceso = ambientes = 0
+        for clave in anterior.keys() | nueva.keys():
+            actual = carga.get(clave, 0)
+            e0, a0 = self._termino(clave, actual)
+            e1, a1 = self._termino(clave, actual - anterior.get(clave, 0) + nueva.get(clave, 0))
+            exceso += e1 - e0
+            ambientes += a1 - a0
+        return round(exceso, 9), ambientes
+
+    @staticmethod
+    def _aplicar(carga, anterior, nueva):
+        for clave, horas in anterior.items():
+            carga[clave] -= horas
+        for clave, horas in nueva.items():
+            carga[clave] = carga.get(clave, 0) + horas
+
+    def _ambientes(self, carga):
+        usados, exceso = {}, {}
+        for (sede, tipo), horas in sorted(carga.items()):
+            a = self._ambientes_necesarios(horas)
+            e = max(0, a - self.inventario.get((sede, tipo), 0))
+            if a:
+                usados.setdefault(self.nombres[sede], {})[tipo] = a
+            if e:
+                exceso.setdefault(self.nombres[sede], {})[tipo] = e
+        return usados, exceso
+
+    # ------------------------------------------------------------------
+    # Heurística
+    # ------------------------------------------------------------------
+
+    def _delta_opcion(self, carga, curso, actual, nueva):
+        """Cambio del objetivo completo al pasar `curso` de la opción `actual` a `nueva`."""
+        _, aporte_actual, trasladados_actual = curso['opciones'][actual]
+        _, aporte_nuevo, trasladados_nuevo = curso['opciones'][nueva]
+        return (*self._delta(carga, aporte_actual, aporte_nuevo), trasladados_nuevo - trasladados_actual)
+
+    def _mover(self, carga, curso, elegida, i, nueva):
+        self._aplicar(carga, curso['opciones'][elegida[i]][1], curso['opciones'][nueva][1])
+        elegida[i] = nueva
+
+    def _busqueda_local(self, cursos, elegida, carga, orden):
+        """Una pasada cambiando la opción de un curso a la vez. Retorna si hubo mejora."""
+        mejoro = False
+        for i in orden:
+            mejor, mejor_delta = elegida[i], (0, 0, 0)
+            for k in range(len(cursos[i]['opciones'])):
+                if k != elegida[i]:
+                    delta = self._delta_opcion(carga, cursos[i], elegida[i], k)
+                    if delta < mejor_delta:
+                        mejor, mejor_delta = k, delta
+            if mejor != elegida[i]:
+                self._mover(carga, cursos[i], elegida, i, mejor)
+                mejoro = True
+        return mejoro
+
+    def _movimiento_doble(self, cursos, elegida, carga):
+        """
+        Cadena de dos cambios para salir de un exceso que ningún cambio
+        individual reduce (p. ej. llevar un curso de aula a una sede libre
+        para hacer lugar a un curso con laboratorio). Solo se prueban cursos
+        que aportan a los (sede, tipo) excedidos. Aplica la primera cadena
+        que mejora el objetivo y retorna si la encontró.
+        """
+        def excedidos():
+            return {clave for clave, horas in carga.items() if self._termino(clave, horas)[0] > 0}
+
+        def aportantes(claves):
+            return [i for i, curso in enumerate(cursos)
+                    if claves & curso['opciones'][elegida[i]][1].keys()]
+
+        for i in aportantes(excedidos()):
+            original_i = elegida[i]
+            for k in range(len(cursos[i]['opciones'])):
+                if k == original_i:
+                    continue
+                delta_i = self._delta_opcion(carga, cursos[i], original_i, k)
+                self._mover(carga, cursos[i], elegida, i, k)
+                for j in aportantes(excedidos()):
+                    if j == i:
+                        continue
+                    for m in range(len(cursos[j]['opciones'])):
+                        if m == elegida[j]:
+                            continue
+                        delta_j = self._delta_opcion(carga, cursos[j], elegida[j], m)
+                        if tuple(a + b for a, b in zip(delta_i, delta_j)) < (0, 0, 0):
+                            self._mover(carga, cursos[j], elegida, j, m)
+                            return True
+                self._mover(carga, cursos[i], elegida, i, original_i)
+        return False
+
+    def distribuir_periodo(self, cursos_periodo):
+        """Distribuye los cursos de un periodo. Retorna el plan del periodo."""
+        cursos = self._cursos(cursos_periodo)
+        carga = {}
+        elegida = [None] * len(cursos)
+        sin_aporte = {}
+
+        # Referencia: todo local
+        carga_local = {}
+        for curso in cursos:
+            self._aplicar(carga_local, sin_aporte, curso['opciones'][0][1])
+
+        # 1. Voraz: cursos de mayor carga primero
+        orden = sorted(range(len(cursos)), key=lambda i: -sum(cursos[i]['opciones'][0][1].values()))
+        for i in orden:
+            opciones = cursos[i]['opciones']
+            mejor = min(range(len(opciones)),
+                        key=lambda k: (*self._delta(carga, sin_aporte, opciones[k][1]), opciones[k][2]))
+            elegida[i] = mejor
+            self._aplicar(carga, sin_aporte, opciones[mejor][1])
+
+        # 2. Búsqueda local; si queda exceso, movimientos dobles
+        pasadas = 0
+        while pasadas < MAX_PASADAS:
+            pasadas += 1
+            if not self._busqueda_local(cursos, elegida, carga, orden):
+                if not self._movimiento_doble(cursos, elegida, carga):
+                    break
+
+        usados, exceso = self._ambientes(carga)
+        usados_local, _ = self._ambientes(carga_local)
+        concentrados = [
+            {
+                'programa'   : curso['programa'],
+                'codigo_curso': curso['codigo'],
+                'curso'      : curso['curso'],
+                'sede'       : curso['opciones'][k][0],
+                'estudiantes': curso['estudiantes'],
+                'trasladados': curso['opciones'][k][2],
+            }
+            for curso, k in zip(cursos, elegida) if k != 0
+        ]
+        return {
+            'factible': not exceso,
+            'ambientes_por_sede': usados,
+            'exceso_por_sede': exceso,
+            'total_ambientes': sum(sum(t.values()) for t in usados.values()),
+            'total_ambientes_local': sum(sum(t.values()) for t in usados_local.values()),
+            'estudiantes_trasladados': sum(c['trasladados'] for c in concentrados),
+            'cursos_concentrados': concentrados,
+            'pasadas': pasadas,
+        }
+
+    def distribuir(self, detalle_cursos):
+        """Itera los planes de cada periodo de `detalle_cursos_por_periodo`."""
+        for periodo in detalle_cursos:
+            yield {'periodo': periodo['periodo'], **self.distribuir_periodo(cursos_periodo(periodo))}
+
+    def resumen(self, planes):
+        """Máximo de ambientes por sede y tipo, y periodos que exceden el inventario."""
+        maximo = {}
+        for plan in planes:
+            for sede, tipos in plan['ambientes_por_sede'].items():
+                for tipo, cantidad in tipos.items():
+                    maximo.setdefault(sede, {})
+                    maximo[sede][tipo] = max(maximo[sede].get(tipo, 0), cantidad)
+        return {
+            'sedes': self.nombres,
+            'periodos': len(planes),
+            'periodos_factibles': sum(p['factible'] for p in planes),
+            'periodos_con_exceso': [p['periodo'] for p in planes if not p['factible']],
+            'maximo_ambientes_por_sede': maximo,
+            'ambientes_ahorrados': sum(p['total_ambientes_local'] - p['total_ambientes'] for p in planes),
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Distribuye las secciones de cada curso entre sedes.")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--json', help="JSON de consumo (por defecto el de config output.json)")
+    parser.add_argument('--salida', default='salida/json/distribucion_sedes.json')
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    lector = LectorConsumoJSON(args.json or config['output']['json'])
+    inicio = time.perf_counter()
+    try:
+        distribuidor = DistribuidorSedes.desde_config(config, lector.seccion('metadata')['parametros'])
+        planes = list(distribuidor.distribuir(lector.periodos('detalle_cursos_por_periodo')))
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    resumen = distribuidor.resumen(planes)
+    resumen['tiempo_s'] = round(time.perf_counter() - inicio, 3)
+
+    print("=" * 80)
+    print("DISTRIBUCION DE SECCIONES ENTRE SEDES")
+    print("=" * 80)
+    for plan in planes:
+        estado = 'OK' if plan['factible'] else 'EXCESO ' + '; '.join(
+            f"{sede}: " + ', '.join(f"{t} +{n}" for t, n in tipos.items())
+            for sede, tipos in plan['exceso_por_sede'].items())
+        print(f"  {plan['periodo']}: {plan['total_ambientes']:>3} ambientes "
+              f"(local {plan['total_ambientes_local']}), "
+              f"{len(plan['cursos_concentrados'])} cursos concentrados, {estado}")
+    print(f"\n  Periodos dentro del inventario: {resumen['periodos_factibles']} de {resumen['periodos']}")
+    print(f"  Ambientes ahorrados frente a dictar todo local: {resumen['ambientes_ahorrados']}")
+    print(f"  Tiempo: {resumen['tiempo_s']} s")
+
+    Path(args.salida).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump({'resumen': resumen, 'planes': planes}, f, indent=2, ensure_ascii=False)
+    print(f"  Distribucion guardada en: {args.salida}")
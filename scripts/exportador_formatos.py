@@ -0,0 +1,133 @@
+"""
+Exportación del resultado en formatos compactos y columnares.
+
+Además del JSON legible y los Excel, el resultado puede exportarse para
+herramientas de BI:
+
+  - "parquet" : una tabla Parquet (compresión zstd) por sección:
+                detalle_cursos, detalle_ambientes, consumo_por_periodo,
+                consumo_por_semestre y consumo_por_anio. Permite leer solo
+                las columnas necesarias. Requiere pyarrow.
+  - "json.gz" : el resultado completo como JSON compacto comprimido con gzip.
+  - "json.zst": ídem con zstd (compression.zstd de Python 3.14 o el paquete
+                zstandard).
+
+Configuración (config['output']):
+    "exportes": {
+      "directorio": "salida/exportes",
+      "formatos": ["parquet", "json.gz", "json.zst"]
+    }
+
+Si falta la dependencia de un formato se muestra una ADVERTENCIA y se omite.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from detalle_columnar import CAMPOS_CURSO, tabla_cursos
+
+
+FORMATOS = ('parquet', 'json.gz', 'json.zst')
+
+
+def _compresor_zstd():
+    """Función bytes → bytes comprimidos con zstd, o None si no hay implementación."""
+    try:
+        from compression import zstd
+        return zstd.compress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard.ZstdCompressor().compress
+    except ImportError:
+        return None
+
+
+def tablas_resultado(resultado):
+    """Secciones del resultado como DataFrames planos (una fila por registro)."""
+    tablas = {}
+
+    if 'detalle_cursos_por_periodo' in resultado:
+        tablas['detalle_cursos'] = pd.concat(
+            [tabla_cursos(p).assign(periodo=p['periodo'])[['periodo'] + CAMPOS_CURSO]
+             for p in resultado['detalle_cursos_por_periodo']]
+            or [pd.DataFrame(columns=['periodo'] + CAMPOS_CURSO)],
+            ignore_index=True,
+        )
+
+    if 'detalle_ambientes_especificos' in resultado:
+        tablas['detalle_ambientes'] = pd.DataFrame(
+            [{'periodo': p['periodo'], 'tipo_ambiente': ambiente, **info}
+             for p in resultado['detalle_ambientes_especificos']
+             for ambiente, info in p['ambientes'].items()]
+        )
+
+    secciones_resumen = {
+        'consumo_por_periodo'           : 'consumo_por_periodo',
+        'consumo_por_semestre_academico': 'consumo_por_semestre',
+        'consumo_por_año'               : 'consumo_por_anio',
+    }
+    for seccion, nombre in secciones_resumen.items():
+        if seccion in resultado:
+            tablas[nombre] = pd.json_normalize(resultado[seccion], sep='_')
+
+    return tablas
+
+
+def exportar_formatos(resultado, config_output, informar=print):
+    """
+    Escribe los formatos pedidos en config_output['exportes'] y retorna la
+    lista de archivos generados. Los mensajes van a `informar` (print por defecto).
+    """
+    exportes = config_output.get('exportes')
+    if not exportes:
+        return []
+
+    formatos = exportes.get('formatos', [])
+    desconocidos = set(formatos) - set(FORMATOS)
+    if desconocidos:
+        raise ValueError(f"Formatos de exportacion no validos: {sorted(desconocidos)} "
+                         f"(use {', '.join(FORMATOS)})")
+
+    directorio = Path(exportes.get('directorio', 'salida/exportes'))
+    directorio.mkdir(parents=True, exist_ok=True)
+    base = Path(config_output['json']).stem
+    generados = []
+
+    if 'parquet' in formatos:
+        try:
+            for nombre, df in tablas_resultado(resultado).items():
+                ruta = directorio / f"{base}_{nombre}.parquet"
+                df.to_parquet(ruta, compression='zstd', index=False)
+                generados.append(ruta)
+        except ImportError:
+            informar("  ADVERTENCIA: Parquet requiere pyarrow (pip install pyarrow); se omite")
+
+    compacto = None
+    if 'json.gz' in formatos or 'json.zst' in formatos:
+        compacto = json.dumps(resultado, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    if 'json.gz' in formatos:
+        ruta = directorio / f"{base}.json.gz"
+        with open(ruta, 'wb') as f:
+            # mtime=0: el mismo resultado produce el mismo archivo
+            with gzip.GzipFile(fileobj=f, mode='wb', mtime=0) as gz:
+                gz.write(compacto)
+        generados.append(ruta)
+
+    if 'json.zst' in formatos:
+        comprimir = _compresor_zstd()
+        if comprimir is None:
+            informar("  ADVERTENCIA: json.zst requiere Python 3.14 o el paquete zstandard; se omite")
+        else:
+            ruta = directorio / f"{base}.json.zst"
+            ruta.write_bytes(comprimir(compacto))
+            generados.append(ruta)
+
+    for ruta in generados:
+        informar(f"  Exportado: {ruta}")
+    return generados
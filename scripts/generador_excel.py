@@ -2,15 +2,32 @@
 Generador de Excel - Consumo de Horas-Aula
 Genera un archivo Excel con:
   - Hoja "Tabla Pivote": resumen de horas por ambiente y periodo (con incrementos).
+  - Hoja "Picos": pico y top de periodos por tipo de ambiente, y curvas de
+    duración de carga.
   - Una hoja por periodo (ej. "2027-01"): detalle de cada curso que contribuye
     a las horas de ese periodo, para verificación.
+
+Cada hoja de periodo guarda una huella (hash de su detalle en el JSON) en las
+propiedades del libro, de modo que `actualizar()` puede regenerar solo un rango
+de periodos y omitir las hojas cuyo contenido no cambió.
 """
 
-import pandas as pd
+import hashlib
 import json
-from openpyxl import load_workbook
+from itertools import zip_longest
+from pathlib import Path
+
+import pandas as pd
+from openpyxl.packaging.custom import StringProperty
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from openpyxl.utils.dataframe import dataframe_to_rows
+
+from analitica_picos import analizar_picos
+from avance import Avance
+from detalle_columnar import CAMPOS_CURSO, tabla_cursos
+from lector_json import LectorConsumoJSON, LectorConsumoMemoria
+from periodos import clave_desde_etiqueta, etiqueta_hoja
+from utilidades_excel import anchos_columnas, aplicar_anchos, escribir_hoja
 
 
 # Paleta sobria en escala de grises
@@ -19,36 +36,49 @@ COLOR_SUBHEADER = "808080"   # gris medio (texto blanco)
 COLOR_ALT_ROW   = "F2F2F2"   # gris muy claro para filas alternas
 COLOR_SUBTOTAL  = "D9D9D9"   # gris claro para subtotales/totales
 
+PREFIJO_HUELLA  = "huella:"  # propiedad del libro: huella:<hoja> → hash
+
+HOJAS_RESUMEN   = ('Tabla Pivote', 'Picos')
+
 
 class GeneradorExcel:
     """
     Genera el archivo Excel de consumo de horas-aula.
     """
 
-    def __init__(self, json_path, output_path):
+    def __init__(self, json_path, output_path, resultado=None, silencioso=False, progreso=None):
+        self.informar    = Avance('excel', silencioso, progreso)
         self.json_path   = json_path
         self.output_path = output_path
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            self.datos = json.load(f)
+        # Con `resultado` (dict de AnalizadorHorasAula.ejecutar) no se relee el
+        # JSON; si no, lectura perezosa: solo las secciones que usa cada hoja
+        if resultado is not None:
+            self.lector = LectorConsumoMemoria(resultado)
+        else:
+            self.lector = LectorConsumoJSON(json_path)
+        self.hojas_periodo = 0
+        self.hojas_escritas = []
+        self.huellas = {}
 
-        print("\n" + "=" * 80)
-        print("GENERADOR DE EXCEL")
-        print("=" * 80)
+        self.informar("\n" + "=" * 80)
+        self.informar("GENERADOR DE EXCEL")
+        self.informar("=" * 80)
 
     # ------------------------------------------------------------------
     # Hoja: Tabla Pivote
     # ------------------------------------------------------------------
 
     def crear_hoja_tabla_pivote(self, writer):
-        print("\n  Generando hoja: Tabla Pivote...")
+        self.informar("\n  Generando hoja: Tabla Pivote...")
 
-        if 'detalle_ambientes_especificos' not in self.datos:
-            print("  ADVERTENCIA: No hay detalle de ambientes en el JSON.")
+        detalle_ambientes = self.lector.seccion('detalle_ambientes_especificos')
+        if detalle_ambientes is None:
+            self.informar("  ADVERTENCIA: No hay detalle de ambientes en el JSON.")
             return
 
         periodos = []
-        for p in self.datos['detalle_ambientes_especificos']:
+        for p in detalle_ambientes:
             row = {'Periodo': p['periodo']}
             for ambiente, info in sorted(p['ambientes'].items()):
                 row[ambiente] = info['horas_semanales']
@@ -84,8 +114,71 @@ class GeneradorExcel:
         ordered += ['Total', 'Total_Incremento']
 
         df = df[ordered]
-        df.to_excel(writer, sheet_name='Tabla Pivote', index=False)
-        print("    OK: Tabla Pivote")
+        escribir_hoja(writer, df, 'Tabla Pivote', min_w=10, max_w=40)
+        self.informar("    OK: Tabla Pivote")
+
+    # ------------------------------------------------------------------
+    # Hoja: Picos
+    # ------------------------------------------------------------------
+
+    def crear_hoja_picos(self, writer):
+        """
+        Tabla de picos por tipo de ambiente y, debajo, las curvas de
+        duración de carga (horas de cada periodo de mayor a menor).
+        """
+        self.informar("\n  Generando hoja: Picos...")
+
+        picos = self.lector.seccion('picos_por_ambiente')
+        if picos is None:
+            # JSON anterior a la analítica de picos: se calcula aquí
+            detalle_ambientes = self.lector.seccion('detalle_ambientes_especificos')
+            if detalle_ambientes is None:
+                self.informar("  ADVERTENCIA: No hay detalle de ambientes en el JSON.")
+                return
+            picos = analizar_picos(detalle_ambientes)
+
+        por_ambiente = picos['por_ambiente']
+        if not por_ambiente:
+            self.informar("  ADVERTENCIA: No hay ambientes con horas en el JSON.")
+            return
+
+        resumen = []
+        for ambiente, info in por_ambiente.items():
+            fila = {
+                'Ambiente'        : ambiente,
+                'Periodo Pico'    : info['periodo_pico'],
+                'Horas Pico'      : info['horas_pico'],
+                'Secciones Pico'  : info['secciones_pico'],
+                'Promedio'        : round(info['promedio'], 2),
+                'Periodos Activos': info['periodos_activos'],
+            }
+            for i, top in enumerate(info['top_periodos'], start=1):
+                fila[f'Top {i}'] = f"{top['periodo']} ({top['horas_semanales']:g})"
+            resumen.append(fila)
+        df_resumen = pd.DataFrame(resumen)
+
+        num_periodos = len(next(iter(por_ambiente.values()))['curva_duracion'])
+        df_curva = pd.DataFrame({
+            'Posicion'   : range(1, num_periodos + 1),
+            '% Periodos' : [round(100 * i / num_periodos, 1) for i in range(1, num_periodos + 1)],
+            **{ambiente: info['curva_duracion'] for ambiente, info in por_ambiente.items()},
+        })
+
+        # Un solo to_excel por hoja: en actualizar() (if_sheet_exists='replace')
+        # un segundo to_excel reemplazaría la hoja y borraría la tabla de picos.
+        # La curva se escribe directamente en la hoja, dos filas más abajo.
+        df_resumen.to_excel(writer, sheet_name='Picos', index=False)
+        ws = writer.sheets['Picos']
+        fila_curva = len(df_resumen) + 4
+        for i, fila in enumerate(dataframe_to_rows(df_curva, index=False, header=True)):
+            for j, valor in enumerate(fila, start=1):
+                ws.cell(row=fila_curva + i, column=j, value=valor)
+
+        anchos = [max(a, b) for a, b in zip_longest(
+            anchos_columnas(df_resumen, 10, 40), anchos_columnas(df_curva, 10, 40), fillvalue=0
+        )]
+        aplicar_anchos(ws, anchos)
+        self.informar(f"    OK: Picos ({len(por_ambiente)} ambientes, {num_periodos} periodos)")
 
     # ------------------------------------------------------------------
     # Hojas de detalle por periodo
@@ -93,39 +186,44 @@ class GeneradorExcel:
 
     def _nombre_hoja(self, periodo):
         """Convierte '2027-01' → '2027-I', '2027-02' → '2027-II'."""
-        anio, ciclo = periodo.split('-')
-        return f"{anio}-{'I' if ciclo == '01' else 'II'}"
-
-    def crear_hojas_detalle_periodos(self, writer):
-        print("\n  Generando hojas de detalle por periodo...")
-
-        if 'detalle_cursos_por_periodo' not in self.datos:
-            print("  ADVERTENCIA: No hay detalle de cursos en el JSON. Ejecute el analisis completo.")
+        return etiqueta_hoja(clave_desde_etiqueta(periodo))
+
+    @staticmethod
+    def _huella(periodo_detalle):
+        """Hash estable del detalle de un periodo (decide si su hoja cambió)."""
+        texto = json.dumps(periodo_detalle, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+    def crear_hojas_detalle_periodos(self, writer, desde=None, hasta=None, huellas_previas=None):
+        """
+        Escribe una hoja por periodo. Con `desde`/`hasta` solo se recorre ese
+        rango; con `huellas_previas` se omiten las hojas existentes cuya
+        huella coincide con la del JSON.
+        """
+        self.informar("\n  Generando hojas de detalle por periodo...")
+
+        if not self.lector.tiene('detalle_cursos_por_periodo'):
+            self.informar("  ADVERTENCIA: No hay detalle de cursos en el JSON. Ejecute el analisis completo.")
             return
 
         COLS = ['Prog', 'Sem', 'Codigo', 'Curso', 'Tipo Ambiente',
                 'Estudiantes', 'Hrs/Sem', 'Secciones', 'Total Hrs']
 
-        for p in self.datos['detalle_cursos_por_periodo']:
+        self.hojas_periodo = 0
+        omitidas = 0
+        for p in self.lector.periodos('detalle_cursos_por_periodo', desde, hasta):
             periodo  = p['periodo']
-            cursos   = p['cursos']
             nombre   = self._nombre_hoja(periodo)
+            huella   = self._huella(p)
+
+            self.huellas[nombre] = huella
+            if (huellas_previas and huellas_previas.get(nombre) == huella
+                    and nombre in writer.book.sheetnames):
+                omitidas += 1
+                continue
 
-            filas = []
-            for c in cursos:
-                filas.append({
-                    'Prog'         : c['programa'],
-                    'Sem'          : c['semestre'],
-                    'Codigo'       : c['codigo_curso'],
-                    'Curso'        : c['curso'],
-                    'Tipo Ambiente': c['tipo_ambiente'],
-                    'Estudiantes'  : c['estudiantes'],
-                    'Hrs/Sem'      : c['horas_semanales'],
-                    'Secciones'    : c['secciones'],
-                    'Total Hrs'    : c['horas_totales'],
-                })
-
-            df = pd.DataFrame(filas, columns=COLS) if filas else pd.DataFrame(columns=COLS)
+            # Detalle por filas o por columnas (ver detalle_columnar)
+            df = tabla_cursos(p).rename(columns=dict(zip(CAMPOS_CURSO, COLS)))
 
             # Subtotales por tipo de ambiente
             subtotales = []
@@ -143,21 +241,18 @@ class GeneradorExcel:
 
             df_sub = pd.DataFrame(subtotales, columns=COLS)
             df_final = pd.concat([df, df_sub], ignore_index=True)
-            df_final.to_excel(writer, sheet_name=nombre, index=False)
+            escribir_hoja(writer, df_final, nombre, min_w=8, max_w=50)
+            self.hojas_periodo += 1
+            self.hojas_escritas.append(nombre)
 
-        total_hojas = len(self.datos['detalle_cursos_por_periodo'])
-        print(f"    OK: {total_hojas} hojas de periodo generadas")
+        self.informar(f"    OK: {self.hojas_periodo} hojas de periodo generadas")
+        if omitidas:
+            self.informar(f"    OK: {omitidas} hojas sin cambios (huella igual), omitidas")
 
     # ------------------------------------------------------------------
     # Aplicar formato post-escritura
     # ------------------------------------------------------------------
 
-    def _autofit(self, ws, min_w=8, max_w=50):
-        for col in ws.columns:
-            letter = get_column_letter(col[0].column)
-            max_len = max((len(str(c.value)) for c in col if c.value is not None), default=min_w)
-            ws.column_dimensions[letter].width = min(max(max_len + 2, min_w), max_w)
-
     def _formato_tabla_pivote(self, ws):
         fill_hdr  = PatternFill('solid', fgColor=COLOR_HEADER)
         fill_alt  = PatternFill('solid', fgColor=COLOR_ALT_ROW)
@@ -179,7 +274,34 @@ class GeneradorExcel:
                 cell.font      = font_body
                 cell.alignment = Alignment(horizontal='center' if cell.column == 1 else 'right')
 
-        self._autofit(ws, min_w=10, max_w=40)
+    def _formato_hoja_picos(self, ws):
+        fill_hdr  = PatternFill('solid', fgColor=COLOR_HEADER)
+        fill_alt  = PatternFill('solid', fgColor=COLOR_ALT_ROW)
+        font_hdr  = Font(bold=True, color='FFFFFF', size=10)
+        font_body = Font(size=10)
+        thin      = Side(style='thin', color='BFBFBF')
+        border    = Border(bottom=thin)
+
+        # Dos tablas: encabezados en la fila 1 (picos) y en la fila 'Posicion' (curvas)
+        i = 0
+        for row in ws.iter_rows():
+            if row[0].value in ('Ambiente', 'Posicion'):
+                i = 0
+                for cell in row:
+                    if cell.value is not None:
+                        cell.fill      = fill_hdr
+                        cell.font      = font_hdr
+                        cell.alignment = Alignment(horizontal='center', wrap_text=True)
+                        cell.border    = border
+                continue
+            if row[0].value is None:
+                continue
+            i += 1
+            fill = fill_alt if i % 2 == 0 else PatternFill()
+            for cell in row:
+                cell.fill      = fill
+                cell.font      = font_body
+                cell.alignment = Alignment(horizontal='left' if cell.column == 1 else 'right')
 
     def _formato_hoja_periodo(self, ws):
         fill_hdr = PatternFill('solid', fgColor=COLOR_HEADER)
@@ -214,19 +336,48 @@ class GeneradorExcel:
                 cell.font      = font
                 cell.alignment = Alignment(horizontal='center' if cell.column <= 2 else 'right')
 
-        self._autofit(ws, min_w=8, max_w=50)
-
-    def _aplicar_formato(self):
-        wb = load_workbook(self.output_path)
-
+    def _aplicar_formato(self, wb, hojas=None):
+        """
+        Da formato a las hojas indicadas (por defecto, a todas) sobre el libro
+        en memoria del writer, antes de guardarlo (un solo guardado).
+        """
         if 'Tabla Pivote' in wb.sheetnames:
             self._formato_tabla_pivote(wb['Tabla Pivote'])
+        if 'Picos' in wb.sheetnames:
+            self._formato_hoja_picos(wb['Picos'])
 
         for nombre in wb.sheetnames:
-            if nombre != 'Tabla Pivote':
+            if nombre not in HOJAS_RESUMEN and (hojas is None or nombre in hojas):
                 self._formato_hoja_periodo(wb[nombre])
 
-        wb.save(self.output_path)
+    # ------------------------------------------------------------------
+    # Huellas por hoja (propiedades personalizadas del libro)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _leer_huellas(wb):
+        return {
+            prop.name[len(PREFIJO_HUELLA):]: prop.value
+            for prop in wb.custom_doc_props.props
+            if prop.name.startswith(PREFIJO_HUELLA)
+        }
+
+    def _guardar_huellas(self, wb, huellas):
+        props = wb.custom_doc_props
+        props.props = [p for p in props.props if not p.name.startswith(PREFIJO_HUELLA)]
+        for nombre, huella in sorted(huellas.items()):
+            props.append(StringProperty(name=f"{PREFIJO_HUELLA}{nombre}", value=huella))
+
+    @staticmethod
+    def _ordenar_hojas(wb):
+        """Deja 'Tabla Pivote' y 'Picos' primero y las hojas de periodo en orden cronológico."""
+        def orden(ws):
+            try:
+                return (1, clave_desde_etiqueta(ws.title))
+            except ValueError:
+                return (0, HOJAS_RESUMEN.index(ws.title) if ws.title in HOJAS_RESUMEN else len(HOJAS_RESUMEN))
+        for destino, ws in enumerate(sorted(wb.worksheets, key=orden)):
+            wb.move_sheet(ws, destino - wb.index(ws))
 
     # ------------------------------------------------------------------
     # Punto de entrada
@@ -234,25 +385,88 @@ class GeneradorExcel:
 
     def generar(self):
         """Genera el archivo Excel."""
-        print(f"\nArchivo de salida: {self.output_path}")
+        self.informar(f"\nArchivo de salida: {self.output_path}")
 
         with pd.ExcelWriter(self.output_path, engine='openpyxl') as writer:
             self.crear_hoja_tabla_pivote(writer)
+            self.crear_hoja_picos(writer)
             self.crear_hojas_detalle_periodos(writer)
+            self._guardar_huellas(writer.book, self.huellas)
+            self._aplicar_formato(writer.book)
+
+        total_hojas = len(HOJAS_RESUMEN) + self.hojas_periodo
+        self.informar(f"\n  Total hojas generadas: {total_hojas}")
+        self.informar(f"\n{'=' * 80}")
+        self.informar("EXCEL GENERADO EXITOSAMENTE")
+        self.informar(f"{'=' * 80}")
+        self.informar(f"  Archivo: {self.output_path}")
+
+
+    def actualizar(self, desde=None, hasta=None):
+        """
+        Regenera solo las hojas de periodo entre `desde` y `hasta` (inclusive,
+        '2031-II' o '2031-02'), la Tabla Pivote y Picos, dentro del Excel existente.
+        Las hojas cuya huella no cambió se dejan intactas. Si el Excel aún
+        no existe, se genera completo.
+        """
+        if not Path(self.output_path).exists():
+            self.informar(f"\nNo existe {self.output_path}; se genera completo.")
+            return self.generar()
+
+        self.informar(f"\nActualizando: {self.output_path}")
+        self.informar(f"  Rango de periodos: {desde or 'inicio'} a {hasta or 'fin'}")
+
+        with pd.ExcelWriter(self.output_path, engine='openpyxl', mode='a',
+                            if_sheet_exists='replace') as writer:
+            huellas = self._leer_huellas(writer.book)
+
+            # Hojas del rango que ya no figuran en el JSON
+            clave_desde = clave_desde_etiqueta(desde) if desde else None
+            clave_hasta = clave_desde_etiqueta(hasta) if hasta else None
+            vigentes = {self._nombre_hoja(e) for e in self.lector.etiquetas_periodos('detalle_cursos_por_periodo')}
+            for ws in list(writer.book.worksheets):
+                try:
+                    clave = clave_desde_etiqueta(ws.title)
+                except ValueError:
+                    continue
+                en_rango = ((clave_desde is None or clave >= clave_desde) and
+                            (clave_hasta is None or clave <= clave_hasta))
+                if en_rango and ws.title not in vigentes:
+                    writer.book.remove(ws)
+                    huellas.pop(ws.title, None)
+
+            self.crear_hoja_tabla_pivote(writer)
+            self.crear_hoja_picos(writer)
+            self.crear_hojas_detalle_periodos(writer, desde, hasta, huellas_previas=huellas)
 
-        self._aplicar_formato()
+            huellas.update(self.huellas)
+            self._guardar_huellas(writer.book, huellas)
+            self._ordenar_hojas(writer.book)
+            self._aplicar_formato(writer.book, hojas=set(self.hojas_escritas))
 
-        total_hojas = 1 + len(self.datos.get('detalle_cursos_por_periodo', []))
-        print(f"\n  Total hojas generadas: {total_hojas}")
-        print(f"\n{'=' * 80}")
-        print("EXCEL GENERADO EXITOSAMENTE")
-        print(f"{'=' * 80}")
-        print(f"  Archivo: {self.output_path}")
+        self.informar(f"\n  Hojas de periodo regeneradas: {len(self.hojas_escritas)}")
+        for nombre in self.hojas_escritas:
+            self.informar(f"    - {nombre}")
+        self.informar(f"\n{'=' * 80}")
+        self.informar("EXCEL ACTUALIZADO EXITOSAMENTE")
+        self.informar(f"{'=' * 80}")
+        self.informar(f"  Archivo: {self.output_path}")
 
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) < 3:
-        print("Uso: python generador_excel.py <json_path> <output_path>")
-        sys.exit(1)
-    GeneradorExcel(sys.argv[1], sys.argv[2]).generar()
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Genera el Excel de consumo desde el JSON del analisis."
+    )
+    parser.add_argument('json_path')
+    parser.add_argument('output_path')
+    parser.add_argument('--desde', help="Primer periodo a regenerar (ej. 2031-II)")
+    parser.add_argument('--hasta', help="Ultimo periodo a regenerar (ej. 2032-I)")
+    args = parser.parse_args()
+
+    generador = GeneradorExcel(args.json_path, args.output_path)
+    if args.desde or args.hasta:
+        generador.actualizar(args.desde, args.hasta)
+    else:
+        generador.generar()
@@ -0,0 +1,168 @@
+"""
+Generador de Proyección por Cohortes
+
+Construye la proyección de matrícula por curso y periodo (la misma tabla que
+`Proyeccion_<PROGRAMA>.xlsx`) a partir de:
+
+  - ingresantes por ciclo,
+  - tasas de retención/progresión entre semestres,
+  - la distribución de cursos por SEMESTRE de la malla.
+
+Recurrencia (vectorizada sobre todos los periodos):
+
+    M[t, 1] = ingresantes[t]
+    M[t, s] = M[t-1, s-1] * retencion[s-1]        (s > 1)
+    M[0, s] = matricula_inicial[s]                 (cohortes ya en curso, s > 1)
+
+Configuración (sección "cohortes" del config.json, por programa):
+
+    "cohortes": {
+      "LLYA": {
+        "periodo_inicial": "2027-01",
+        "periodos": 20,
+        "ingresantes": {"I": 30, "II": 10},   # o un número, o una lista por periodo
+        "retencion": 0.9,                     # o una lista por semestre (s → s+1)
+        "matricula_inicial": {"2": 25, "3": 22}
+      }
+    }
+
+Si un programa tiene entrada en "cohortes", `AnalizadorHorasAula.cargar_datos`
+usa esta proyección en lugar del Excel.
+
+Uso (exportar la proyección al formato de los Excel de entrada):
+    python scripts/generador_proyeccion.py --config config.json --programa LLYA \\
+           --salida datos/Proyeccion_LLYA_cohortes.xlsx
+"""
+
+import numpy as np
+import pandas as pd
+
+from periodos import clave_desde_etiqueta, anio_de_clave, ciclo_de_clave
+
+
+def _por_periodo(valor, claves, nombre):
+    """Expande ingresantes (número, {'I','II'} o lista) a un arreglo por periodo."""
+    if isinstance(valor, (int, float)):
+        return np.full(len(claves), float(valor))
+    if isinstance(valor, dict):
+        desconocidos = set(valor) - {'I', 'II'}
+        if desconocidos:
+            raise ValueError(f"'{nombre}': ciclos no validos {sorted(desconocidos)} (use 'I' y 'II')")
+        por_ciclo = np.array([valor.get('I', 0), valor.get('II', 0)], dtype=float)
+        return por_ciclo[ciclo_de_clave(claves) - 1]
+    if isinstance(valor, list):
+        if len(valor) != len(claves):
+            raise ValueError(f"'{nombre}': se esperaban {len(claves)} valores, hay {len(valor)}")
+        return np.asarray(valor, dtype=float)
+    raise ValueError(f"'{nombre}' debe ser un numero, un dict por ciclo o una lista por periodo")
+
+
+def _tasas(valor, num_semestres):
+    """Retención s → s+1 como arreglo de largo num_semestres - 1."""
+    if isinstance(valor, (int, float)):
+        tasas = np.full(num_semestres - 1, float(valor))
+    else:
+        tasas = np.asarray(valor, dtype=float)
+        if len(tasas) != num_semestres - 1:
+            raise ValueError(
+                f"'retencion': se esperaban {num_semestres - 1} tasas (una por paso de semestre), hay {len(tasas)}"
+            )
+    if ((tasas < 0) | (tasas > 1)).any():
+        raise ValueError("'retencion': las tasas deben estar entre 0 y 1")
+    return tasas
+
+
+def matricula_por_semestre(ingresantes, retencion, inicial=None):
+    """
+    Matriz (periodos × semestres) de estudiantes activos. Cada paso de
+    semestre es una operación sobre todos los periodos a la vez.
+    """
+    num_periodos, num_semestres = len(ingresantes), len(retencion) + 1
+    matricula = np.zeros((num_periodos, num_semestres))
+    matricula[:, 0] = ingresantes
+    if inicial is not None:
+        matricula[0, 1:] = inicial[1:]
+
+    for s in range(1, num_semestres):
+        matricula[1:, s] = matricula[:-1, s - 1] * retencion[s - 1]
+    return matricula
+
+
+def generar_proyeccion(malla, cohortes, programa=None):
+    """
+    Proyección con las columnas de ESQUEMA_PROYECCION (más PROGRAMA si se
+    indica): una fila por periodo y curso de la malla.
+    """
+    for clave in ('periodo_inicial', 'periodos', 'ingresantes', 'retencion'):
+        if clave not in cohortes:
+            raise ValueError(f"Configuracion de cohortes incompleta: falta '{clave}'")
+
+    primera = clave_desde_etiqueta(cohortes['periodo_inicial'])
+    claves  = np.arange(primera, primera + int(cohortes['periodos']))
+
+    num_semestres = int(malla['SEMESTRE'].max())
+    ingresantes   = _por_periodo(cohortes['ingresantes'], claves, 'ingresantes')
+    retencion     = _tasas(cohortes['retencion'], num_semestres)
+
+    inicial = np.zeros(num_semestres)
+    for semestre, n in cohortes.get('matricula_inicial', {}).items():
+        if int(semestre) == 1:
+            # El semestre 1 de cada periodo, incluido el primero, son los ingresantes
+            raise ValueError("'matricula_inicial': el semestre 1 no se siembra; "
+                             "los alumnos de primer semestre se indican en 'ingresantes'")
+        if not 2 <= int(semestre) <= num_semestres:
+            raise ValueError(f"'matricula_inicial': semestre {semestre} fuera de la malla")
+        inicial[int(semestre) - 1] = n
+
+    matricula = np.rint(matricula_por_semestre(ingresantes, retencion, inicial)).astype('int64')
+
+    # Cruce periodos × cursos: cada curso toma la matrícula de su semestre
+    cursos = malla[['CURSO', 'SEMESTRE', 'CODIGO_CURSO']].drop_duplicates('CODIGO_CURSO')
+    fila_periodo = np.repeat(np.arange(len(claves)), len(cursos))
+    semestres    = np.tile(cursos['SEMESTRE'].to_numpy(), len(claves))
+
+    fechas = pd.to_datetime(pd.DataFrame({
+        'year': anio_de_clave(claves), 'month': ciclo_de_clave(claves), 'day': 1,
+    }))
+
+    proyeccion = pd.DataFrame({
+        'PERIODO'           : fechas.to_numpy()[fila_periodo],
+        'CURSO'             : np.tile(cursos['CURSO'].to_numpy(), len(claves)),
+        'SEMESTRE'          : semestres,
+        'CODIGO_CURSO'      : np.tile(cursos['CODIGO_CURSO'].to_numpy(), len(claves)),
+        'TOTAL_MATRICULADOS': matricula[fila_periodo, semestres - 1],
+    })
+    if programa is not None:
+        proyeccion.insert(1, 'PROGRAMA', programa)
+    return proyeccion
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+    from pathlib import Path
+
+    from analizador_horas_aula import leer_excel_validado, ESQUEMA_MALLA
+    from analizador_campus import nombres_programa
+
+    parser = argparse.ArgumentParser(description="Genera la proyeccion de matricula por cohortes.")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--programa', required=True)
+    parser.add_argument('--salida', required=True, help="Excel de salida (formato Proyeccion_*.xlsx)")
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    cohortes = config.get('cohortes', {}).get(args.programa)
+    if cohortes is None:
+        print(f"ERROR: '{args.config}' no tiene la seccion cohortes.{args.programa}")
+        sys.exit(1)
+
+    malla = leer_excel_validado(config['archivos'][args.programa]['malla'], ESQUEMA_MALLA)
+    proyeccion = generar_proyeccion(malla, cohortes, nombres_programa(config)[args.programa])
+
+    Path(args.salida).parent.mkdir(parents=True, exist_ok=True)
+    proyeccion.to_excel(args.salida, index=False)
+    print(f"Proyeccion {args.programa}: {len(proyeccion)} registros -> {args.salida}")
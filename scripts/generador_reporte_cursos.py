@@ -7,7 +7,9 @@ y cursos propios de cada programa.
 
 import pandas as pd
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+
+from avance import Avance
+from utilidades_excel import escribir_hoja
 
 
 # Colores de encabezado por hoja
@@ -30,7 +32,7 @@ class GeneradorReporteCursos:
     No requiere que se hayan procesado los programas ni generado resúmenes.
     """
 
-    def __init__(self, analizador, output_path):
+    def __init__(self, analizador, output_path, silencioso=False, progreso=None):
         """
         Inicializa el generador.
 
@@ -40,13 +42,18 @@ class GeneradorReporteCursos:
             Instancia con datos y equivalencias ya cargados.
         output_path : str
             Ruta de salida del archivo Excel.
+        silencioso : bool
+            Sin mensajes en consola (siguen yendo a logging y a `progreso`).
+        progreso : callable, opcional
+            Recibe cada mensaje de avance.
         """
+        self.informar     = Avance('reporte_cursos', silencioso, progreso)
         self.analizador   = analizador
         self.output_path  = output_path
 
-        print("\n" + "=" * 80)
-        print("GENERADOR DE REPORTE DE CURSOS")
-        print("=" * 80)
+        self.informar("\n" + "=" * 80)
+        self.informar("GENERADOR DE REPORTE DE CURSOS")
+        self.informar("=" * 80)
 
     # ------------------------------------------------------------------
     # Helpers privados para obtener datos
@@ -159,23 +166,12 @@ class GeneradorReporteCursos:
             cell.border    = border
             cell.alignment = Alignment(horizontal='center', wrap_text=True)
 
-    @staticmethod
-    def _ajustar_columnas(ws, min_width=10, max_width=50):
-        """Ajusta el ancho de columnas al contenido."""
-        for col in ws.columns:
-            max_len = 0
-            col_letter = get_column_letter(col[0].column)
-            for cell in col:
-                if cell.value:
-                    max_len = max(max_len, len(str(cell.value)))
-            ws.column_dimensions[col_letter].width = min(max(max_len + 2, min_width), max_width)
-
     # ------------------------------------------------------------------
     # Creación de hojas
     # ------------------------------------------------------------------
 
     def _crear_hoja_resumen(self, writer):
-        print("  Generando hoja: Resumen...")
+        self.informar("  Generando hoja: Resumen...")
         mallas = self.analizador.mallas
         excluidos = self.analizador.cursos_a_eliminar
         compartidos = self.analizador.cursos_compartidos
@@ -222,11 +218,11 @@ class GeneradorReporteCursos:
         ]
 
         df = pd.DataFrame(filas, columns=['Concepto', 'Valor'])
-        df.to_excel(writer, sheet_name='Resumen', index=False)
-        print("    OK: Resumen")
+        escribir_hoja(writer, df, 'Resumen', min_w=10)
+        self.informar("    OK: Resumen")
 
     def _crear_hoja_excluidos(self, writer):
-        print("  Generando hoja: Cursos Excluidos...")
+        self.informar("  Generando hoja: Cursos Excluidos...")
         filas = []
         for prog in ['LLYA', 'MYC']:
             filas.extend(self._filas_excluidos(prog))
@@ -236,11 +232,11 @@ class GeneradorReporteCursos:
         else:
             df = pd.DataFrame(columns=['Programa', 'Código', 'Curso', 'Semestre', 'Motivo'])
 
-        df.to_excel(writer, sheet_name='Cursos Excluidos', index=False)
-        print(f"    OK: {len(filas)} cursos excluidos")
+        escribir_hoja(writer, df, 'Cursos Excluidos', min_w=10)
+        self.informar(f"    OK: {len(filas)} cursos excluidos")
 
     def _crear_hoja_compartidos(self, writer):
-        print("  Generando hoja: Cursos Compartidos (Equivalencias LLYA-MYC)...")
+        self.informar("  Generando hoja: Cursos Compartidos (Equivalencias LLYA-MYC)...")
         filas = self._filas_compartidos()
 
         if filas:
@@ -252,12 +248,12 @@ class GeneradorReporteCursos:
                 'Tipo Ambiente', 'Horas Semanales', 'Nota',
             ])
 
-        df.to_excel(writer, sheet_name='Cursos Compartidos', index=False)
-        print(f"    OK: {len(self.analizador.cursos_compartidos)} cursos compartidos")
+        escribir_hoja(writer, df, 'Cursos Compartidos', min_w=10)
+        self.informar(f"    OK: {len(self.analizador.cursos_compartidos)} cursos compartidos")
 
     def _crear_hoja_propios(self, writer, programa):
         nombre_hoja = f'Cursos {programa}'
-        print(f"  Generando hoja: {nombre_hoja}...")
+        self.informar(f"  Generando hoja: {nombre_hoja}...")
         filas = self._filas_propios(programa)
 
         if filas:
@@ -267,8 +263,8 @@ class GeneradorReporteCursos:
                 'Código', 'Curso', 'Semestre', 'Tipo Ambiente', 'Horas Semanales',
             ])
 
-        df.to_excel(writer, sheet_name=nombre_hoja, index=False)
-        print(f"    OK: {len(filas)} filas (cursos×ambientes)")
+        escribir_hoja(writer, df, nombre_hoja, min_w=10)
+        self.informar(f"    OK: {len(filas)} filas (cursos×ambientes)")
 
     # ------------------------------------------------------------------
     # Punto de entrada público
@@ -276,7 +272,7 @@ class GeneradorReporteCursos:
 
     def generar(self):
         """Genera el archivo Excel con el reporte de cursos."""
-        print(f"\nGenerando reporte de cursos en: {self.output_path}")
+        self.informar(f"\nGenerando reporte de cursos en: {self.output_path}")
 
         with pd.ExcelWriter(self.output_path, engine='openpyxl') as writer:
             self._crear_hoja_resumen(writer)
@@ -285,7 +281,7 @@ class GeneradorReporteCursos:
             self._crear_hoja_propios(writer, 'LLYA')
             self._crear_hoja_propios(writer, 'MYC')
 
-        # Aplicar formato post-escritura
+        # Aplicar estilo de encabezados post-escritura (anchos ya fijados al escribir)
         from openpyxl import load_workbook
         wb = load_workbook(self.output_path)
 
@@ -300,18 +296,17 @@ class GeneradorReporteCursos:
             if nombre_hoja in wb.sheetnames:
                 ws = wb[nombre_hoja]
                 self._aplicar_estilo_encabezado(ws, color)
-                self._ajustar_columnas(ws)
 
         wb.save(self.output_path)
 
-        print("\n" + "=" * 80)
-        print("REPORTE DE CURSOS GENERADO EXITOSAMENTE")
-        print("=" * 80)
-        print(f"\nArchivo: {self.output_path}")
-        print("\nHojas generadas:")
-        print("  1. Resumen             — conteo y reglas aplicadas")
-        print("  2. Cursos Excluidos    — cursos que van a Educacion Inicial")
-        print("  3. Cursos Compartidos  — equivalencias LLYA<->MYC y sus fases")
-        print("  4. Cursos LLYA         — cursos propios del programa LLYA")
-        print("  5. Cursos MYC          — cursos propios del programa MYC")
-        print("=" * 80)
+        self.informar("\n" + "=" * 80)
+        self.informar("REPORTE DE CURSOS GENERADO EXITOSAMENTE")
+        self.informar("=" * 80)
+        self.informar(f"\nArchivo: {self.output_path}")
+        self.informar("\nHojas generadas:")
+        self.informar("  1. Resumen             — conteo y reglas aplicadas")
+        self.informar("  2. Cursos Excluidos    — cursos que van a Educacion Inicial")
+        self.informar("  3. Cursos Compartidos  — equivalencias LLYA<->MYC y sus fases")
+        self.informar("  4. Cursos LLYA         — cursos propios del programa LLYA")
+        self.informar("  5. Cursos MYC          — cursos propios del programa MYC")
+        self.informar("=" * 80)
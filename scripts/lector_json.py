@@ -0,0 +1,277 @@
+"""
+Lectura perezosa del JSON de consumo.
+
+El analizador escribe el JSON con `escribir_json_indexado`, que produce
+exactamente el mismo texto que `json.dump(..., indent=2, ensure_ascii=False)`
+y además un archivo índice `<json>.idx` con la posición en bytes de cada
+sección de primer nivel y de cada periodo dentro de las secciones que son
+listas de periodos (p. ej. `detalle_cursos_por_periodo`).
+
+`LectorConsumoJSON` usa ese índice para decodificar solo las secciones y
+periodos que se piden. Si el índice no existe o no corresponde al JSON
+(archivo regenerado por otro medio), se recurre a un `json.load` completo.
+
+`LectorConsumoMemoria` ofrece la misma interfaz sobre el dict del resultado
+cuando el análisis se acaba de ejecutar en el mismo proceso.
+
+`SeccionPeriodos` permite escribir una sección de periodos a medida que se
+generan (modo por ventanas), sin tener la lista completa en memoria.
+
+Las secciones de periodos indicadas en `compactas` escriben cada periodo en
+una sola línea, sin sangría (formato por columnas del detalle de cursos,
+donde la sangría ocuparía más que los datos). El resto del texto no cambia.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from periodos import clave_desde_etiqueta
+
+
+INDENT = 2
+
+
+def _ruta_indice(ruta_json):
+    return f"{ruta_json}.idx"
+
+
+def _texto(valor, nivel, compacto=False):
+    """Serializa `valor` como lo haría json.dump con indent=2 a ese nivel."""
+    if compacto:
+        return json.dumps(valor, ensure_ascii=False, separators=(',', ':'))
+    texto = json.dumps(valor, indent=INDENT, ensure_ascii=False)
+    return texto.replace('\n', '\n' + ' ' * (INDENT * nivel))
+
+
+def _es_lista_periodos(valor):
+    return (
+        isinstance(valor, list) and len(valor) > 0
+        and all(isinstance(item, dict) and 'periodo' in item for item in valor)
+    )
+
+
+class SeccionPeriodos:
+    """
+    Lista de periodos que se va escribiendo en un archivo temporal, un
+    elemento a la vez. Como valor de `escribir_json_indexado` se copia en su
+    lugar con el mismo texto que tendría la lista completa.
+    """
+
+    def __init__(self, compacta=False):
+        self.compacta  = compacta
+        self._archivo  = tempfile.TemporaryFile()
+        self.posiciones = {}   # etiqueta → [inicio, fin] dentro del temporal
+
+    def __len__(self):
+        return len(self.posiciones)
+
+    def agregar(self, item):
+        separador = (',' if self.posiciones else '') + '\n' + ' ' * (INDENT * 2)
+        self._archivo.write(separador.encode('utf-8'))
+        inicio = self._archivo.tell()
+        self._archivo.write(_texto(item, 2, self.compacta).encode('utf-8'))
+        self.posiciones[item['periodo']] = [inicio, self._archivo.tell()]
+
+    def volcar(self, destino):
+        """Copia el contenido escrito al archivo binario `destino`."""
+        self._archivo.seek(0)
+        shutil.copyfileobj(self._archivo, destino)
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+def escribir_json_indexado(datos, ruta_json, compactas=()):
+    """
+    Escribe `datos` (dict) en `ruta_json` y su índice de posiciones.
+    El texto del JSON es idéntico al de json.dump(indent=2, ensure_ascii=False),
+    salvo los periodos de las secciones en `compactas` (una línea cada uno).
+    Los valores `SeccionPeriodos` se copian desde su archivo temporal.
+    """
+    secciones = {}
+    periodos  = {}
+    posicion  = 0
+
+    with open(ruta_json, 'wb') as f:
+        def escribir(texto):
+            nonlocal posicion
+            crudo = texto.encode('utf-8')
+            f.write(crudo)
+            posicion += len(crudo)
+
+        if not datos:
+            escribir('{}')
+        else:
+            escribir('{')
+            for i, (clave, valor) in enumerate(datos.items()):
+                escribir((',' if i else '') + '\n' + ' ' * INDENT)
+                escribir(json.dumps(clave, ensure_ascii=False) + ': ')
+
+                inicio = posicion
+                if isinstance(valor, SeccionPeriodos):
+                    if len(valor) == 0:
+                        escribir('[]')
+                    else:
+                        escribir('[')
+                        base = posicion
+                        valor.volcar(f)
+                        posicion = f.tell()
+                        periodos[clave] = {etiqueta: [base + i, base + j]
+                                           for etiqueta, (i, j) in valor.posiciones.items()}
+                        escribir('\n' + ' ' * INDENT + ']')
+                elif _es_lista_periodos(valor):
+                    periodos[clave] = {}
+                    escribir('[')
+                    for j, item in enumerate(valor):
+                        escribir((',' if j else '') + '\n' + ' ' * (INDENT * 2))
+                        inicio_item = posicion
+                        escribir(_texto(item, 2, clave in compactas))
+                        periodos[clave][item['periodo']] = [inicio_item, posicion]
+                    escribir('\n' + ' ' * INDENT + ']')
+                else:
+                    escribir(_texto(valor, 1))
+                secciones[clave] = [inicio, posicion]
+            escribir('\n}')
+
+    estado = os.stat(ruta_json)
+    indice = {
+        'tamano'   : estado.st_size,
+        'mtime_ns' : estado.st_mtime_ns,
+        'secciones': secciones,
+        'periodos' : periodos,
+    }
+    with open(_ruta_indice(ruta_json), 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False)
+
+
+def _filtro_rango(desde, hasta):
+    """Función etiqueta → bool para el rango [desde, hasta] (extremos opcionales)."""
+    clave_desde = clave_desde_etiqueta(desde) if desde is not None else None
+    clave_hasta = clave_desde_etiqueta(hasta) if hasta is not None else None
+
+    def en_rango(etiqueta):
+        clave = clave_desde_etiqueta(etiqueta)
+        return ((clave_desde is None or clave >= clave_desde) and
+                (clave_hasta is None or clave <= clave_hasta))
+
+    return en_rango
+
+
+class LectorConsumoJSON:
+    """
+    Acceso perezoso a las secciones del JSON de consumo.
+
+    Solo decodifica lo que se pide: `seccion()` lee una sección completa y
+    `periodos()` itera los periodos de una sección uno a uno (opcionalmente
+    filtrando un rango), sin mantener el resto del archivo en memoria.
+    """
+
+    def __init__(self, json_path):
+        self.json_path = json_path
+        self._indice   = self._cargar_indice()
+        self._completo = None
+
+    def _cargar_indice(self):
+        ruta = _ruta_indice(self.json_path)
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                indice = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        estado = os.stat(self.json_path)
+        if indice.get('tamano') != estado.st_size or indice.get('mtime_ns') != estado.st_mtime_ns:
+            return None   # El JSON cambió después de indexarse
+        return indice
+
+    @property
+    def indexado(self):
+        return self._indice is not None
+
+    def _datos_completos(self):
+        if self._completo is None:
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                self._completo = json.load(f)
+        return self._completo
+
+    def _decodificar(self, f, inicio, fin):
+        f.seek(inicio)
+        return json.loads(f.read(fin - inicio).decode('utf-8'))
+
+    def secciones(self):
+        """Nombres de las secciones de primer nivel."""
+        if self.indexado:
+            return list(self._indice['secciones'])
+        return list(self._datos_completos())
+
+    def tiene(self, nombre):
+        return nombre in self.secciones()
+
+    def seccion(self, nombre, defecto=None):
+        """Decodifica y retorna una sección completa (o `defecto` si no existe)."""
+        if not self.indexado:
+            return self._datos_completos().get(nombre, defecto)
+
+        rango = self._indice['secciones'].get(nombre)
+        if rango is None:
+            return defecto
+        with open(self.json_path, 'rb') as f:
+            return self._decodificar(f, *rango)
+
+    def etiquetas_periodos(self, nombre):
+        """Etiquetas de periodo ('2027-01', ...) presentes en la sección."""
+        if self.indexado and nombre in self._indice['periodos']:
+            return list(self._indice['periodos'][nombre])
+        return [p['periodo'] for p in self.seccion(nombre, [])]
+
+    def periodos(self, nombre, desde=None, hasta=None):
+        """
+        Itera los elementos de una sección de periodos, uno a la vez.
+        `desde` / `hasta` (inclusive) aceptan '2027-01' o '2027-I'.
+        """
+        en_rango = _filtro_rango(desde, hasta)
+
+        if not (self.indexado and nombre in self._indice['periodos']):
+            for item in self.seccion(nombre, []):
+                if en_rango(item['periodo']):
+                    yield item
+            return
+
+        with open(self.json_path, 'rb') as f:
+            for etiqueta, rango in self._indice['periodos'][nombre].items():
+                if en_rango(etiqueta):
+                    yield self._decodificar(f, *rango)
+
+
+class LectorConsumoMemoria:
+    """
+    Misma interfaz que LectorConsumoJSON sobre el resultado ya en memoria
+    (el dict que retorna AnalizadorHorasAula.ejecutar), sin leer el archivo.
+    """
+
+    indexado = True
+
+    def __init__(self, datos):
+        self.datos = datos
+
+    def secciones(self):
+        return list(self.datos)
+
+    def tiene(self, nombre):
+        return nombre in self.datos
+
+    def seccion(self, nombre, defecto=None):
+        return self.datos.get(nombre, defecto)
+
+    def etiquetas_periodos(self, nombre):
+        return [p['periodo'] for p in self.datos.get(nombre, [])]
+
+    def periodos(self, nombre, desde=None, hasta=None):
+        en_rango = _filtro_rango(desde, hasta)
+        for item in self.datos.get(nombre, []):
+            if en_rango(item['periodo']):
+                yield item
@@ -0,0 +1,102 @@
+"""
+Medición del tiempo de importación (arranque) de main.py y de cada opción.
+
+Ejecuta cada caso en un proceso nuevo con `python -X importtime`, suma el
+tiempo acumulado de los módulos de primer nivel y descuenta el arranque del
+intérprete. Se toma el mínimo de varias repeticiones para reducir ruido.
+
+Uso (desde la raíz del proyecto):
+    python scripts/medir_arranque.py [--repeticiones 5] [--salida salida/logs/arranque.json]
+
+Termina con código 1 si algún caso supera su presupuesto.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# caso → (sentencia, presupuesto en ms)
+CASOS = {
+    'menu (import main)' : ("import main", 100),
+    'opcion 3 (Excel)'   : ("import main; from scripts.generador_excel import GeneradorExcel", 1000),
+    'opcion 1/2 (analisis)': (
+        "import main; from scripts.analizador_horas_aula import AnalizadorHorasAula; "
+        "from scripts.generador_excel import GeneradorExcel; "
+        "from scripts.generador_reporte_cursos import GeneradorReporteCursos",
+        1500,
+    ),
+}
+
+
+def tiempo_importacion(sentencia):
+    """Microsegundos acumulados de los módulos de primer nivel importados."""
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', sentencia],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    total = 0
+    modulos = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea.split('|')
+        if nombre.startswith('  '):        # submódulo de otro import
+            continue
+        total += int(acumulado)
+        modulos[nombre.strip()] = int(acumulado)
+    return total, modulos
+
+
+def medir(repeticiones=5):
+    """Retorna {caso: {'ms', 'presupuesto_ms', 'mayores'}} (mínimo de las repeticiones)."""
+    arranque = [tiempo_importacion('pass') for _ in range(repeticiones)]
+    base = min(m[0] for m in arranque)
+    del_interprete = set(arranque[0][1])
+
+    resultados = {}
+    for caso, (sentencia, presupuesto) in CASOS.items():
+        muestras = [tiempo_importacion(sentencia) for _ in range(repeticiones)]
+        total, modulos = min(muestras, key=lambda m: m[0])
+        propios = {n: us for n, us in modulos.items() if n not in del_interprete}
+        mayores = sorted(propios.items(), key=lambda m: m[1], reverse=True)[:5]
+        resultados[caso] = {
+            'ms'            : round(max(total - base, 0) / 1000, 1),
+            'presupuesto_ms': presupuesto,
+            'mayores'       : {nombre: round(us / 1000, 1) for nombre, us in mayores},
+        }
+    return resultados
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importacion de main.py.")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--salida', help="JSON donde guardar la medicion")
+    args = parser.parse_args()
+
+    resultados = medir(args.repeticiones)
+
+    print("=" * 80)
+    print("TIEMPO DE ARRANQUE (python -X importtime)")
+    print("=" * 80)
+    excedidos = []
+    for caso, r in resultados.items():
+        estado = 'OK' if r['ms'] <= r['presupuesto_ms'] else 'EXCEDIDO'
+        if estado != 'OK':
+            excedidos.append(caso)
+        print(f"  {caso:<24} {r['ms']:>8.1f} ms  (presupuesto {r['presupuesto_ms']} ms)  {estado}")
+        for nombre, ms in r['mayores'].items():
+            print(f"      {nombre:<40} {ms:>8.1f} ms")
+
+    if args.salida:
+        Path(args.salida).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\nMedicion guardada en: {args.salida}")
+
+    sys.exit(1 if excedidos else 0)
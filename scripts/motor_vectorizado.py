@@ -0,0 +1,96 @@
+"""
+Motor vectorizado del análisis de horas-aula.
+
+Subclase de AnalizadorHorasAula que reemplaza los dos pasos fila a fila por
+operaciones sobre columnas completas:
+
+  - secciones_por_fila: `calcular_secciones_vectorizado` en lugar de
+    DataFrame.apply por fila.
+  - procesar_cursos_compartidos: por cada curso compartido, las tres fases
+    (prematuro / compartido / solo MYC) se resuelven para todos los periodos
+    a la vez con máscaras, sin recorrer periodo por periodo.
+
+Debe producir exactamente los mismos resultados que la implementación de
+referencia; `verificador_motores.py` lo comprueba.
+"""
+
+import pandas as pd
+
+from analizador_horas_aula import AnalizadorHorasAula, calcular_secciones_vectorizado
+
+
+class MotorVectorizado(AnalizadorHorasAula):
+    """
+    AnalizadorHorasAula con los pasos de secciones y cursos compartidos vectorizados.
+    """
+
+    def secciones_por_fila(self, datos):
+        secciones = calcular_secciones_vectorizado(
+            datos['TOTAL_MATRICULADOS'], datos['TIPO_AMBIENTE'], self.parametros
+        )
+        secciones[datos['TIPO_AMBIENTE'].isna().to_numpy()] = 0
+        return pd.Series(secciones, index=datos.index)
+
+    def procesar_cursos_compartidos(self):
+        self.informar("\nProcesando cursos compartidos...")
+
+        if len(self.cursos_compartidos) == 0:
+            self.informar("  INFO: No hay cursos compartidos para procesar")
+            return
+
+        # Los cursos se procesan en orden: cada uno ve los cambios de los anteriores
+        for curso_comp in self.cursos_compartidos:
+            llya, myc = self.resultados['LLYA'], self.resultados['MYC']
+            en_llya = llya['CODIGO_CURSO'] == curso_comp['codigo_llya']
+            en_myc  = myc['CODIGO_CURSO']  == curso_comp['codigo_myc']
+
+            if not en_llya.any() or not en_myc.any():
+                self.informar(f"  ADVERTENCIA: Curso '{curso_comp['nombre']}' no tiene datos en ambos programas")
+                continue
+
+            grupos_llya = llya.loc[en_llya].groupby('CLAVE_PERIODO', sort=True)['TOTAL_MATRICULADOS']
+            grupos_myc  = myc.loc[en_myc].groupby('CLAVE_PERIODO', sort=True)['TOTAL_MATRICULADOS']
+
+            periodos = grupos_llya.sum().index.union(grupos_myc.sum().index)
+            llya_activo = (grupos_llya.sum() > 0).reindex(periodos, fill_value=False)
+            myc_activo  = (grupos_myc.sum() > 0).reindex(periodos, fill_value=False)
+
+            compartidos = periodos[(llya_activo & myc_activo).to_numpy()]
+            prematuros  = periodos[(llya_activo & ~myc_activo).to_numpy()]
+            solo_myc    = periodos[(~llya_activo & myc_activo).to_numpy()]
+
+            # FASE 2: filas de LLYA con los estudiantes de ambos programas
+            est_total = grupos_llya.first()[compartidos] + grupos_myc.first()[compartidos]
+            filas = en_llya & llya['CLAVE_PERIODO'].isin(compartidos)
+            if filas.any():
+                llya = llya.copy()
+                estudiantes = llya.loc[filas, 'CLAVE_PERIODO'].map(est_total)
+                secciones = calcular_secciones_vectorizado(
+                    estudiantes, llya.loc[filas, 'TIPO_AMBIENTE'], self.parametros
+                )
+                llya.loc[filas, 'TOTAL_MATRICULADOS'] = estudiantes
+                llya.loc[filas, 'SECCIONES']          = secciones
+                llya.loc[filas, 'HORAS_TOTALES']      = llya.loc[filas, 'HORAS_SEMANALES'] * secciones
+
+            # FASE 2: se quitan las filas de MYC fusionadas;
+            # FASE 1: se quitan las filas de MYC con 0 alumnos
+            quitar_myc = en_myc & (
+                myc['CLAVE_PERIODO'].isin(compartidos) |
+                (myc['CLAVE_PERIODO'].isin(prematuros) & (myc['TOTAL_MATRICULADOS'] == 0))
+            )
+            # FASE 3: se quitan las filas de LLYA con 0 alumnos
+            quitar_llya = en_llya & llya['CLAVE_PERIODO'].isin(solo_myc) & (llya['TOTAL_MATRICULADOS'] == 0)
+
+            self.resultados['LLYA'] = llya[~quitar_llya] if quitar_llya.any() else llya
+            self.resultados['MYC']  = myc[~quitar_myc]
+
+            resumen = f"  {curso_comp['nombre']}:"
+            if len(prematuros):
+                resumen += f" {len(prematuros)} periodos prematuros (solo LLYA),"
+            if len(compartidos):
+                resumen += f" {len(compartidos)} periodos compartidos (fusionados),"
+            if len(solo_myc):
+                resumen += f" {len(solo_myc)} periodos solo MYC,"
+            self.informar(resumen.rstrip(','))
+
+        self.informar(f"  {len(self.cursos_compartidos)} cursos compartidos procesados\n")
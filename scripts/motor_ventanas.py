@@ -0,0 +1,314 @@
+"""
+Motor por ventanas de periodos (proyecciones de horizonte largo).
+
+El análisis de referencia une la proyección completa con la malla y mantiene
+todos los resultados y todo el JSON en memoria hasta el final. Este motor
+recorre la proyección por ventanas de N periodos consecutivos y pasa cada
+ventana por la misma cadena:
+
+    proyección de la ventana → unión con la malla y secciones
+    → cursos compartidos → resúmenes y detalle de la ventana → disco
+
+Cada paso del cálculo es independiente entre periodos, de modo que el
+resultado es el mismo que el de la referencia:
+
+  - consumo_por_periodo, detalle_ambientes_especificos y
+    detalle_cursos_por_periodo se generan por ventana con los mismos métodos
+    y se escriben a archivos temporales (`SeccionPeriodos`);
+  - consumo_por_semestre_academico y consumo_por_año se arman al final a
+    partir de agregados por (semestre, periodo, categoría de ambiente), unas
+    pocas filas por periodo;
+  - picos_por_ambiente se calcula al final sobre las horas por ambiente de
+    cada periodo (unos pocos números por periodo).
+
+La memoria de trabajo queda acotada por el tamaño de la ventana; lo único que
+crece con el horizonte son las tablas de entrada y los agregados por periodo.
+
+Uso:
+    python scripts/motor_ventanas.py --config config.json --ventana 4
+"""
+
+import numpy as np
+import pandas as pd
+
+from analitica_picos import analizar_picos
+from analizador_horas_aula import categoria_ambiente
+from lector_json import SeccionPeriodos, escribir_json_indexado
+from motor_vectorizado import MotorVectorizado
+from periodos import claves_desde_fechas, anio_de_clave, ciclo_de_clave, etiqueta_periodo
+
+
+CATEGORIAS = ['aula', 'laboratorio', 'taller', 'virtual']
+
+SECCIONES_PERIODOS = ['consumo_por_periodo', 'detalle_ambientes_especificos', 'detalle_cursos_por_periodo']
+
+
+def ventanas_proyeccion(proyecciones, periodos_por_ventana):
+    """
+    Itera (claves, {programa: proyección de la ventana}) en orden de periodo.
+    Cada ventana conserva el orden original de las filas de cada programa.
+    """
+    posiciones = {}
+    for programa, proyeccion in proyecciones.items():
+        claves = claves_desde_fechas(proyeccion['PERIODO'])
+        posiciones[programa] = proyeccion.groupby(claves.to_numpy(), sort=True).indices
+
+    todas = sorted(set().union(*[set(p) for p in posiciones.values()]))
+    for inicio in range(0, len(todas), periodos_por_ventana):
+        claves = todas[inicio:inicio + periodos_por_ventana]
+        ventana = {}
+        for programa, proyeccion in proyecciones.items():
+            filas = [posiciones[programa][c] for c in claves if c in posiciones[programa]]
+            filas = np.sort(np.concatenate(filas)) if filas else np.array([], dtype='int64')
+            ventana[programa] = proyeccion.iloc[filas]
+        yield claves, ventana
+
+
+class MotorVentanas(MotorVectorizado):
+    """
+    Análisis completo procesando la proyección por ventanas de periodos.
+    """
+
+    def __init__(self, config_path='config.json', datos=None, periodos_por_ventana=2,
+                 silencioso=False, progreso=None):
+        super().__init__(config_path, datos, silencioso, progreso)
+        if periodos_por_ventana < 1:
+            raise ValueError("periodos_por_ventana debe ser al menos 1")
+        self.periodos_por_ventana = periodos_por_ventana
+
+    def agregados_ventana(self):
+        """
+        Sumas, conteos y extremos de los resultados de la ventana por
+        (semestre, periodo, categoría de ambiente), para los resúmenes globales.
+        """
+        todos = pd.concat([self.resultados[prog] for prog in self.config['metadata']['programas']])
+        todos = todos.assign(CATEGORIA=todos['TIPO_AMBIENTE'].map(categoria_ambiente))
+        return todos.groupby(['SEMESTRE', 'CLAVE_PERIODO', 'CATEGORIA'], dropna=False, sort=False).agg(
+            filas_est=('TOTAL_MATRICULADOS', 'count'),
+            suma_est=('TOTAL_MATRICULADOS', 'sum'),
+            max_est=('TOTAL_MATRICULADOS', 'max'),
+            min_est=('TOTAL_MATRICULADOS', 'min'),
+            filas_secc=('SECCIONES', 'count'),
+            suma_secc=('SECCIONES', 'sum'),
+            horas=('HORAS_TOTALES', 'sum'),
+        ).reset_index()
+
+    def procesar_ventanas(self):
+        """
+        Generador: procesa cada ventana y entrega sus salidas
+        {'claves', 'consumo_por_periodo', 'detalle_ambientes_especificos',
+         'detalle_cursos_por_periodo', 'agregados'}.
+        """
+        proyecciones = self.proyecciones
+        try:
+            for claves, ventana in ventanas_proyeccion(proyecciones, self.periodos_por_ventana):
+                self.proyecciones = ventana
+                # Los mensajes de cada ventana no se muestran
+                with self.informar.en_silencio():
+                    for programa in self.config['metadata']['programas']:
+                        self.procesar_programa(programa)
+                    self.procesar_cursos_compartidos()
+
+                    salidas = {
+                        'claves'                       : claves,
+                        'consumo_por_periodo'          : self.generar_resumen_por_periodo(),
+                        'detalle_ambientes_especificos': self.generar_detalle_ambientes_especificos(),
+                        'detalle_cursos_por_periodo'   : self.generar_detalle_cursos_por_periodo(),
+                        'agregados'                    : self.agregados_ventana(),
+                    }
+                self.resultados = {}
+                yield salidas
+        finally:
+            self.proyecciones = proyecciones
+
+    def resumen_por_semestre_agregado(self, agregados):
+        """Mismo resultado que generar_resumen_por_semestre, desde los agregados."""
+        resumen_semestres = []
+
+        for semestre in range(1, 11):
+            datos_semestre = agregados[agregados['SEMESTRE'] == semestre]
+            if len(datos_semestre) == 0:
+                continue
+
+            malla_sem = pd.concat([
+                self.mallas[prog][self.mallas[prog]['SEMESTRE'] == semestre]
+                for prog in self.config['metadata']['programas']
+            ])
+            horas_periodo = datos_semestre.groupby('CLAVE_PERIODO')['horas'].sum().mean()
+
+            resumen_sem = {
+                'semestre': semestre,
+                'cursos': len(malla_sem),
+                'creditos_totales': int(malla_sem['CREDITOS'].sum()),
+                'horas_curso_semanales': int(malla_sem['TOTAL_HORAS_SEMANALES'].sum()),
+                'estadisticas': {
+                    'promedio_estudiantes': float(datos_semestre['suma_est'].sum() / datos_semestre['filas_est'].sum()),
+                    'maximo_estudiantes': int(datos_semestre['max_est'].max()),
+                    'minimo_estudiantes': int(datos_semestre['min_est'].min()),
+                    'promedio_secciones': float(datos_semestre['suma_secc'].sum() / datos_semestre['filas_secc'].sum()),
+                    'promedio_horas_semanales': float(horas_periodo)
+                },
+                'distribucion_tipo_ambiente': {}
+            }
+
+            for ambiente in CATEGORIAS:
+                datos_amb = datos_semestre[datos_semestre['CATEGORIA'] == ambiente]
+                if len(datos_amb) > 0:
+                    horas_prom = datos_amb.groupby('CLAVE_PERIODO')['horas'].sum().mean()
+                    promedio = resumen_sem['estadisticas']['promedio_horas_semanales']
+                    resumen_sem['distribucion_tipo_ambiente'][ambiente] = {
+                        'horas_semanales': float(horas_prom),
+                        'porcentaje': float((horas_prom / promedio) * 100) if promedio > 0 else 0
+                    }
+                else:
+                    resumen_sem['distribucion_tipo_ambiente'][ambiente] = {
+                        'horas_semanales': 0,
+                        'porcentaje': 0
+                    }
+
+            resumen_semestres.append(resumen_sem)
+
+        return resumen_semestres
+
+    def resumen_por_año_agregado(self, agregados):
+        """Mismo resultado que generar_resumen_por_año, desde los agregados."""
+        resumen_años = []
+        semanas = self.parametros['semanas_por_semestre']
+
+        for año, datos_año in agregados.groupby(anio_de_clave(agregados['CLAVE_PERIODO'])):
+            ciclos = ciclo_de_clave(datos_año['CLAVE_PERIODO'])
+            ciclo_i = datos_año[ciclos == 1]
+            ciclo_ii = datos_año[ciclos == 2]
+
+            est_ciclo_i = ciclo_i['max_est'].max()
+            est_ciclo_ii = ciclo_ii['max_est'].max()
+            total_est = max(est_ciclo_i if pd.notna(est_ciclo_i) else 0,
+                            est_ciclo_ii if pd.notna(est_ciclo_ii) else 0)
+
+            resumen_año = {
+                'año': int(año),
+                'total_estudiantes_año': int(total_est),
+                'horas_anuales': {},
+                'promedio_semanal': {}
+            }
+            for ambiente in CATEGORIAS:
+                horas = datos_año.loc[datos_año['CATEGORIA'] == ambiente, 'horas'].sum()
+                resumen_año['horas_anuales'][ambiente] = float(horas * semanas)
+            resumen_año['horas_anuales']['total'] = sum(resumen_año['horas_anuales'].values())
+
+            prom_i = ciclo_i.groupby('CLAVE_PERIODO')['horas'].sum().mean() if len(ciclo_i) > 0 else 0
+            prom_ii = ciclo_ii.groupby('CLAVE_PERIODO')['horas'].sum().mean() if len(ciclo_ii) > 0 else 0
+            resumen_año['promedio_semanal'] = {
+                'ciclo_i': float(prom_i),
+                'ciclo_ii': float(prom_ii),
+                'promedio': float((prom_i + prom_ii) / 2)
+            }
+            resumen_años.append(resumen_año)
+
+        return resumen_años
+
+    def ejecutar(self):
+        """
+        Ejecuta el análisis por ventanas y escribe el JSON (mismo contenido
+        que el de la referencia). Retorna el resultado sin las secciones por
+        periodo, que quedan solo en el archivo (leerlas con LectorConsumoJSON).
+        """
+        self.informar(f"\nIniciando análisis por ventanas de {self.periodos_por_ventana} periodos...\n")
+
+        if not self.mallas:
+            self.cargar_datos()
+        self.identificar_cursos_compartidos()
+        self.identificar_cursos_a_eliminar()
+
+        compactas = self.secciones_compactas()
+        secciones = {nombre: SeccionPeriodos(nombre in compactas) for nombre in SECCIONES_PERIODOS}
+        agregados = []
+        ambientes_por_periodo = []
+        pico = primero = ultimo = None
+
+        try:
+            for salidas in self.procesar_ventanas():
+                for nombre in SECCIONES_PERIODOS:
+                    for item in self.convertir_tipos_python(salidas[nombre]):
+                        secciones[nombre].agregar(item)
+                        if nombre == 'detalle_ambientes_especificos':
+                            ambientes_por_periodo.append(item)
+
+                for periodo in salidas['consumo_por_periodo']:
+                    primero = primero or periodo['periodo']
+                    ultimo = periodo['periodo']
+                    if pico is None or periodo['horas_semanales']['total'] > pico['horas_semanales']['total']:
+                        pico = periodo
+                agregados.append(salidas['agregados'])
+
+                self.informar(f"  Ventana {etiqueta_periodo(salidas['claves'][0])} a "
+                      f"{etiqueta_periodo(salidas['claves'][-1])}: "
+                      f"{len(salidas['detalle_cursos_por_periodo'])} periodos")
+
+            if pico is None:
+                raise ValueError("La proyeccion no tiene periodos")
+
+            agregados = pd.concat(agregados, ignore_index=True)
+            resultado_json = self.convertir_tipos_python({
+                'metadata': {
+                    'carrera': self.config['metadata']['carrera'],
+                    'programas': self.config['metadata']['programas'],
+                    'fecha_analisis': self.config['metadata']['fecha_analisis'],
+                    'periodo_proyeccion': f"{primero} a {ultimo}",
+                    'parametros': self.parametros
+                },
+                'resumen_total': {
+                    'periodo_pico': {
+                        'periodo': pico['periodo'],
+                        'horas_semanales_totales': pico['horas_semanales']['total'],
+                        'estudiantes': pico['estudiantes']['total']
+                    },
+                    'distribucion_pico': pico['horas_semanales']
+                },
+                'picos_por_ambiente': analizar_picos(ambientes_por_periodo),
+                'consumo_por_semestre_academico': self.resumen_por_semestre_agregado(agregados),
+                'consumo_por_año': self.resumen_por_año_agregado(agregados),
+            })
+
+            orden = ['metadata', 'resumen_total', 'picos_por_ambiente', 'consumo_por_periodo', 'consumo_por_semestre_academico',
+                     'consumo_por_año', 'detalle_ambientes_especificos', 'detalle_cursos_por_periodo']
+            output_path = self.config['output']['json']
+            escribir_json_indexado({clave: resultado_json.get(clave, secciones.get(clave)) for clave in orden},
+                                   output_path)
+            self.informar(f"\n  JSON guardado en: {output_path}")
+        finally:
+            for seccion in secciones.values():
+                seccion.cerrar()
+
+        if self.config['output'].get('exportes', {}).get('formatos'):
+            self.informar("  ADVERTENCIA: El modo por ventanas no genera los exportes (parquet/json.gz); "
+                  "use el analisis completo")
+
+        self.informar(f"\nPeriodo pico: {resultado_json['resumen_total']['periodo_pico']['periodo']}")
+        self.informar(f"Horas semanales totales (pico): "
+              f"{resultado_json['resumen_total']['periodo_pico']['horas_semanales_totales']:.2f}")
+        return resultado_json
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    import tracemalloc
+
+    parser = argparse.ArgumentParser(description="Analisis de horas-aula por ventanas de periodos.")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--ventana', type=int, default=2, help="Periodos por ventana")
+    parser.add_argument('--medir-memoria', action='store_true',
+                        help="Informa el pico de memoria asignada (tracemalloc, mas lento)")
+    args = parser.parse_args()
+
+    if args.medir_memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+
+    MotorVentanas(args.config, periodos_por_ventana=args.ventana).ejecutar()
+
+    print(f"\nTiempo: {time.perf_counter() - inicio:.2f} s")
+    if args.medir_memoria:
+        _, pico_memoria = tracemalloc.get_traced_memory()
+        print(f"Pico de memoria asignada: {pico_memoria / 2**20:.1f} MiB")
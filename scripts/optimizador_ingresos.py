@@ -0,0 +1,324 @@
+"""
+Optimizador de escalonamiento de ingresos
+
+El pico de horas depende de cómo coinciden las cohortes de LLYA y MYC en los
+cursos compartidos. Este script explora, para cada programa:
+
+  - un desfase de inicio de 0 a N periodos (todo el programa empieza k
+    ciclos después), y
+  - un cambio de ciclo de ingreso: las cohortes que ingresan en el ciclo I
+    (o en el II) pasan a ingresar un ciclo después. Si así coinciden con la
+    cohorte del ciclo siguiente, sus alumnos se suman en el mismo curso.
+
+Cada fila de la unión proyección × malla pertenece a la cohorte que ingresó
+en `CLAVE_PERIODO - (SEMESTRE - 1)`; mover la cohorte es sumar periodos a
+su clave. El horizonte se extiende lo necesario para no perder alumnos (un
+desfase no "saca" demanda del análisis).
+
+Evaluación de cada combinación:
+  - por programa y opción (se calcula una vez y se reutiliza): se mueven
+    las claves, se recalculan secciones y horas con las operaciones
+    vectorizadas de MotorVectorizado, y las horas de los cursos no
+    compartidos se acumulan en una matriz periodos × tipo de ambiente;
+  - por combinación: solo se fusionan las filas de cursos compartidos
+    (LLYA lleva los alumnos de ambos programas en los periodos en que los
+    dos tienen alumnos), con arreglos de numpy y el mismo resultado que
+    `procesar_cursos_compartidos`; su matriz se suma a las anteriores.
+
+Se reportan, para cada tipo de ambiente y para el total, las combinaciones
+con menor pico de horas semanales (desempate: pico total y menos cambios).
+
+Uso:
+    python scripts/optimizador_ingresos.py --desfase-max 6 --top 5
+"""
+
+import itertools
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analizador_horas_aula import calcular_secciones_vectorizado
+from motor_vectorizado import MotorVectorizado
+from periodos import ciclo_de_clave, etiqueta_periodo
+
+
+CICLOS_INGRESO = {'I': 1, 'II': 2}
+
+MAX_COMBINACIONES = 200_000
+
+TOP = 5
+
+
+def _describir(opcion):
+    desfase, ciclo = opcion
+    partes = []
+    if desfase:
+        partes.append(f"inicio +{desfase}")
+    if ciclo:
+        partes.append(f"ingresos {ciclo}→sig.")
+    return ', '.join(partes) or 'sin cambios'
+
+
+class OptimizadorIngresos:
+    """
+    Busca desfases de inicio y de ciclo de ingreso por programa que
+    minimizan el pico de horas semanales por tipo de ambiente.
+    """
+
+    def __init__(self, config_path='config.json', datos=None, desfase_max=4):
+        if desfase_max < 0:
+            raise ValueError("desfase_max no puede ser negativo")
+        self.desfase_max = desfase_max
+
+        a = self.analizador = MotorVectorizado(config_path, datos, silencioso=True)
+        if not a.mallas:
+            a.cargar_datos()
+        a.identificar_cursos_compartidos()
+        a.identificar_cursos_a_eliminar()
+        self.programas = a.config['metadata']['programas']
+
+        # Unión proyección × malla de cada programa, sin secciones
+        self.base = {}
+        for programa in self.programas:
+            datos_programa = a.procesar_programa(programa).drop(columns=['PERIODO', 'SECCIONES', 'HORAS_TOTALES'])
+            # Posición de la fila dentro de su curso y periodo (distingue teoría y práctica)
+            datos_programa['FILA'] = datos_programa.groupby(['CLAVE_PERIODO', 'CODIGO_CURSO']).cumcount()
+            self.base[programa] = datos_programa
+
+        self.codigos_compartidos = {
+            'LLYA': {c['codigo_llya'] for c in a.cursos_compartidos},
+            'MYC' : {c['codigo_myc'] for c in a.cursos_compartidos},
+        }
+
+        # Ejes de las matrices: periodos (horizonte extendido) × tipos + Total
+        claves = pd.concat([d['CLAVE_PERIODO'] for d in self.base.values()])
+        self.clave_min = int(claves.min())
+        self.claves = np.arange(self.clave_min, int(claves.max()) + desfase_max + 2)
+        tipos = pd.concat([d['TIPO_AMBIENTE'] for d in self.base.values()]).dropna().unique()
+        self.tipos = sorted(tipos)
+        self.columnas = self.tipos + ['Total']
+
+        # Con códigos únicos las fusiones son independientes y se hacen de una vez
+        compartidos = a.cursos_compartidos
+        self._fusion_directa = all(
+            len({c[campo] for c in compartidos}) == len(compartidos) for campo in ('codigo_llya', 'codigo_myc')
+        )
+
+        self._cache_no_compartido = {}
+        self._cache_compartido = {}
+        self.evaluaciones = 0
+
+    def opciones(self):
+        """Opciones (desfase, ciclo de ingreso que se posterga) de cada programa."""
+        ciclos = [None] + list(CICLOS_INGRESO)
+        return [(desfase, ciclo) for desfase in range(self.desfase_max + 1) for ciclo in ciclos]
+
+    # ------------------------------------------------------------------
+    # Por programa y opción
+    # ------------------------------------------------------------------
+
+    def _transformar(self, programa, opcion):
+        """Filas del programa con las cohortes movidas, secciones y horas."""
+        desfase, ciclo = opcion
+        datos = self.base[programa]
+        clave = datos['CLAVE_PERIODO'].to_numpy()
+        if ciclo is not None:
+            ingreso = clave - (datos['SEMESTRE'].to_numpy() - 1)
+            clave = clave + (ciclo_de_clave(ingreso) == CICLOS_INGRESO[ciclo])
+        datos = datos.assign(CLAVE_PERIODO=clave + desfase)
+
+        if ciclo is not None:
+            # Cohortes que coinciden en un curso y periodo se dictan juntas
+            otras = [c for c in datos.columns if c not in ('CLAVE_PERIODO', 'CODIGO_CURSO', 'FILA', 'TOTAL_MATRICULADOS')]
+            datos = (datos.groupby(['CLAVE_PERIODO', 'CODIGO_CURSO', 'FILA'], sort=False, as_index=False, dropna=False)
+                          .agg({**dict.fromkeys(otras, 'first'), 'TOTAL_MATRICULADOS': 'sum'}))
+
+        secciones = self.analizador.secciones_por_fila(datos)
+        return datos.assign(SECCIONES=secciones, HORAS_TOTALES=datos['HORAS_SEMANALES'] * secciones)
+
+    def _matriz(self, frames):
+        """Horas semanales periodos × (tipos + Total) de las filas dadas (filas sin tipo no cuentan)."""
+        matriz = np.zeros((len(self.claves), len(self.columnas)))
+        for datos in frames:
+            if datos.empty:
+                continue
+            fila = datos['CLAVE_PERIODO'].to_numpy() - self.clave_min
+            horas = datos['HORAS_TOTALES'].to_numpy(dtype=float)
+            columna = pd.Categorical(datos['TIPO_AMBIENTE'], categories=self.tipos).codes
+            con_tipo = columna >= 0
+            np.add.at(matriz, (fila[con_tipo], columna[con_tipo]), horas[con_tipo])
+        # Total: suma de los tipos (como en picos_por_ambiente; sin tipo no ocupa ambiente)
+        matriz[:, -1] = matriz[:, :-1].sum(axis=1)
+        return matriz
+
+    def _partes(self, programa, opcion):
+        """(matriz de cursos no compartidos, filas de cursos compartidos), en caché."""
+        clave = (programa, opcion)
+        if clave not in self._cache_no_compartido:
+            datos = self._transformar(programa, opcion)
+            compartido = datos['CODIGO_CURSO'].isin(self.codigos_compartidos.get(programa, set()))
+            self._cache_no_compartido[clave] = self._matriz([datos[~compartido]])
+            self._cache_compartido[clave] = self._arreglos_compartidos(programa, datos[compartido])
+        return self._cache_no_compartido[clave], self._cache_compartido[clave]
+
+    def _arreglos_compartidos(self, programa, datos):
+        """
+        Filas de cursos compartidos como arreglos, con la llave (curso
+        compartido, periodo) de cada fila y, por llave, la suma y el primer
+        valor de alumnos (lo que usa procesar_cursos_compartidos).
+        """
+        campo = f"codigo_{programa.lower()}"
+        indice = {c[campo]: i for i, c in enumerate(self.analizador.cursos_compartidos) if campo in c}
+        llave = (datos['CODIGO_CURSO'].map(indice).to_numpy(dtype='int64') * len(self.claves)
+                 + datos['CLAVE_PERIODO'].to_numpy() - self.clave_min)
+        estudiantes = datos['TOTAL_MATRICULADOS'].to_numpy(dtype=float)
+        llaves, primera, inversa = np.unique(llave, return_index=True, return_inverse=True)
+        return {
+            'datos'      : datos,
+            'llave'      : llave,
+            'llaves'     : llaves,
+            'suma'       : np.bincount(inversa, weights=estudiantes, minlength=len(llaves)),
+            'primero'    : estudiantes[primera],
+            'fila'       : llave % len(self.claves),
+            'columna'    : pd.Categorical(datos['TIPO_AMBIENTE'], categories=self.tipos).codes,
+            'horas'      : datos['HORAS_TOTALES'].to_numpy(dtype=float),
+        }
+
+    # ------------------------------------------------------------------
+    # Por combinación
+    # ------------------------------------------------------------------
+
+    def _fusionar(self, llya, myc):
+        """
+        Matriz de horas de los cursos compartidos, con el mismo resultado
+        que procesar_cursos_compartidos: en los periodos con alumnos en ambos
+        programas las filas de LLYA llevan la suma de alumnos y las de MYC se
+        quitan. (Las filas con 0 alumnos que también se quitan no tienen horas.)
+        """
+        activas_llya = llya['llaves'][llya['suma'] > 0]
+        activas_myc  = myc['llaves'][myc['suma'] > 0]
+        fusionadas, i, j = np.intersect1d(activas_llya, activas_myc, return_indices=True)
+        est_total = llya['primero'][llya['suma'] > 0][i] + myc['primero'][myc['suma'] > 0][j]
+
+        horas_llya = llya['horas'].copy()
+        pos = np.searchsorted(fusionadas, llya['llave']).clip(max=max(len(fusionadas) - 1, 0))
+        en_llya = (fusionadas[pos] == llya['llave']) if len(fusionadas) else np.zeros(len(pos), dtype=bool)
+        if en_llya.any():
+            filas = llya['datos'][en_llya]
+            secciones = calcular_secciones_vectorizado(est_total[pos[en_llya]], filas['TIPO_AMBIENTE'],
+                                                       self.analizador.parametros)
+            horas_llya[en_llya] = filas['HORAS_SEMANALES'].to_numpy(dtype=float) * secciones
+
+        horas_myc = np.where(np.isin(myc['llave'], fusionadas), 0.0, myc['horas'])
+
+        matriz = np.zeros((len(self.claves), len(self.columnas)))
+        for arreglos, horas in ((llya, horas_llya), (myc, horas_myc)):
+            con_tipo = arreglos['columna'] >= 0
+            np.add.at(matriz, (arreglos['fila'][con_tipo], arreglos['columna'][con_tipo]), horas[con_tipo])
+        matriz[:, -1] = matriz[:, :-1].sum(axis=1)
+        return matriz
+
+    def evaluar(self, combinacion):
+        """
+        `combinacion`: una opción por programa (en el orden de config).
+        Retorna la matriz de horas periodos × (tipos + Total).
+        """
+        self.evaluaciones += 1
+        matriz = np.zeros((len(self.claves), len(self.columnas)))
+        compartidos = {}
+        for programa, opcion in zip(self.programas, combinacion):
+            no_compartido, compartidos[programa] = self._partes(programa, opcion)
+            matriz += no_compartido
+
+        if self._fusion_directa and {'LLYA', 'MYC'} <= compartidos.keys():
+            return matriz + self._fusionar(compartidos['LLYA'], compartidos['MYC'])
+
+        # Un código en varios cursos compartidos: cada fusión ve la anterior
+        a = self.analizador
+        a.resultados = {p: compartidos[p]['datos'] for p in self.programas}
+        a.procesar_cursos_compartidos()
+        return matriz + self._matriz([a.resultados[p] for p in self.programas])
+
+    def explorar(self, top=TOP):
+        """
+        Evalúa todas las combinaciones de opciones. Retorna el pico de la
+        configuración actual y, por tipo de ambiente y total, las `top`
+        combinaciones con menor pico.
+        """
+        opciones = self.opciones()
+        total = len(opciones) ** len(self.programas)
+        if total > MAX_COMBINACIONES:
+            raise ValueError(f"{total} combinaciones superan el maximo de {MAX_COMBINACIONES}; reduzca desfase_max")
+
+        inicio = time.perf_counter()
+        combinaciones = list(itertools.product(opciones, repeat=len(self.programas)))
+        picos = np.empty((len(combinaciones), len(self.columnas)))
+        periodos_pico = np.empty((len(combinaciones), len(self.columnas)), dtype=int)
+        for i, combinacion in enumerate(combinaciones):
+            matriz = self.evaluar(combinacion)
+            periodos_pico[i] = matriz.argmax(axis=0)      # ante empates, el primer periodo
+            picos[i] = matriz[periodos_pico[i], np.arange(len(self.columnas))]
+
+        cambios = np.array([sum(desfase + (ciclo is not None) for desfase, ciclo in c) for c in combinaciones])
+        actual = combinaciones.index(tuple((0, None) for _ in self.programas))
+
+        def describir(i, j):
+            return {
+                'combinacion': {p: {'desfase': d, 'ciclo_postergado': c, 'descripcion': _describir((d, c))}
+                                for p, (d, c) in zip(self.programas, combinaciones[i])},
+                'horas_pico': float(picos[i, j]),
+                'periodo_pico': etiqueta_periodo(int(self.claves[periodos_pico[i, j]])),
+                'horas_pico_total': float(picos[i, -1]),
+            }
+
+        mejores = {}
+        for j, columna in enumerate(self.columnas):
+            orden = np.lexsort((cambios, picos[:, -1], picos[:, j]))[:top]
+            mejores[columna] = {
+                'actual': describir(actual, j),
+                'mejores': [describir(i, j) for i in orden],
+            }
+
+        return {
+            'desfase_max': self.desfase_max,
+            'combinaciones': len(combinaciones),
+            'tiempo_s': round(time.perf_counter() - inicio, 3),
+            'por_ambiente': mejores,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Busca escalonamientos de ingreso que aplanan el pico de horas.")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--desfase-max', type=int, default=4, help="desfase de inicio maximo por programa, en periodos")
+    parser.add_argument('--top', type=int, default=TOP)
+    parser.add_argument('--salida', default='salida/json/escalonamiento_ingresos.json')
+    args = parser.parse_args()
+
+    try:
+        optimizador = OptimizadorIngresos(args.config, desfase_max=args.desfase_max)
+        resultado = optimizador.explorar(args.top)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("ESCALONAMIENTO DE INGRESOS")
+    print("=" * 80)
+    print(f"  {resultado['combinaciones']} combinaciones en {resultado['tiempo_s']} s\n")
+    for ambiente, info in resultado['por_ambiente'].items():
+        actual, mejor = info['actual'], info['mejores'][0]
+        combinacion = '; '.join(f"{p}: {c['descripcion']}" for p, c in mejor['combinacion'].items())
+        print(f"  {ambiente:<30} actual {actual['horas_pico']:>7.1f} h ({actual['periodo_pico']})"
+              f"  -> {mejor['horas_pico']:>7.1f} h ({mejor['periodo_pico']})  [{combinacion}]")
+
+    Path(args.salida).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\n  Resultado guardado en: {args.salida}")
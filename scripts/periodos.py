@@ -0,0 +1,65 @@
+"""
+Utilidades de periodos académicos.
+
+Internamente un periodo se representa con una clave entera compacta:
+
+    clave = año * 2 + (ciclo - 1)      (ciclo 1 = I, ciclo 2 = II)
+
+La clave ordena cronológicamente y se usa para ordenar, agrupar y unir.
+Las etiquetas "2027-01" (JSON) y "2027-I" (hojas Excel) solo se generan
+al momento de exportar.
+"""
+
+
+def claves_desde_fechas(fechas):
+    """
+    Calcula la clave de periodo de una serie de fechas (vectorizado).
+    El mes 01 corresponde al ciclo I; cualquier otro mes, al ciclo II.
+    """
+    return (fechas.dt.year * 2 + (fechas.dt.month != 1)).astype('int64')
+
+
+def clave_periodo(anio, ciclo):
+    """Clave de periodo a partir del año y el ciclo (1 o 2)."""
+    return int(anio) * 2 + int(ciclo) - 1
+
+
+def anio_de_clave(clave):
+    """Año de la clave. Acepta enteros o series/arreglos."""
+    return clave // 2
+
+
+def ciclo_de_clave(clave):
+    """Ciclo (1 o 2) de la clave. Acepta enteros o series/arreglos."""
+    return clave % 2 + 1
+
+
+def etiqueta_ciclo(clave):
+    """'I' o 'II' según la clave."""
+    return 'I' if clave % 2 == 0 else 'II'
+
+
+def etiqueta_periodo(clave):
+    """Clave → '2027-01' / '2027-02' (formato del JSON)."""
+    return f"{clave // 2}-{clave % 2 + 1:02d}"
+
+
+def etiqueta_hoja(clave):
+    """Clave → '2027-I' / '2027-II' (nombre de hoja Excel)."""
+    return f"{clave // 2}-{etiqueta_ciclo(clave)}"
+
+
+def clave_desde_etiqueta(texto):
+    """
+    Interpreta '2027-01', '2027-1', '2027-I' o '2027-II' y retorna la clave.
+    Lanza ValueError si el texto no corresponde a un periodo.
+    """
+    try:
+        anio, ciclo = str(texto).strip().split('-')
+        ciclo = ciclo.strip().upper()
+        ciclo = {'I': 1, 'II': 2}.get(ciclo) or int(ciclo)
+        if ciclo not in (1, 2):
+            raise ValueError
+        return clave_periodo(int(anio), ciclo)
+    except ValueError:
+        raise ValueError(f"Periodo no valido: '{texto}' (use 2027-01 o 2027-I)") from None
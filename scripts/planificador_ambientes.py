@@ -0,0 +1,348 @@
+"""
+Planificador de sustitución de ambientes (flujo de costo mínimo)
+
+El análisis trata cada TIPO_AMBIENTE como un grupo aislado: las horas de
+Laboratorio de Física solo pueden dictarse en un Laboratorio de Física. En la
+práctica un laboratorio libre puede recibir una sección de aula y un aula
+grande puede recibir un taller. Este planificador toma un inventario de
+ambientes y una matriz de compatibilidad y, para cada periodo del JSON de
+consumo, asigna las horas semanales de cada tipo de ambiente a los ambientes
+disponibles resolviendo un flujo de costo mínimo:
+
+    fuente → tipo demandado (horas) → ambiente compatible (costo) → sumidero
+                                       (ambientes × horas_por_ambiente)
+
+  - factibilidad: si el flujo máximo cubre todas las horas; si no, el
+    déficit de cada tipo demandado;
+  - asignación: horas de cada tipo en cada ambiente, prefiriendo el mismo
+    tipo (costo 0) y luego las sustituciones de menor costo;
+  - ambientes usados: el menor número total de ambientes con el que el plan
+    cubre las mismas horas (búsqueda exacta sobre las cantidades por tipo,
+    con el flujo como prueba de factibilidad; ante empates, el de menor costo
+    de sustitución).
+
+Las horas virtuales no ocupan ambiente y no se planifican. Los periodos con la
+misma demanda se resuelven una sola vez.
+
+Configuración (config.json):
+    "ambientes": {
+      "horas_por_ambiente": 60,
+      "inventario": {"Aula": 6, "Laboratorio de Física": 1, "Taller": 1},
+      "compatibilidad": {
+        "Taller": {"Aula": 1},
+        "Aula": {"Laboratorio de Física": 2}
+      }
+    }
+`compatibilidad[demandado][ambiente]` es el costo por hora de dictar el tipo
+demandado en ese ambiente; cada tipo es siempre compatible consigo mismo (costo 0).
+
+Uso:
+    python scripts/planificador_ambientes.py --config config.json
+"""
+
+import json
+import math
+from pathlib import Path
+
+from analizador_horas_aula import categoria_ambiente
+from lector_json import LectorConsumoJSON
+
+
+TOLERANCIA = 1e-9
+
+
+class RedFlujo:
+    """
+    Red dirigida con capacidades y costos; flujo de costo mínimo por caminos
+    más cortos sucesivos (Bellman-Ford: la red residual tiene costos negativos).
+    """
+
+    def __init__(self, num_nodos):
+        self.num_nodos = num_nodos
+        self.arcos = []                 # [destino, capacidad, costo, índice del arco inverso]
+        self.salientes = [[] for _ in range(num_nodos)]
+
+    def agregar_arco(self, origen, destino, capacidad, costo=0):
+        """Agrega el arco y su inverso; retorna el índice del arco."""
+        indice = len(self.arcos)
+        self.arcos.append([destino, capacidad, costo, indice + 1])
+        self.arcos.append([origen, 0, -costo, indice])
+        self.salientes[origen].append(indice)
+        self.salientes[destino].append(indice + 1)
+        return indice
+
+    def flujo(self, indice):
+        """Flujo que pasa por el arco `indice` (capacidad de su inverso)."""
+        return self.arcos[self.arcos[indice][3]][1]
+
+    def flujo_costo_minimo(self, fuente, sumidero):
+        """Envía el flujo máximo al menor costo. Retorna (flujo, costo)."""
+        total_flujo = total_costo = 0
+        while True:
+            distancia = [math.inf] * self.num_nodos
+            previo = [None] * self.num_nodos
+            distancia[fuente] = 0
+            for _ in range(self.num_nodos - 1):
+                cambio = False
+                for nodo in range(self.num_nodos):
+                    if distancia[nodo] == math.inf:
+                        continue
+                    for indice in self.salientes[nodo]:
+                        destino, capacidad, costo, _ = self.arcos[indice]
+                        if capacidad > TOLERANCIA and distancia[nodo] + costo < distancia[destino]:
+                            distancia[destino] = distancia[nodo] + costo
+                            previo[destino] = indice
+                            cambio = True
+                if not cambio:
+                    break
+
+            if distancia[sumidero] == math.inf:
+                return total_flujo, total_costo
+
+            # Capacidad del camino y aumento
+            camino = []
+            nodo = sumidero
+            while nodo != fuente:
+                indice = previo[nodo]
+                camino.append(indice)
+                nodo = self.arcos[self.arcos[indice][3]][0]
+            aumento = min(self.arcos[i][1] for i in camino)
+            for indice in camino:
+                self.arcos[indice][1] -= aumento
+                self.arcos[self.arcos[indice][3]][1] += aumento
+            total_flujo += aumento
+            total_costo += aumento * distancia[sumidero]
+
+
+class PlanificadorAmbientes:
+    """
+    Asigna la demanda de horas por tipo de ambiente a un inventario de ambientes.
+    """
+
+    def __init__(self, inventario, compatibilidad=None, horas_por_ambiente=60):
+        if horas_por_ambiente <= 0:
+            raise ValueError("horas_por_ambiente debe ser positivo")
+        for ambiente, cantidad in inventario.items():
+            if not isinstance(cantidad, int) or cantidad < 0:
+                raise ValueError(f"Inventario de '{ambiente}' debe ser un entero >= 0")
+
+        self.inventario = dict(inventario)
+        self.horas_por_ambiente = horas_por_ambiente
+        self.compatibilidad = {}
+        for demandado, ambientes in (compatibilidad or {}).items():
+            for ambiente, costo in ambientes.items():
+                if ambiente not in self.inventario:
+                    raise ValueError(f"Compatibilidad {demandado} → '{ambiente}': ambiente fuera del inventario")
+                if costo < 0:
+                    raise ValueError(f"Compatibilidad {demandado} → {ambiente}: costo negativo")
+            self.compatibilidad[demandado] = dict(ambientes)
+        self._cache = {}
+
+    @classmethod
+    def desde_config(cls, config):
+        if 'ambientes' not in config:
+            raise ValueError("La configuracion no tiene la seccion 'ambientes' (inventario y compatibilidad)")
+        ambientes = config['ambientes']
+        return cls(ambientes['inventario'], ambientes.get('compatibilidad'),
+                   ambientes.get('horas_por_ambiente', 60))
+
+    def compatibles(self, demandado):
+        """{ambiente: costo} donde puede dictarse el tipo demandado."""
+        opciones = dict(self.compatibilidad.get(demandado, {}))
+        if demandado in self.inventario:
+            opciones[demandado] = 0
+        return opciones
+
+    def _resolver(self, demanda, cantidades):
+        """
+        Flujo de costo mínimo con `cantidades` ambientes de cada tipo.
+        Retorna (asignación {demandado: {ambiente: horas}}, costo).
+        """
+        demandados = list(demanda)
+        ambientes = list(cantidades)
+        fuente, sumidero = 0, 1 + len(demandados) + len(ambientes)
+        nodo_ambiente = {a: 1 + len(demandados) + i for i, a in enumerate(ambientes)}
+
+        red = RedFlujo(sumidero + 1)
+        arcos = {}
+        for i, demandado in enumerate(demandados):
+            red.agregar_arco(fuente, 1 + i, demanda[demandado])
+            for ambiente, costo in self.compatibles(demandado).items():
+                arcos[(demandado, ambiente)] = red.agregar_arco(1 + i, nodo_ambiente[ambiente], math.inf, costo)
+        for ambiente, cantidad in cantidades.items():
+            red.agregar_arco(nodo_ambiente[ambiente], sumidero, cantidad * self.horas_por_ambiente)
+
+        _, costo = red.flujo_costo_minimo(fuente, sumidero)
+
+        asignacion = {demandado: {} for demandado in demandados}
+        for (demandado, ambiente), indice in arcos.items():
+            horas = red.flujo(indice)
+            if horas > TOLERANCIA:
+                asignacion[demandado][ambiente] = horas
+        return asignacion, costo
+
+    @staticmethod
+    def _horas_asignadas(asignacion):
+        return sum(sum(destinos.values()) for destinos in asignacion.values())
+
+    def _horas_por_ambiente(self, asignacion):
+        usadas = dict.fromkeys(self.inventario, 0)
+        for destinos in asignacion.values():
+            for ambiente, horas in destinos.items():
+                usadas[ambiente] += horas
+        return usadas
+
+    def _minimo_ambientes(self, demanda, cubiertas):
+        """
+        Búsqueda exacta de la menor cantidad total de ambientes (sin pasar
+        el inventario de cada tipo) con la que el flujo cubre `cubiertas`
+        horas. Se prueban totales crecientes desde ceil(cubiertas / horas por
+        ambiente); para cada total se recorren las cantidades por tipo, y una
+        rama se descarta si ni con el máximo posible en los tipos que faltan
+        se cubren las horas. Entre las soluciones del menor total se elige la
+        de menor costo de sustitución. Retorna {ambiente: cantidad}.
+        """
+        # Solo cuentan los ambientes que pueden recibir alguna demanda
+        candidatos = sorted({a for demandado in demanda for a in self.compatibles(demandado)
+                             if self.inventario[a] > 0})
+        sufijo = [0] * (len(candidatos) + 1)
+        for i in range(len(candidatos) - 1, -1, -1):
+            sufijo[i] = sufijo[i + 1] + self.inventario[candidatos[i]]
+
+        def cubre(cantidades):
+            asignacion, costo = self._resolver(demanda, {**dict.fromkeys(self.inventario, 0), **cantidades})
+            return self._horas_asignadas(asignacion) >= cubiertas - TOLERANCIA, costo
+
+        def buscar(i, restantes, parcial, mejor):
+            if i == len(candidatos):
+                factible, costo = cubre(parcial)
+                if factible and (mejor is None or costo < mejor[1] - TOLERANCIA):
+                    mejor = (dict(parcial), costo)
+                return mejor
+            ambiente = candidatos[i]
+            for n in range(min(self.inventario[ambiente], restantes), -1, -1):
+                if sufijo[i + 1] < restantes - n:
+                    break
+                parcial[ambiente] = n
+                # Cota: el resto de los tipos con todo lo que aún podrían tener
+                holgura = {a: min(self.inventario[a], restantes - n) for a in candidatos[i + 1:]}
+                if cubre({**parcial, **holgura})[0]:
+                    mejor = buscar(i + 1, restantes - n, parcial, mejor)
+            del parcial[ambiente]
+            return mejor
+
+        inferior = math.ceil(cubiertas / self.horas_por_ambiente - TOLERANCIA)
+        for total in range(max(inferior, 0), sufijo[0] + 1):
+            mejor = buscar(0, total, {}, None)
+            if mejor is not None:
+                return {**dict.fromkeys(self.inventario, 0), **mejor[0]}
+        # No se llega aquí: con todo el inventario el flujo cubre `cubiertas`
+        return dict(self.inventario)
+
+    def planificar(self, demanda):
+        """
+        Plan para una demanda {tipo de ambiente: horas semanales}.
+        Las horas virtuales se ignoran.
+        """
+        demanda = {tipo: float(horas) for tipo, horas in demanda.items()
+                   if categoria_ambiente(tipo) != 'virtual' and horas > 0}
+        clave = tuple(sorted(demanda.items()))
+        if clave in self._cache:
+            return self._cache[clave]
+
+        asignacion, _ = self._resolver(demanda, self.inventario)
+        cubiertas = self._horas_asignadas(asignacion)
+
+        # Ambientes usados: el menor número que cubre las mismas horas
+        cantidades = self._minimo_ambientes(demanda, cubiertas)
+        asignacion, costo = self._resolver(demanda, cantidades)
+
+        deficit = {}
+        for demandado, horas in demanda.items():
+            faltan = horas - sum(asignacion[demandado].values())
+            if faltan > TOLERANCIA:
+                deficit[demandado] = faltan
+
+        usadas = self._horas_por_ambiente(asignacion)
+        plan = {
+            'factible': not deficit,
+            'horas_demandadas': sum(demanda.values()),
+            'horas_asignadas': self._horas_asignadas(asignacion),
+            'deficit': deficit,
+            'sustituciones': {
+                demandado: {a: h for a, h in destinos.items() if a != demandado}
+                for demandado, destinos in asignacion.items()
+                if any(a != demandado for a in destinos)
+            },
+            'asignacion': asignacion,
+            'ambientes_usados': {a: n for a, n in cantidades.items() if n > 0},
+            'total_ambientes': sum(cantidades.values()),
+            'ocupacion': {
+                a: usadas[a] / (n * self.horas_por_ambiente)
+                for a, n in cantidades.items() if n > 0
+            },
+            'costo_sustitucion': costo,
+        }
+        self._cache[clave] = plan
+        return plan
+
+    def planificar_periodos(self, detalle_ambientes):
+        """
+        Planes por periodo a partir de elementos de `detalle_ambientes_especificos`
+        ({'periodo', 'ambientes': {tipo: {'horas_semanales', ...}}}).
+        """
+        for periodo in detalle_ambientes:
+            demanda = {tipo: info['horas_semanales'] for tipo, info in periodo['ambientes'].items()}
+            yield {'periodo': periodo['periodo'], **self.planificar(demanda)}
+
+    def resumen(self, planes):
+        """Periodos con déficit y máximo de ambientes usados de cada tipo."""
+        pico = {}
+        for plan in planes:
+            for ambiente, cantidad in plan['ambientes_usados'].items():
+                pico[ambiente] = max(pico.get(ambiente, 0), cantidad)
+        return {
+            'periodos': len(planes),
+            'periodos_factibles': sum(p['factible'] for p in planes),
+            'periodos_con_deficit': [p['periodo'] for p in planes if not p['factible']],
+            'maximo_ambientes_usados': pico,
+            'inventario': self.inventario,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Planifica la sustitucion de ambientes por periodo.")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--json', help="JSON de consumo (por defecto el de config output.json)")
+    parser.add_argument('--salida', default='salida/json/plan_ambientes.json')
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    try:
+        planificador = PlanificadorAmbientes.desde_config(config)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    lector = LectorConsumoJSON(args.json or config['output']['json'])
+    planes = list(planificador.planificar_periodos(lector.periodos('detalle_ambientes_especificos')))
+    resumen = planificador.resumen(planes)
+
+    print("=" * 80)
+    print("PLAN DE AMBIENTES (con sustituciones)")
+    print("=" * 80)
+    for plan in planes:
+        estado = 'OK' if plan['factible'] else 'DEFICIT ' + ', '.join(
+            f"{tipo}: {horas:.1f} h" for tipo, horas in plan['deficit'].items())
+        usados = ', '.join(f"{a} {n}" for a, n in plan['ambientes_usados'].items())
+        print(f"  {plan['periodo']}: {plan['total_ambientes']:>3} ambientes ({usados}) {estado}")
+    print(f"\n  Periodos factibles: {resumen['periodos_factibles']} de {resumen['periodos']}")
+
+    Path(args.salida).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump({'resumen': resumen, 'planes': planes}, f, indent=2, ensure_ascii=False)
+    print(f"  Plan guardado en: {args.salida}")
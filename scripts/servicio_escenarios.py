@@ -0,0 +1,248 @@
+"""
+Servicio local de escenarios "¿qué pasa si...?"
+
+Mantiene en memoria un AnalizadorHorasAula con los Excel ya leídos, las
+equivalencias identificadas y las mallas expandidas. Cada consulta aplica
+cambios de parámetros y/o de matrícula y responde con resultados con la
+forma de `consumo_por_periodo`, sin volver a leer archivos ni escribir JSON.
+
+Uso:
+    python scripts/servicio_escenarios.py --config config.json --puerto 8765
+
+    POST /escenario
+    {
+      "parametros": {"tamano_seccion_laboratorio": 24},
+      "matricula":  {"MYC": 1.2}          # factor por programa
+    }
+
+    GET /salud
+
+Las respuestas se guardan en una caché LRU indexada por el hash de los
+cambios normalizados (sin secciones vacías, parámetros enteros, JSON canónico),
+de modo que repetir un escenario es inmediato.
+"""
+
+import copy
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from analizador_horas_aula import AnalizadorHorasAula
+
+
+PARAMETROS_MODIFICABLES = (
+    'tamano_seccion_aula',
+    'tamano_seccion_laboratorio',
+    'tamano_seccion_taller',
+    'semanas_por_semestre',
+)
+
+# Factor de matrícula máximo por programa (evita desbordes de los enteros)
+FACTOR_MATRICULA_MAXIMO = 100
+
+
+def _es_numero(valor):
+    """Número finito de JSON (true/false no cuentan como 1/0)."""
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+
+
+def _es_entero_positivo(valor):
+    """Entero >= 1 (se acepta 30.0, no 0.5)."""
+    return _es_numero(valor) and float(valor).is_integer() and valor >= 1
+
+
+class ServicioEscenarios:
+    """
+    Evalúa escenarios sobre un analizador precargado, con caché LRU.
+    """
+
+    def __init__(self, config_path='config.json', tamano_cache=128):
+        self.tamano_cache = tamano_cache
+        self.cache = OrderedDict()
+
+        # Los mensajes de progreso del analizador no interesan al cliente
+        self.base = AnalizadorHorasAula(config_path, silencioso=True)
+        self.base.cargar_datos()
+        self.base.identificar_cursos_compartidos()
+        self.base.identificar_cursos_a_eliminar()
+        for programa in self.base.config['metadata']['programas']:
+            self.base.expandir_malla(programa)
+
+    # ------------------------------------------------------------------
+    # Validación y clave de caché
+    # ------------------------------------------------------------------
+
+    def validar(self, cambios):
+        """Lanza ValueError si los cambios no son válidos."""
+        if not isinstance(cambios, dict):
+            raise ValueError("El cuerpo debe ser un objeto JSON")
+
+        desconocidas = set(cambios) - {'parametros', 'matricula'}
+        if desconocidas:
+            raise ValueError(f"Claves no reconocidas: {sorted(desconocidas)}")
+        for seccion in ('parametros', 'matricula'):
+            if not isinstance(cambios.get(seccion, {}), dict):
+                raise ValueError(f"'{seccion}' debe ser un objeto JSON")
+
+        for nombre, valor in cambios.get('parametros', {}).items():
+            if nombre not in PARAMETROS_MODIFICABLES:
+                raise ValueError(f"Parametro no modificable: '{nombre}'")
+            if not _es_entero_positivo(valor):
+                raise ValueError(f"Parametro '{nombre}' debe ser un entero >= 1")
+
+        programas = self.base.config['metadata']['programas']
+        for programa, factor in cambios.get('matricula', {}).items():
+            if programa not in programas:
+                raise ValueError(f"Programa desconocido: '{programa}'")
+            if not _es_numero(factor) or not 0 <= factor <= FACTOR_MATRICULA_MAXIMO:
+                raise ValueError(f"Factor de matricula de '{programa}' debe estar entre 0 y {FACTOR_MATRICULA_MAXIMO}")
+
+    @staticmethod
+    def normalizar(cambios):
+        """
+        Forma canónica de cambios ya validados: sin secciones vacías,
+        parámetros enteros y factores float, para que escenarios iguales
+        ({} y {"parametros": {}}, 30 y 30.0) compartan la entrada de caché.
+        """
+        tipo = {'parametros': int, 'matricula': float}
+        return {
+            seccion: {nombre: tipo[seccion](valor) for nombre, valor in valores.items()}
+            for seccion, valores in sorted(cambios.items())
+            if valores
+        }
+
+    @staticmethod
+    def clave(cambios):
+        """Hash del JSON canónico de los cambios (normalizados)."""
+        canonico = json.dumps(cambios, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Evaluación
+    # ------------------------------------------------------------------
+
+    def _escenario(self, cambios):
+        """Copia liviana del analizador base con los cambios aplicados."""
+        escenario = copy.copy(self.base)
+        escenario.parametros = {**self.base.parametros, **cambios.get('parametros', {})}
+        escenario.resultados = {}
+
+        escenario.proyecciones = dict(self.base.proyecciones)
+        for programa, factor in cambios.get('matricula', {}).items():
+            proyeccion = self.base.proyecciones[programa].copy()
+            proyeccion['TOTAL_MATRICULADOS'] = (
+                (proyeccion['TOTAL_MATRICULADOS'] * factor).round().astype('int64')
+            )
+            escenario.proyecciones[programa] = proyeccion
+        return escenario
+
+    def evaluar(self, cambios):
+        """Retorna el resultado del escenario (desde caché si ya se evaluó)."""
+        self.validar(cambios)
+        cambios = self.normalizar(cambios)
+        clave = self.clave(cambios)
+
+        if clave in self.cache:
+            self.cache.move_to_end(clave)
+            return {**self.cache[clave], 'cache': True}
+
+        inicio = time.perf_counter()
+        escenario = self._escenario(cambios)
+        for programa in escenario.config['metadata']['programas']:
+            escenario.procesar_programa(programa)
+        escenario.procesar_cursos_compartidos()
+        resumen_periodos = escenario.generar_resumen_por_periodo()
+        resumen_periodos = escenario.convertir_tipos_python(resumen_periodos)
+
+        pico = max(resumen_periodos, key=lambda p: p['horas_semanales']['total'])
+        resultado = {
+            'clave': clave,
+            'cambios': cambios,
+            'parametros': escenario.parametros,
+            'periodo_pico': {
+                'periodo': pico['periodo'],
+                'horas_semanales_totales': pico['horas_semanales']['total'],
+                'estudiantes': pico['estudiantes']['total'],
+            },
+            'distribucion_pico': pico['horas_semanales'],
+            'consumo_por_periodo': resumen_periodos,
+            'tiempo_ms': round((time.perf_counter() - inicio) * 1000, 1),
+        }
+
+        self.cache[clave] = resultado
+        if len(self.cache) > self.tamano_cache:
+            self.cache.popitem(last=False)
+
+        return {**resultado, 'cache': False}
+
+
+def crear_manejador(servicio):
+    """Crea la clase de manejador HTTP ligada al servicio."""
+
+    class Manejador(BaseHTTPRequestHandler):
+
+        def _responder(self, estado, cuerpo):
+            datos = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+            self.send_response(estado)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def do_GET(self):
+            if self.path == '/salud':
+                self._responder(200, {'estado': 'ok', 'escenarios_en_cache': len(servicio.cache)})
+            else:
+                self._responder(404, {'error': 'Ruta no encontrada'})
+
+        def do_POST(self):
+            if self.path != '/escenario':
+                self._responder(404, {'error': 'Ruta no encontrada'})
+                return
+            try:
+                largo = int(self.headers.get('Content-Length', 0))
+                cambios = json.loads(self.rfile.read(largo) or b'{}')
+                self._responder(200, servicio.evaluar(cambios))
+            except ValueError as e:
+                self._responder(400, {'error': str(e)})
+            except Exception as e:
+                # Un escenario que falla no debe cortar la conexión
+                self.log_error("Error evaluando escenario: %r", e)
+                self._responder(500, {'error': f"Error interno: {e}"})
+
+    return Manejador
+
+
+def servir(config_path='config.json', puerto=8765, tamano_cache=128):
+    """Carga los datos una vez y atiende consultas en 127.0.0.1:<puerto>."""
+    servicio = ServicioEscenarios(config_path, tamano_cache)
+    servidor = HTTPServer(('127.0.0.1', puerto), crear_manejador(servicio))
+
+    print("\n" + "=" * 80)
+    print(f"SERVICIO DE ESCENARIOS EN http://127.0.0.1:{puerto}")
+    print("=" * 80)
+    print("  POST /escenario  {\"parametros\": {...}, \"matricula\": {\"MYC\": 1.2}}")
+    print("  GET  /salud")
+    print("  Ctrl+C para detener")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServicio detenido.")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servicio local de escenarios what-if.")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--cache', type=int, default=128, help="Escenarios en cache LRU")
+    args = parser.parse_args()
+
+    servir(args.config, args.puerto, args.cache)
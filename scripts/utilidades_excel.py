@@ -0,0 +1,44 @@
+"""
+Utilidades compartidas por los generadores de Excel.
+
+Los anchos de columna se calculan desde el DataFrame al momento de escribir
+cada hoja (vectorizado), en lugar de recorrer celda por celda el libro ya
+escrito. En hojas muy largas se estima con una muestra determinista que
+incluye el inicio y el final (donde están subtotales y totales).
+"""
+
+from openpyxl.utils import get_column_letter
+
+
+FILAS_MUESTRA = 5000
+
+
+def anchos_columnas(df, min_w=8, max_w=50, filas_muestra=FILAS_MUESTRA):
+    """
+    Retorna la lista de anchos (uno por columna, en orden) para `df`:
+    el largo del texto más largo entre encabezado y valores, +2 de margen,
+    acotado a [min_w, max_w]. Las celdas vacías (NaN) no cuentan.
+    """
+    if len(df) > filas_muestra:
+        mitad = filas_muestra // 2
+        df = df.iloc[list(range(mitad)) + list(range(len(df) - mitad, len(df)))]
+
+    anchos = []
+    for nombre in df.columns:
+        valores = df[nombre].dropna()
+        largo_valores = valores.astype(str).str.len().max() if len(valores) else 0
+        largo = max(len(str(nombre)), int(largo_valores))
+        anchos.append(min(max(largo + 2, min_w), max_w))
+    return anchos
+
+
+def aplicar_anchos(ws, anchos):
+    """Asigna los anchos calculados a las columnas de la hoja."""
+    for i, ancho in enumerate(anchos, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = ancho
+
+
+def escribir_hoja(writer, df, nombre_hoja, min_w=8, max_w=50):
+    """Escribe `df` en la hoja y ajusta los anchos desde los propios datos."""
+    df.to_excel(writer, sheet_name=nombre_hoja, index=False)
+    aplicar_anchos(writer.sheets[nombre_hoja], anchos_columnas(df, min_w, max_w))
@@ -0,0 +1,741 @@
+"""
+Verificador de Motores - referencia vs implementación optimizada
+
+Ejecuta el análisis con la implementación de referencia (AnalizadorHorasAula
+fila a fila, con los resúmenes también fila a fila: ReferenciaFilaAFila) y con
+un motor optimizado (subclase que reemplaza pasos del cálculo) sobre las
+mismas entradas, y compara:
+
+  - las filas de `resultados` de cada programa (estudiantes, secciones,
+    horas), identificadas por periodo, curso y tipo de ambiente;
+  - cada estructura de salida: consumo_por_periodo, consumo_por_semestre_academico,
+    consumo_por_año, detalle_ambientes_especificos y detalle_cursos_por_periodo.
+
+El motor 'cubo' es AnalizadorHorasAula tal cual: sus resúmenes son consultas
+sobre el cubo de consumo, y se comparan contra los de la referencia.
+
+Los números se comparan con tolerancia relativa/absoluta. Además mide el
+tiempo de cada etapa en ambos motores.
+
+Las entradas pueden ser las de un config.json o generadas al azar
+(`generar_entradas_aleatorias`) para cubrir casos que los datos reales no
+tienen: desfases de semestre en cursos compartidos, periodos sin alumnos,
+cursos sin malla, laboratorios y tipos de ambiente desconocidos.
+
+Con `--excel` verifica además la actualización incremental del Excel
+(GeneradorExcel.actualizar) contra la generación completa, celda a celda.
+
+Uso:
+    python scripts/verificador_motores.py --config config.json
+    python scripts/verificador_motores.py --aleatorios 50 --semilla 1
+    python scripts/verificador_motores.py --config config.json --excel
+"""
+
+import copy
+import math
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from analizador_horas_aula import AnalizadorHorasAula
+from motor_vectorizado import MotorVectorizado
+from periodos import anio_de_clave, ciclo_de_clave, clave_desde_etiqueta, etiqueta_ciclo, etiqueta_periodo
+
+
+MOTORES = {
+    'vectorizado': MotorVectorizado,
+    'cubo'       : AnalizadorHorasAula,   # solo los resúmenes sobre el cubo
+}
+
+COLUMNAS_COMPARADAS = ['TOTAL_MATRICULADOS', 'SECCIONES', 'HORAS_SEMANALES', 'HORAS_TOTALES']
+
+ESTRUCTURAS = [
+    'consumo_por_periodo', 'consumo_por_semestre_academico', 'consumo_por_año',
+    'detalle_ambientes_especificos', 'detalle_cursos_por_periodo',
+]
+
+MAX_DIFERENCIAS = 50   # por caso, en el reporte
+
+
+# ---------------------------------------------------------------------------
+# Referencia de los resúmenes
+# ---------------------------------------------------------------------------
+
+class ReferenciaFilaAFila(AnalizadorHorasAula):
+    """
+    AnalizadorHorasAula con los resúmenes calculados fila a fila, como antes
+    del cubo de consumo: por periodo, semestre y año, y el detalle de
+    ambientes específicos. Es la referencia de `verificar`, de modo que el
+    cubo (que usan AnalizadorHorasAula y los motores) se compara contra
+    un cálculo independiente.
+    """
+
+    def generar_resumen_por_periodo(self):
+        """Genera el resumen de consumo por periodo."""
+        self.informar("\nGenerando resumen por periodo...")
+
+        resumen_periodos = []
+
+        # Agrupar una sola vez por clave de periodo (conserva el orden de filas)
+        grupos = {
+            programa: dict(tuple(self.resultados[programa].groupby('CLAVE_PERIODO')))
+            for programa in self.config['metadata']['programas']
+        }
+
+        # Obtener todos los periodos únicos
+        todos_periodos = set()
+        for programa in self.config['metadata']['programas']:
+            todos_periodos.update(grupos[programa])
+
+        periodos_ordenados = sorted(todos_periodos)
+
+        for periodo in periodos_ordenados:
+            resumen_periodo = {
+                'periodo': etiqueta_periodo(periodo),
+                'año': int(anio_de_clave(periodo)),
+                'ciclo': etiqueta_ciclo(periodo),
+                'estudiantes': {},
+                'horas_semanales': {
+                    'aula': 0,
+                    'laboratorio': 0,
+                    'taller': 0,
+                    'virtual': 0,
+                    'total': 0
+                },
+                'horas_semestre': {
+                    'aula': 0,
+                    'laboratorio': 0,
+                    'taller': 0,
+                    'virtual': 0,
+                    'total': 0
+                },
+                'secciones': {
+                    'aula': 0,
+                    'laboratorio': 0,
+                    'taller': 0,
+                    'virtual': 0,
+                    'total': 0
+                },
+                'detalle_por_programa': {}
+            }
+
+            # Totales de estudiantes
+            total_estudiantes = 0
+            total_llya = 0
+            total_myc = 0
+
+            for programa in self.config['metadata']['programas']:
+                datos_periodo = grupos[programa].get(periodo)
+
+                if datos_periodo is not None and len(datos_periodo) > 0:
+                    estudiantes_prog = datos_periodo['TOTAL_MATRICULADOS'].iloc[0]
+
+                    if programa == 'LLYA':
+                        total_llya = int(estudiantes_prog)
+                    else:
+                        total_myc = int(estudiantes_prog)
+
+                    total_estudiantes += estudiantes_prog
+
+                    # Agregar por tipo de ambiente
+                    detalle_programa = {
+                        'estudiantes': int(estudiantes_prog),
+                        'horas_semanales': {},
+                        'secciones': {}
+                    }
+
+                    # Agrupar por categoría de ambiente
+                    for ambiente_categoria in ['aula', 'laboratorio', 'taller', 'virtual']:
+                        # Filtrar datos usando la función de agrupación
+                        datos_amb = datos_periodo[
+                            datos_periodo['TIPO_AMBIENTE'].apply(self.agrupar_por_categoria_ambiente) == ambiente_categoria
+                        ]
+
+                        horas = datos_amb['HORAS_TOTALES'].sum()
+                        secciones = datos_amb['SECCIONES'].sum()
+
+                        resumen_periodo['horas_semanales'][ambiente_categoria] += horas
+                        resumen_periodo['secciones'][ambiente_categoria] += secciones
+
+                        detalle_programa['horas_semanales'][ambiente_categoria] = float(horas)
+                        detalle_programa['secciones'][ambiente_categoria] = int(secciones)
+
+                    resumen_periodo['detalle_por_programa'][programa] = detalle_programa
+
+            # Calcular totales
+            resumen_periodo['estudiantes'] = {
+                'total': int(total_estudiantes),
+                'llya': total_llya,
+                'myc': total_myc
+            }
+
+            resumen_periodo['horas_semanales']['total'] = sum(resumen_periodo['horas_semanales'].values())
+            resumen_periodo['secciones']['total'] = sum(resumen_periodo['secciones'].values())
+
+            # Calcular horas por semestre (16 semanas)
+            semanas = self.parametros['semanas_por_semestre']
+            for ambiente in ['aula', 'laboratorio', 'taller', 'virtual']:
+                resumen_periodo['horas_semestre'][ambiente] = (
+                    resumen_periodo['horas_semanales'][ambiente] * semanas
+                )
+            resumen_periodo['horas_semestre']['total'] = (
+                resumen_periodo['horas_semanales']['total'] * semanas
+            )
+
+            resumen_periodos.append(resumen_periodo)
+
+        self.informar(f"  {len(resumen_periodos)} periodos procesados")
+
+        return resumen_periodos
+
+    def generar_resumen_por_semestre(self):
+        """Genera el resumen de consumo por semestre académico (1-10)."""
+        self.informar("\nGenerando resumen por semestre académico...")
+
+        resumen_semestres = []
+
+        for semestre in range(1, 11):
+            datos_semestre = []
+
+            for programa in self.config['metadata']['programas']:
+                datos_sem = self.resultados[programa][
+                    self.resultados[programa]['SEMESTRE'] == semestre
+                ]
+                if len(datos_sem) > 0:
+                    datos_semestre.append(datos_sem)
+
+            if len(datos_semestre) == 0:
+                continue
+
+            datos_semestre = pd.concat(datos_semestre)
+
+            # Obtener información base del semestre
+            malla_sem = pd.concat([
+                self.mallas[prog][self.mallas[prog]['SEMESTRE'] == semestre]
+                for prog in self.config['metadata']['programas']
+            ])
+
+            resumen_sem = {
+                'semestre': semestre,
+                'cursos': len(malla_sem),
+                'creditos_totales': int(malla_sem['CREDITOS'].sum()),
+                'horas_curso_semanales': int(malla_sem['TOTAL_HORAS_SEMANALES'].sum()),
+                'estadisticas': {
+                    'promedio_estudiantes': float(datos_semestre['TOTAL_MATRICULADOS'].mean()),
+                    'maximo_estudiantes': int(datos_semestre['TOTAL_MATRICULADOS'].max()),
+                    'minimo_estudiantes': int(datos_semestre['TOTAL_MATRICULADOS'].min()),
+                    'promedio_secciones': float(datos_semestre['SECCIONES'].mean()),
+                    'promedio_horas_semanales': float(datos_semestre.groupby('CLAVE_PERIODO')['HORAS_TOTALES'].sum().mean())
+                },
+                'distribucion_tipo_ambiente': {}
+            }
+
+            # Distribución por tipo de ambiente
+            for ambiente in ['aula', 'laboratorio', 'taller', 'virtual']:
+                datos_amb = datos_semestre[datos_semestre['TIPO_AMBIENTE'].apply(self.agrupar_por_categoria_ambiente) == ambiente]
+
+                if len(datos_amb) > 0:
+                    horas_prom = datos_amb.groupby('CLAVE_PERIODO')['HORAS_TOTALES'].sum().mean()
+
+                    resumen_sem['distribucion_tipo_ambiente'][ambiente] = {
+                        'horas_semanales': float(horas_prom),
+                        'porcentaje': float((horas_prom / resumen_sem['estadisticas']['promedio_horas_semanales']) * 100) if resumen_sem['estadisticas']['promedio_horas_semanales'] > 0 else 0
+                    }
+                else:
+                    resumen_sem['distribucion_tipo_ambiente'][ambiente] = {
+                        'horas_semanales': 0,
+                        'porcentaje': 0
+                    }
+
+            resumen_semestres.append(resumen_sem)
+
+        self.informar(f"  {len(resumen_semestres)} semestres procesados")
+
+        return resumen_semestres
+
+    def generar_resumen_por_año(self):
+        """Genera el resumen de consumo por año."""
+        self.informar("\nGenerando resumen por año...")
+
+        resumen_años = []
+
+        # Combinar todos los datos
+        todos_datos = pd.concat([self.resultados[prog] for prog in self.config['metadata']['programas']])
+        años = anio_de_clave(todos_datos['CLAVE_PERIODO'])
+
+        for año, datos_año in todos_datos.groupby(años):
+            ciclos = ciclo_de_clave(datos_año['CLAVE_PERIODO'])
+            ciclo_i = datos_año[ciclos == 1]
+            ciclo_ii = datos_año[ciclos == 2]
+
+            # Calcular estudiantes únicos por año (tomar el máximo de cada ciclo)
+            est_ciclo_i = ciclo_i['TOTAL_MATRICULADOS'].max()
+            est_ciclo_ii = ciclo_ii['TOTAL_MATRICULADOS'].max()
+
+            total_est = max(est_ciclo_i if pd.notna(est_ciclo_i) else 0,
+                           est_ciclo_ii if pd.notna(est_ciclo_ii) else 0)
+
+            resumen_año = {
+                'año': int(año),
+                'total_estudiantes_año': int(total_est),
+                'horas_anuales': {},
+                'promedio_semanal': {}
+            }
+
+            # Horas anuales por tipo de ambiente
+            for ambiente in ['aula', 'laboratorio', 'taller', 'virtual']:
+                datos_amb = datos_año[datos_año['TIPO_AMBIENTE'].apply(self.agrupar_por_categoria_ambiente) == ambiente]
+                horas_totales = datos_amb['HORAS_TOTALES'].sum() * self.parametros['semanas_por_semestre']
+                resumen_año['horas_anuales'][ambiente] = float(horas_totales)
+
+            resumen_año['horas_anuales']['total'] = sum(resumen_año['horas_anuales'].values())
+
+            # Promedios semanales por ciclo
+            prom_i = ciclo_i.groupby('CLAVE_PERIODO')['HORAS_TOTALES'].sum().mean() if len(ciclo_i) > 0 else 0
+            prom_ii = ciclo_ii.groupby('CLAVE_PERIODO')['HORAS_TOTALES'].sum().mean() if len(ciclo_ii) > 0 else 0
+
+            resumen_año['promedio_semanal'] = {
+                'ciclo_i': float(prom_i),
+                'ciclo_ii': float(prom_ii),
+                'promedio': float((prom_i + prom_ii) / 2)
+            }
+
+            resumen_años.append(resumen_año)
+
+        self.informar(f"  {len(resumen_años)} años procesados")
+
+        return resumen_años
+
+    def convertir_tipos_python(self, obj):
+        """Convierte tipos numpy a tipos nativos de Python para JSON."""
+        if isinstance(obj, dict):
+            return {k: self.convertir_tipos_python(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [self.convertir_tipos_python(item) for item in obj]
+        elif isinstance(obj, np.integer):
+            return int(obj)
+        elif isinstance(obj, np.floating):
+            return float(obj)
+        elif isinstance(obj, np.ndarray):
+            return obj.tolist()
+        elif pd.isna(obj):
+            return None
+        else:
+            return obj
+
+    def generar_detalle_ambientes_especificos(self):
+        """
+        Genera un detalle de horas por tipo de ambiente ESPECÍFICO (sin agrupar).
+        Muestra por separado: Laboratorio de Química, Laboratorio de Computadoras, etc.
+        """
+        self.informar("\nGenerando detalle de ambientes específicos...")
+
+        detalle_ambientes = []
+
+        # Combinar datos de todos los programas
+        todos_datos = pd.concat([self.resultados[prog] for prog in self.config['metadata']['programas']])
+
+        # Recorrer los periodos en orden de clave
+        for periodo, datos_periodo in todos_datos.groupby('CLAVE_PERIODO'):
+
+            # Agrupar por tipo de ambiente ESPECÍFICO
+            resumen_ambientes = datos_periodo.groupby('TIPO_AMBIENTE').agg({
+                'HORAS_TOTALES': 'sum',
+                'SECCIONES': 'sum',
+                'TOTAL_MATRICULADOS': 'first'  # Solo para referencia
+            }).reset_index()
+
+            detalle_periodo = {
+                'periodo': etiqueta_periodo(periodo),
+                'ambientes': {}
+            }
+
+            for _, row in resumen_ambientes.iterrows():
+                ambiente = row['TIPO_AMBIENTE']
+                detalle_periodo['ambientes'][ambiente] = {
+                    'horas_semanales': float(row['HORAS_TOTALES']),
+                    'secciones': int(row['SECCIONES']),
+                    'horas_semestre': float(row['HORAS_TOTALES'] * self.parametros['semanas_por_semestre'])
+                }
+
+            detalle_ambientes.append(detalle_periodo)
+
+        self.informar(f"  Detalle de ambientes específicos generado para {len(detalle_ambientes)} periodos")
+
+        return detalle_ambientes
+
+
+# ---------------------------------------------------------------------------
+# Entradas
+# ---------------------------------------------------------------------------
+
+class Entradas:
+    """
+    Configuración y tablas de entrada de una carrera. Se usa como `datos` de
+    AnalizadorHorasAula; cada llamada a tablas() entrega copias independientes.
+    """
+
+    def __init__(self, config, mallas, proyecciones, equivalencias):
+        self.config        = config
+        self.mallas        = mallas
+        self.proyecciones  = proyecciones
+        self.equivalencias = equivalencias
+
+    @classmethod
+    def desde_config(cls, config_path):
+        analizador = AnalizadorHorasAula(config_path, silencioso=True)
+        analizador.cargar_datos()
+        return cls(analizador.config, analizador.mallas, analizador.proyecciones, analizador.equivalencias)
+
+    def tablas(self):
+        return (copy.deepcopy(self.mallas), copy.deepcopy(self.proyecciones),
+                copy.deepcopy(self.equivalencias))
+
+
+def generar_entradas_aleatorias(semilla, num_periodos=20, num_semestres=10, cursos_por_semestre=6,
+                                cursos_compartidos=6):
+    """
+    Entradas sintéticas con la forma de los Excel validados (programas LLYA y MYC).
+    """
+    rng = np.random.default_rng(semilla)
+    programas = ['LLYA', 'MYC']
+    nombres = {'LLYA': 'Educación LLYA', 'MYC': 'Educación MYC'}
+
+    tipos_teoria   = ['Aula', 'Aula', 'Virtual', None, 'Laboratorio de Computadoras']
+    tipos_practica = ['Aula', 'Virtual', None, 'Taller', 'Laboratorio de Química',
+                      'Laboratorio de Física', 'Sala de Danza']
+
+    codigos = iter(rng.permutation(np.arange(1000, 10000)))
+    mallas, equivalencias = {}, {}
+    filas_malla  = {p: [] for p in programas}
+    filas_equiv  = {p: [] for p in programas}
+
+    def curso(programa, nombre, semestre):
+        codigo = int(next(codigos))
+        teoricas, practicas = int(rng.integers(0, 5)), int(rng.integers(0, 5))
+        filas_malla[programa].append({
+            'CODIGO_CURSO': codigo, 'CURSO': nombre, 'SEMESTRE': semestre,
+            'CREDITOS': int(rng.integers(1, 6)),
+            'HORAS_TEORICAS': teoricas, 'HORAS_PRACTICAS': practicas,
+            'TOTAL_HORAS_SEMANALES': teoricas + practicas,
+            'TIPO_AMBIENTE_TEORIA': tipos_teoria[rng.integers(len(tipos_teoria))],
+            'TIPO_AMBIENTE_PRACTICA': tipos_practica[rng.integers(len(tipos_practica))],
+        })
+        return codigo
+
+    def equivalencia(programa, codigo, nombre, semestre, programa_eq=None, codigo_eq=None, nombre_eq=None):
+        filas_equiv[programa].append({
+            'CODIGO_CURSO': codigo, 'CURSO': nombre, 'SEMESTRE': semestre,
+            'PROGRAMA_EQUIVALENTE': programa_eq, 'CODIGO_CURSO_EQUIVALENTE': codigo_eq,
+            'CURSO_EQUIVALENTE': nombre_eq,
+        })
+
+    # Cursos propios: algunos van a Educación Inicial (se eliminan) o a otra carrera
+    for programa in programas:
+        for semestre in range(1, num_semestres + 1):
+            for i in range(cursos_por_semestre):
+                nombre = f"Curso {programa} {semestre}-{i}"
+                codigo = curso(programa, nombre, semestre)
+                destino = rng.choice(['', '', 'Educación Inicial', 'Psicología'])
+                if destino:
+                    equivalencia(programa, codigo, nombre, semestre, destino, int(rng.integers(1000, 10000)), nombre)
+                else:
+                    equivalencia(programa, codigo, nombre, semestre)
+
+    # Cursos compartidos LLYA ↔ MYC, con desfase de semestre entre mallas
+    for j in range(cursos_compartidos):
+        nombre = f"Compartido {j}"
+        sem_llya = int(rng.integers(1, num_semestres + 1))
+        sem_myc  = int(np.clip(sem_llya + rng.integers(-2, 3), 1, num_semestres))
+        cod_llya = curso('LLYA', nombre, sem_llya)
+        cod_myc  = curso('MYC', nombre, sem_myc)
+        equivalencia('LLYA', cod_llya, nombre, sem_llya, nombres['MYC'], cod_myc, nombre)
+        equivalencia('MYC', cod_myc, nombre, sem_myc, nombres['LLYA'], cod_llya, nombre)
+
+    for programa in programas:
+        mallas[programa] = pd.DataFrame(filas_malla[programa])
+        equivalencias[programa] = pd.DataFrame(filas_equiv[programa])
+
+    # Proyección: cohortes que avanzan un semestre por periodo, con periodos vacíos
+    fechas = pd.to_datetime([f"{2027 + t // 2}-{t % 2 + 1:02d}-01" for t in range(num_periodos)])
+    proyecciones = {}
+    for programa in programas:
+        malla = mallas[programa]
+        filas = []
+        for t, fecha in enumerate(fechas):
+            for _, c in malla.iterrows():
+                activo = t >= c['SEMESTRE'] - 1 and rng.random() > 0.15
+                filas.append({'PERIODO': fecha, 'CURSO': c['CURSO'], 'SEMESTRE': c['SEMESTRE'],
+                              'CODIGO_CURSO': c['CODIGO_CURSO'],
+                              'TOTAL_MATRICULADOS': int(rng.integers(1, 70)) if activo else 0})
+            # Curso proyectado que no está en la malla (queda sin tipo de ambiente)
+            filas.append({'PERIODO': fecha, 'CURSO': 'Sin malla', 'SEMESTRE': 1,
+                          'CODIGO_CURSO': 999, 'TOTAL_MATRICULADOS': int(rng.integers(0, 10))})
+        proyecciones[programa] = pd.DataFrame(filas)
+
+    config = {
+        'metadata': {
+            'carrera': f"Aleatoria {semilla}", 'programas': programas,
+            'nombres_programa': nombres, 'fecha_analisis': '2025-01-20', 'version': '1.0',
+        },
+        'parametros': {
+            'tamano_seccion_aula'       : int(rng.integers(15, 46)),
+            'tamano_seccion_laboratorio': int(rng.integers(8, 31)),
+            'tamano_seccion_taller'     : int(rng.integers(10, 31)),
+            'semanas_por_semestre'      : 16,
+        },
+        'archivos': {p: {} for p in programas},
+        'output': {},
+    }
+    return Entradas(config, mallas, proyecciones, equivalencias)
+
+
+# ---------------------------------------------------------------------------
+# Ejecución y comparación
+# ---------------------------------------------------------------------------
+
+def ejecutar_motor(clase, entradas):
+    """Corre el análisis (sin escribir archivos) y retorna (analizador, salidas, tiempos)."""
+    tiempos = {}
+
+    def etapa(nombre, funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos[nombre] = tiempos.get(nombre, 0) + time.perf_counter() - inicio
+        return resultado
+
+    a = clase(datos=entradas, silencioso=True)
+    etapa('equivalencias', lambda: (a.identificar_cursos_compartidos(), a.identificar_cursos_a_eliminar()))
+    for programa in a.config['metadata']['programas']:
+        etapa('procesar_programa', lambda: a.procesar_programa(programa))
+    etapa('cursos_compartidos', a.procesar_cursos_compartidos)
+
+    salidas = {
+        'consumo_por_periodo'           : etapa('resumenes', a.generar_resumen_por_periodo),
+        'consumo_por_semestre_academico': etapa('resumenes', a.generar_resumen_por_semestre),
+        'consumo_por_año'               : etapa('resumenes', a.generar_resumen_por_año),
+        'detalle_ambientes_especificos' : etapa('detalles', a.generar_detalle_ambientes_especificos),
+        'detalle_cursos_por_periodo'    : etapa('detalles', a.generar_detalle_cursos_por_periodo),
+    }
+    salidas = a.convertir_tipos_python(salidas)
+    return a, salidas, tiempos
+
+
+def _iguales(x, y, rtol, atol):
+    if isinstance(x, (int, float)) and isinstance(y, (int, float)) and not isinstance(x, bool):
+        if math.isnan(x) and math.isnan(y):
+            return True
+        return math.isclose(x, y, rel_tol=rtol, abs_tol=atol)
+    return x == y
+
+
+def comparar_estructuras(ref, opt, ruta, rtol, atol, diferencias):
+    """Compara recursivamente dos estructuras JSON y agrega las diferencias con su ruta."""
+    if isinstance(ref, dict) and isinstance(opt, dict):
+        for clave in ref.keys() | opt.keys():
+            if clave not in opt or clave not in ref:
+                diferencias.append({'ruta': f"{ruta}.{clave}", 'referencia': ref.get(clave, '<falta>'),
+                                    'optimizado': opt.get(clave, '<falta>')})
+            else:
+                comparar_estructuras(ref[clave], opt[clave], f"{ruta}.{clave}", rtol, atol, diferencias)
+    elif isinstance(ref, list) and isinstance(opt, list):
+        if len(ref) != len(opt):
+            diferencias.append({'ruta': f"{ruta}[largo]", 'referencia': len(ref), 'optimizado': len(opt)})
+        for i, (r, o) in enumerate(zip(ref, opt)):
+            if isinstance(r, dict) and 'periodo' in r:
+                etiqueta = r['periodo']
+            elif isinstance(r, dict) and 'codigo_curso' in r:
+                etiqueta = f"{i}:{r['codigo_curso']}/{r.get('tipo_ambiente')}"
+            else:
+                etiqueta = i
+            comparar_estructuras(r, o, f"{ruta}[{etiqueta}]", rtol, atol, diferencias)
+    elif not _iguales(ref, opt, rtol, atol):
+        diferencias.append({'ruta': ruta, 'referencia': ref, 'optimizado': opt})
+
+
+def comparar_resultados(ref, opt, programa, rtol, atol):
+    """Diferencias fila a fila entre los `resultados` de un programa."""
+    diferencias = []
+
+    def describir(df, idx):
+        fila = df.loc[idx]
+        return (f"{programa} {etiqueta_periodo(int(fila['CLAVE_PERIODO']))} "
+                f"{fila['CODIGO_CURSO']} '{fila.get('CURSO_x', fila.get('CURSO'))}' {fila['TIPO_AMBIENTE']}")
+
+    for idx in ref.index.difference(opt.index):
+        diferencias.append({'ruta': f"resultados[{describir(ref, idx)}]", 'referencia': 'fila', 'optimizado': '<falta>'})
+    for idx in opt.index.difference(ref.index):
+        diferencias.append({'ruta': f"resultados[{describir(opt, idx)}]", 'referencia': '<falta>', 'optimizado': 'fila'})
+
+    comunes = ref.index.intersection(opt.index)
+    if list(ref.index[ref.index.isin(comunes)]) != list(opt.index[opt.index.isin(comunes)]):
+        diferencias.append({'ruta': f"resultados[{programa}].orden", 'referencia': 'orden original',
+                            'optimizado': 'orden distinto'})
+
+    for columna in COLUMNAS_COMPARADAS:
+        a = ref.loc[comunes, columna].to_numpy(dtype='float64')
+        b = opt.loc[comunes, columna].to_numpy(dtype='float64')
+        distintos = ~np.isclose(a, b, rtol=rtol, atol=atol, equal_nan=True)
+        for idx, x, y in zip(comunes[distintos], a[distintos], b[distintos]):
+            diferencias.append({'ruta': f"resultados[{describir(ref, idx)}].{columna}",
+                                'referencia': float(x), 'optimizado': float(y)})
+    return diferencias
+
+
+def verificar(entradas, motor='vectorizado', rtol=1e-9, atol=1e-9):
+    """
+    Corre referencia y motor sobre `entradas` y retorna
+    {'diferencias': [...], 'tiempos': {'referencia': {...}, motor: {...}}}.
+    """
+    ref, salidas_ref, tiempos_ref = ejecutar_motor(ReferenciaFilaAFila, entradas)
+    opt, salidas_opt, tiempos_opt = ejecutar_motor(MOTORES[motor], entradas)
+
+    diferencias = []
+    for programa in ref.config['metadata']['programas']:
+        diferencias += comparar_resultados(ref.resultados[programa], opt.resultados[programa],
+                                           programa, rtol, atol)
+    for nombre in ESTRUCTURAS:
+        comparar_estructuras(salidas_ref[nombre], salidas_opt[nombre], nombre, rtol, atol, diferencias)
+
+    return {'diferencias': diferencias, 'tiempos': {'referencia': tiempos_ref, motor: tiempos_opt}}
+
+
+def _celdas(ws):
+    return {celda.coordinate: celda.value for fila in ws.iter_rows() for celda in fila if celda.value is not None}
+
+
+def comparar_hojas(ref, opt, hoja, rtol, atol, diferencias):
+    """Diferencias celda a celda entre dos hojas de openpyxl."""
+    celdas_ref, celdas_opt = _celdas(ref), _celdas(opt)
+    for coordenada in sorted(celdas_ref.keys() | celdas_opt.keys()):
+        x, y = celdas_ref.get(coordenada), celdas_opt.get(coordenada)
+        if not _iguales(x, y, rtol, atol):
+            diferencias.append({'ruta': f"excel[{hoja}!{coordenada}]", 'referencia': x, 'optimizado': y})
+
+
+def verificar_excel_incremental(entradas, rtol=1e-9, atol=1e-9):
+    """
+    Regresión de GeneradorExcel.actualizar (la ruta incremental) contra
+    generar (la referencia). Se genera el libro con otra capacidad de aula,
+    se actualiza desde el periodo del medio con el resultado real y se
+    compara celda a celda: la Tabla Pivote, Picos y las hojas del rango deben
+    quedar como en el libro generado completo con el resultado real, y las
+    hojas anteriores al rango, como estaban.
+    """
+    from openpyxl import load_workbook
+    from generador_excel import GeneradorExcel
+
+    def resultado(entradas):
+        return AnalizadorHorasAula(datos=entradas, silencioso=True).analizar()
+
+    parametros = entradas.config['parametros']
+    config_anterior = {**entradas.config,
+                       'parametros': {**parametros, 'tamano_seccion_aula': parametros['tamano_seccion_aula'] + 7}}
+    anterior = resultado(Entradas(config_anterior, *entradas.tablas()))
+    actual   = resultado(entradas)
+
+    etiquetas = [p['periodo'] for p in actual['detalle_cursos_por_periodo']]
+    desde = etiquetas[len(etiquetas) // 2]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_anterior    = os.path.join(directorio, 'anterior.xlsx')
+        ruta_completo    = os.path.join(directorio, 'completo.xlsx')
+        ruta_actualizado = os.path.join(directorio, 'actualizado.xlsx')
+
+        GeneradorExcel(None, ruta_anterior, anterior, silencioso=True).generar()
+        GeneradorExcel(None, ruta_completo, actual, silencioso=True).generar()
+        shutil.copy(ruta_anterior, ruta_actualizado)
+        GeneradorExcel(None, ruta_actualizado, actual, silencioso=True).actualizar(desde=desde)
+
+        libro_anterior, libro_completo, libro_actualizado = (
+            load_workbook(r) for r in (ruta_anterior, ruta_completo, ruta_actualizado)
+        )
+
+    diferencias = []
+    if libro_actualizado.sheetnames != libro_completo.sheetnames:
+        diferencias.append({'ruta': 'excel.hojas', 'referencia': libro_completo.sheetnames,
+                            'optimizado': libro_actualizado.sheetnames})
+    clave_desde = clave_desde_etiqueta(desde)
+    for hoja in libro_completo.sheetnames:
+        if hoja not in libro_actualizado.sheetnames:
+            continue
+        try:
+            referencia = libro_completo if clave_desde_etiqueta(hoja) >= clave_desde else libro_anterior
+        except ValueError:
+            referencia = libro_completo      # Tabla Pivote y Picos se reescriben siempre
+        comparar_hojas(referencia[hoja], libro_actualizado[hoja], hoja, rtol, atol, diferencias)
+    return diferencias
+
+
+def imprimir_reporte(nombre_caso, reporte):
+    diferencias = reporte['diferencias']
+    estado = 'OK' if not diferencias else f"{len(diferencias)} DIFERENCIAS"
+    print(f"\n  {nombre_caso}: {estado}")
+    for d in diferencias[:MAX_DIFERENCIAS]:
+        print(f"    {d['ruta']}: referencia={d['referencia']!r} optimizado={d['optimizado']!r}")
+    if len(diferencias) > MAX_DIFERENCIAS:
+        print(f"    ... y {len(diferencias) - MAX_DIFERENCIAS} mas")
+
+
+def imprimir_tiempos(acumulados):
+    motores = list(acumulados)
+    etapas = list(acumulados[motores[0]])
+    print(f"\n  {'Etapa':<22}" + ''.join(f"{m:>14}" for m in motores) + f"{'aceleracion':>14}")
+    for etapa in etapas + ['total']:
+        valores = [sum(t.values()) if etapa == 'total' else t[etapa] for t in acumulados.values()]
+        aceleracion = valores[0] / valores[-1] if valores[-1] > 0 else float('inf')
+        print(f"  {etapa:<22}" + ''.join(f"{v * 1000:>11.1f} ms" for v in valores) + f"{aceleracion:>13.1f}x")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Compara un motor optimizado contra la referencia.")
+    parser.add_argument('--config', help="Verificar con los datos de este config.json")
+    parser.add_argument('--aleatorios', type=int, default=0, help="Casos con entradas aleatorias")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--motor', default='vectorizado', choices=sorted(MOTORES))
+    parser.add_argument('--rtol', type=float, default=1e-9)
+    parser.add_argument('--atol', type=float, default=1e-9)
+    parser.add_argument('--excel', action='store_true',
+                        help="Verificar tambien la actualizacion incremental del Excel contra la generacion completa")
+    args = parser.parse_args()
+
+    casos = []
+    if args.config:
+        casos.append((args.config, lambda: Entradas.desde_config(args.config)))
+    for i in range(args.aleatorios):
+        semilla = args.semilla + i
+        casos.append((f"aleatorio semilla={semilla}", lambda s=semilla: generar_entradas_aleatorias(s)))
+    if not casos:
+        casos.append(('config.json', lambda: Entradas.desde_config('config.json')))
+
+    print("=" * 80)
+    print(f"VERIFICADOR DE MOTORES: referencia vs {args.motor}")
+    print("=" * 80)
+
+    acumulados = None
+    fallidos = 0
+    for nombre, crear in casos:
+        entradas = crear()
+        reporte = verificar(entradas, args.motor, args.rtol, args.atol)
+        imprimir_reporte(nombre, reporte)
+        fallidos += bool(reporte['diferencias'])
+        if args.excel:
+            diferencias = verificar_excel_incremental(entradas, args.rtol, args.atol)
+            imprimir_reporte(f"{nombre} (Excel incremental)", {'diferencias': diferencias})
+            fallidos += bool(diferencias)
+        if acumulados is None:
+            acumulados = {m: dict.fromkeys(t, 0.0) for m, t in reporte['tiempos'].items()}
+        for m, t in reporte['tiempos'].items():
+            for etapa, segundos in t.items():
+                acumulados[m][etapa] += segundos
+
+    imprimir_tiempos(acumulados)
+    print(f"\n{len(casos) - fallidos}/{len(casos)} casos coinciden")
+    sys.exit(1 if fallidos else 0)